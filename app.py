@@ -1,301 +1,300 @@
 import streamlit as st
-import pdfplumber
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import matplotlib.pyplot as plt
-import numpy as np
-from st_aggrid import AgGrid, GridOptionsBuilder
-import mysql.connector
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from collections import Counter
 from datetime import datetime
 import hashlib
-
-# --- Database Configuration ---
-DB_HOST = "localhost"
-DB_USER = "root"
-DB_PASSWORD = "root"  # Leave it empty if your database has no password
-DB_NAME = "rankitright"
-
-def create_connection():
-    try:
-        mydb = mysql.connector.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME
-        )
-        return mydb
-    except mysql.connector.Error as err:
-        st.error(f"Error connecting to database: {err}")
-        return None
+import math
+import os
+import time
+import zipfile
+import metrics
+from database import StorageError, get_repository
+from prefilter import PostingIndex, parse_keywords, parse_terms
+from resume_rules import get_rule_set
+from uploads import UploadRejected, get_upload_store
+
+# pandas, matplotlib, st_aggrid, scikit-learn and the PDF, ranking, chatbot and
+# video engines take seconds to import, so each page imports what it needs
+# when it first renders something with them. The login page loads none of
+# them; later reruns find them in sys.modules.
+
+HISTORY_PAGE_SIZE = 20
+COHORT_MAX_FILES = int(os.environ.get("RANKITRIGHT_COHORT_MAX_FILES", 2000))
+COHORT_MAX_PDF_BYTES = 20 * 1024 * 1024
+COHORT_MAX_BYTES = int(os.environ.get("RANKITRIGHT_COHORT_MAX_BYTES", 512 * 1024 * 1024))
+# Usernames that see the Timings page, comma-separated.
+ADMIN_USERS = set(parse_terms(os.environ.get("RANKITRIGHT_ADMIN_USERS", "")))
 
 # --- User Authentication ---
 def hash_password(password):
     return hashlib.sha256(password.encode()).hexdigest()  # Hashing the password
 
 def create_user(username, password, role):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            hashed_password = hash_password(password)
-            sql = "INSERT INTO Users (Username, Password, Role) VALUES (%s, %s, %s)"
-            cursor.execute(sql, (username, hashed_password, role))
-            mydb.commit()
-            st.success("User  created successfully!")
-            mydb.close()
-            return True
-        except mysql.connector.Error as err:
-            st.error(f"Error creating user: {err}")
-            mydb.close()
-            return False
+    try:
+        get_repository().create_user(username, hash_password(password), role)
+        st.success("User  created successfully!")
+        return True
+    except StorageError as err:
+        st.error(f"Error creating user: {err}")
+        return False
 
 def verify_user(username, password):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            hashed_password = hash_password(password)
-            sql = "SELECT UserID, Role FROM Users WHERE Username = %s AND Password = %s"
-            cursor.execute(sql, (username, hashed_password))
-            result = cursor.fetchone()
-            mydb.close()
-            if result:
-                return result[0], result[1]
-            else:
-                return None, None
-        except mysql.connector.Error as err:
-            st.error(f"Error verifying user: {err}")
-            mydb.close()
-            return None, None
+    try:
+        return get_repository().find_user(username, hash_password(password))
+    except StorageError as err:
+        st.error(f"Error verifying user: {err}")
+        return None, None
 
 def save_hr_ranking_history(username, job_description, resumes, scores):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            resumes_str = ",".join(resumes)
-            scores_str = ",".join(map(str, scores))
-            sql = "INSERT INTO HRResumeRankingHistory (Username, JobDescription, Resumes, Scores) VALUES (%s, %s, %s, %s)"
-            cursor.execute(sql, (username, job_description, resumes_str, scores_str))
-            mydb.commit()
-            mydb.close()
-            return True
-        except mysql.connector.Error as err:
-            st.error(f"Error saving HR ranking history: {err}")
-            mydb.close()
-            return False
-
-def get_hr_ranking_history(user_id):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            sql = "SELECT JobDescription, Resumes, Scores, Timestamp FROM HRResumeRankingHistory WHERE Username = %s ORDER BY Timestamp DESC"
-            cursor.execute(sql, (user_id,))
-            results = cursor.fetchall()
-            mydb.close()
-            return [(jd, resumes.decode('utf-8'), scores.decode('utf-8'), timestamp) for jd, resumes, scores, timestamp in results]
-        except mysql.connector.Error as err:
-            st.error(f"Error fetching HR ranking history: {err}")
-            mydb.close()
-            return []
+    try:
+        get_repository().save_hr_ranking(username, job_description, resumes, scores)
+        return True
+    except StorageError as err:
+        st.error(f"Error saving HR ranking history: {err}")
+        return False
+
+def get_hr_ranking_history(user_id, before=None, limit=HISTORY_PAGE_SIZE):
+    try:
+        return get_repository().get_hr_rankings_page(user_id, limit, before)
+    except StorageError as err:
+        st.error(f"Error fetching HR ranking history: {err}")
+        return [], None
+
+def get_hr_ranking_details(user_id, ranking_id):
+    try:
+        return get_repository().get_hr_ranking_results(user_id, ranking_id)
+    except StorageError as err:
+        st.error(f"Error fetching HR ranking details: {err}")
+        return []
+
+def get_hr_ranking_summary(user_id):
+    try:
+        return get_repository().get_hr_rankings_summary(user_id)
+    except StorageError as err:
+        st.error(f"Error fetching HR ranking summary: {err}")
+        return 0, 0, None
 
 def save_hr_soft_skill_history(username, videos, scores):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            videos_str = ",".join(videos)
-            scores_str = ",".join(map(str, scores))
-            sql = "INSERT INTO HRSoftSkillRankingHistory (Username, Videos, Scores) VALUES (%s, %s, %s)"
-            cursor.execute(sql, (username, videos_str, scores_str))
-            mydb.commit()
-            mydb.close()
-            return True
-        except mysql.connector.Error as err:
-            st.error(f"Error saving HR soft skill history: {err}")
-            mydb.close()
-            return False
-
-def get_hr_soft_skill_history(user_id):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            sql = "SELECT Videos, Scores, Timestamp FROM HRSoftSkillRankingHistory WHERE Username = %s ORDER BY Timestamp DESC"
-            cursor.execute(sql, (user_id,))
-            results = cursor.fetchall()
-            mydb.close()
-            return [(videos.decode('utf-8'), scores.decode('utf-8'), timestamp) for videos, scores, timestamp in results]
-        except mysql.connector.Error as err:
-            st.error(f"Error fetching HR soft skill history: {err}")
-            mydb.close()
-            return []
+    try:
+        get_repository().save_hr_soft_skill(username, videos, scores)
+        return True
+    except StorageError as err:
+        st.error(f"Error saving HR soft skill history: {err}")
+        return False
+
+def get_hr_soft_skill_history(user_id, before=None, limit=HISTORY_PAGE_SIZE):
+    try:
+        return get_repository().get_hr_soft_skills_page(user_id, limit, before)
+    except StorageError as err:
+        st.error(f"Error fetching HR soft skill history: {err}")
+        return [], None
+
+def get_hr_soft_skill_details(user_id, analysis_id):
+    try:
+        return get_repository().get_hr_soft_skill_results(user_id, analysis_id)
+    except StorageError as err:
+        st.error(f"Error fetching HR soft skill details: {err}")
+        return []
+
+def get_hr_soft_skill_summary(user_id):
+    try:
+        return get_repository().get_hr_soft_skills_summary(user_id)
+    except StorageError as err:
+        st.error(f"Error fetching HR soft skill summary: {err}")
+        return 0, 0, None
 
 def save_hr_feedback(username, feedback):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            sql = "INSERT INTO HRFeedbackHistory (Username, Feedback) VALUES (%s, %s)"
-            cursor.execute(sql, (username, feedback))
-            mydb.commit()
-            mydb.close()
-            return True
-        except mysql.connector.Error as err:
-            st.error(f"Error saving HR feedback: {err}")
-            mydb.close()
-            return False
+    try:
+        get_repository().save_hr_feedback(username, feedback)
+        return True
+    except StorageError as err:
+        st.error(f"Error saving HR feedback: {err}")
+        return False
 
 def get_hr_feedback_history(user_id):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            sql = "SELECT Feedback, Timestamp FROM HRFeedbackHistory WHERE Username = %s ORDER BY Timestamp DESC"
-            cursor.execute(sql, (user_id,))
-            results = cursor.fetchall()
-            mydb.close()
-            return results
-        except mysql.connector.Error as err:
-            st.error(f"Error fetching HR feedback history: {err}")
-            mydb.close()
-            return []
+    try:
+        return get_repository().get_hr_feedback(user_id)
+    except StorageError as err:
+        st.error(f"Error fetching HR feedback history: {err}")
+        return []
 
-def extract_text_from_pdf_hr(file):
+def extract_text_from_pdf(file, source):
+    from extraction import extract_pdf
     text = ""
     try:
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text
-                else:
-                    st.warning(f"No text found on page {page.page_number} of {file.name} (HR).")
+        result = extract_pdf(file.getvalue())
+        text = result["text"]
+        for page_number in result["empty_pages"]:
+            st.warning(f"No text found on page {page_number} of {file.name} ({source}).")
     except Exception as e:
-        st.error(f"Error reading {file.name} (HR): {e}")
+        st.error(f"Error reading {file.name} ({source}): {e}")
     return text
 
-def rank_resumes_hr(job_description, resumes):
-    documents = [job_description] + resumes
-    vectorizer = TfidfVectorizer().fit_transform(documents)
-    vectors = vectorizer.toarray()
-    job_description_vector = vectors[0]
-    resume_vectors = vectors[1:]
-    cosine_similarities = cosine_similarity([job_description_vector], resume_vectors).flatten()
-    return cosine_similarities
+def extract_text_from_pdf_hr(file):
+    return extract_text_from_pdf(file, "HR")
 
 def extract_text_from_pdf_student(file):
-    text = ""
-    try:
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text
-                else:
-                    st.warning(f"No text found on page {page.page_number} of {file.name} (Student).")
-    except Exception as e:
-        st.error(f"Error reading {file.name} (Student): {e}")
-    return text
+    return extract_text_from_pdf(file, "Student")
 
 def save_student_resume_check_history(user_id, filename, suggestions):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            suggestions_str = ",".join(suggestions)
-            sql = "INSERT INTO StudentResumeCheckHistory (Username, Filename, Suggestions) VALUES (%s, %s, %s)"
-            cursor.execute(sql, (user_id, filename, suggestions_str))
-            mydb.commit()
-            mydb.close()
-            return True
-        except mysql.connector.Error as err:
-            st.error(f"Error saving student resume check history: {err}")
-            mydb.close()
-            return False
+    try:
+        get_repository().save_student_resume_check(user_id, filename, suggestions)
+        return True
+    except StorageError as err:
+        st.error(f"Error saving student resume check history: {err}")
+        return False
+
+def save_student_cohort_check_history(user_id, checks):
+    try:
+        get_repository().save_student_resume_checks(user_id, checks)
+        return True
+    except StorageError as err:
+        st.error(f"Error saving student resume check history: {err}")
+        return False
 
 def get_student_resume_check_history(user_id):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            sql = "SELECT Filename, Suggestions, Timestamp FROM StudentResumeCheckHistory WHERE Username = %s ORDER BY Timestamp DESC"
-            cursor.execute(sql, (user_id,))
-            results = cursor.fetchall()
-            mydb.close()
-            return [(filename, suggestions, timestamp) for filename, suggestions, timestamp in results]
-        except mysql.connector.Error as err:
-            st.error(f"Error fetching student resume check history: {err}")
-            mydb.close()
-            return []
+    try:
+        return get_repository().get_student_resume_checks(user_id)
+    except StorageError as err:
+        st.error(f"Error fetching student resume check history: {err}")
+        return []
 
 def save_student_feedback(username, feedback):
-    mydb = create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            sql = "INSERT INTO StudentFeedbackHistory (Username, Feedback) VALUES (%s, %s)"
-            cursor.execute(sql, (username, feedback))
-            mydb.commit()
-            mydb.close()
-            return True
-        except mysql.connector.Error as err:
-            st.error(f"Error saving student feedback: {err}")
-            mydb.close()
-            return False
+    try:
+        get_repository().save_student_feedback(username, feedback)
+        return True
+    except StorageError as err:
+        st.error(f"Error saving student feedback: {err}")
+        return False
 
 def get_student_feedback_history(user_id):
-    mydb= create_connection()
-    if mydb:
-        cursor = mydb.cursor()
-        try:
-            sql = "SELECT Feedback, Timestamp FROM StudentFeedbackHistory WHERE Username = %s ORDER BY Timestamp DESC"
-            cursor.execute(sql, (user_id,))
-            results = cursor.fetchall()
-            mydb.close()
-            return results
-        except mysql.connector.Error as err:
-            st.error(f"Error fetching student feedback history: {err}")
-            mydb.close()
-            return []
+    try:
+        return get_repository().get_student_feedback(user_id)
+    except StorageError as err:
+        st.error(f"Error fetching student feedback history: {err}")
+        return []
 
 def evaluate_resume(text):
-    suggestions = []
-
-    # Example checks for suggestions
-    if len(text) < 500:
-        suggestions.append("Consider adding more content to your resume. Aim for at least 500 words.")
-
-    if "skills" not in text.lower():
-        suggestions.append("Include a 'Skills' section to highlight your relevant skills.")
-
-    if "experience" not in text.lower():
-        suggestions.append("Add an 'Experience' section to showcase your work history.")
-
-    if "education" not in text.lower():
-        suggestions.append("Include an 'Education' section to detail your academic background.")
-
-    if len(text.splitlines()) < 5:
-        suggestions.append("Your resume is quite short. Consider adding more sections or details.")
-
-    if "objective" not in text.lower() and "summary" not in text.lower():
-        suggestions.append("Consider adding an 'Objective' or 'Summary' section to introduce yourself.")
-
-    if "contact" not in text.lower():
-        suggestions.append("Make sure to include your contact information at the top of your resume.")
-
-    if any(word in text.lower() for word in ["internship", "intern", "volunteer"]):
-        suggestions.append("Highlight any internships or volunteer experiences to showcase your practical skills.")
-
-    if "certification" not in text.lower() and "certificates" not in text.lower():
-        suggestions.append("If you have any certifications, consider adding a 'Certifications' section.")
+    # The checks live in resume_rules.json; see resume_rules.py for the format.
+    try:
+        return get_rule_set().evaluate(text)
+    except (OSError, ValueError) as err:
+        st.error(f"Error loading resume rules: {err}")
+        return []
+
+def read_cohort_files(uploaded_files):
+    # ZIP archives are expanded to the PDFs inside them; other uploads are PDFs.
+    # Once COHORT_MAX_FILES resumes or COHORT_MAX_BYTES are held, the rest are
+    # only counted, so a large archive is not decompressed just to be dropped.
+    files = []
+    total_bytes = 0
+    skipped = 0
+
+    def add(name, size, read):
+        nonlocal total_bytes, skipped
+        if skipped or len(files) >= COHORT_MAX_FILES or total_bytes + size > COHORT_MAX_BYTES:
+            skipped += 1
+            return
+        files.append((name, read()))
+        total_bytes += size
+
+    for upload in uploaded_files:
+        if not upload.name.lower().endswith(".zip"):
+            add(upload.name, upload.size, upload.getvalue)
+            continue
+        try:
+            with zipfile.ZipFile(upload) as archive:
+                for member in archive.infolist():
+                    if member.is_dir() or not member.filename.lower().endswith(".pdf") or member.filename.startswith("__MACOSX/"):
+                        continue
+                    if member.file_size > COHORT_MAX_PDF_BYTES:
+                        st.warning(f"Skipped {member.filename} in {upload.name}: larger than {COHORT_MAX_PDF_BYTES // 2**20} MB.")
+                        continue
+                    add(member.filename, member.file_size, lambda: archive.read(member))
+        except zipfile.BadZipFile as err:
+            st.error(f"Error reading {upload.name}: {err}")
+    if skipped:
+        st.warning(f"Only the first {len(files)} of {len(files) + skipped} resumes are checked "
+                   f"(at most {COHORT_MAX_FILES} files and {COHORT_MAX_BYTES // 2**20} MB per check).")
+    return files
+
+def check_cohort(files):
+    # Extraction runs in the worker pool; each resume is evaluated as soon as
+    # its text arrives and the table is redrawn at most twice a second.
+    from extraction import iter_extract_batch
+    rows = [None] * len(files)
+    table = st.empty()
+    progress = st.progress(0.0, text=f"Checking {len(files)} resumes...")
+    last_draw = 0
+    for done, (i, result) in enumerate(iter_extract_batch(files), start=1):
+        if result["error"]:
+            status, suggestions = f"Error: {result['error']}", []
+        elif not result["text"]:
+            status, suggestions = "No text found", []
+        else:
+            status, suggestions = "Checked", evaluate_resume(result["text"])
+        rows[i] = {"Resume": result["name"], "Status": status, "Issues": len(suggestions), "Suggestions": suggestions}
+        if time.monotonic() - last_draw > 0.5 or done == len(files):
+            last_draw = time.monotonic()
+            progress.progress(done / len(files), text=f"Checked {done} of {len(files)} resumes")
+            table.dataframe(cohort_table([row for row in rows if row]), use_container_width=True, hide_index=True)
+    progress.empty()
+    table.empty()
+    return rows
+
+def cohort_table(rows):
+    import pandas as pd
+    df = pd.DataFrame(rows, columns=["Resume", "Status", "Issues", "Suggestions"])
+    df["Suggestions"] = df["Suggestions"].map("; ".join)
+    return df
+
+def student_cohort_checker_app(user_id):
+    uploaded_files = st.file_uploader("Upload PDF resumes or ZIP archives of PDFs", type=["pdf", "zip"], accept_multiple_files=True, key="student_cohort_files")
+    if not uploaded_files:
+        st.info("Upload a cohort of resumes to check them all at once.")
+        return
+
+    # Results are kept for the current uploads, so reruns (sorting, saving)
+    # do not check the cohort again.
+    upload_key = tuple(upload.file_id for upload in uploaded_files)
+    cohort = st.session_state.get("student_cohort")
+    if cohort is None or cohort["key"] != upload_key:
+        files = read_cohort_files(uploaded_files)
+        if not files:
+            st.error("No PDF resumes found in the upload.")
+            return
+        cohort = {"key": upload_key, "rows": check_cohort(files)}
+        st.session_state["student_cohort"] = cohort
+    rows = cohort["rows"]
+    checked = [row for row in rows if row["Status"] == "Checked"]
+
+    st.subheader("Cohort Results")
+    st.caption(f"{len(checked)} of {len(rows)} resumes checked. Click a column header to sort.")
+    st.dataframe(cohort_table(rows), use_container_width=True, hide_index=True)
+
+    st.subheader("Common Issues")
+    import pandas as pd
+    issue_counts = Counter(suggestion for row in checked for suggestion in row["Suggestions"])
+    if issue_counts:
+        issues = pd.DataFrame(issue_counts.most_common(), columns=["Suggestion", "Resumes"])
+        issues["Share of Cohort"] = (issues["Resumes"] / max(len(checked), 1)).map("{:.0%}".format)
+        st.dataframe(issues, use_container_width=True, hide_index=True)
+    else:
+        st.success("No issues found across the cohort.")
 
-    return suggestions
+    if checked and st.button("Save Check History", key="save_student_cohort_history"):
+        if save_student_cohort_check_history(user_id, [(row["Resume"], row["Suggestions"]) for row in checked]):
+            st.success(f"Saved check history for {len(checked)} resumes.")
+        else:
+            st.error("Failed to save resume check history.")
 
 def student_resume_checker_app(user_id):
     st.subheader("Resume Checker")
+    mode = st.radio("Checking mode", ["Single Resume", "Bulk Cohort"], horizontal=True, key="student_checker_mode")
+    if mode == "Bulk Cohort":
+        student_cohort_checker_app(user_id)
+        return
+
     uploaded_file = st.file_uploader("Upload your PDF resume for checking", type=["pdf"], accept_multiple_files=False)
 
     if uploaded_file:
@@ -337,25 +336,100 @@ def student_feedback_app(user_id):
         st.info("Your feedback has been submitted.")
         del st.session_state["student_feedback_submitted"]
 
+def extract_uploaded_resumes_hr(uploaded_files):
+    from extraction import extract_batch, get_text_cache
+    resumes_text = []
+    with st.spinner("Processing resumes..."):
+        results = extract_batch([(file.name, file.getvalue()) for file in uploaded_files])
+        for result in results:
+            if result["error"]:
+                st.error(f"Error reading {result['name']} (HR): {result['error']}")
+            for page_number in result["empty_pages"]:
+                st.warning(f"No text found on page {page_number} of {result['name']} (HR).")
+            resumes_text.append(result["text"])
+        cache_stats = get_text_cache().stats()
+        st.caption(f"Extraction cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    return resumes_text
+
+def upload_analysis(uploaded_files, name, build):
+    # Structures derived from the uploaded resumes (the keyword postings, the
+    # near-duplicate groups) are built once per set of uploads, so editing the
+    # filter or paging through results does not tokenize the resumes again.
+    upload_key = tuple(file.file_id for file in uploaded_files)
+    analysis = st.session_state.get("hr_upload_analysis")
+    if analysis is None or analysis["key"] != upload_key:
+        analysis = {"key": upload_key}
+        st.session_state["hr_upload_analysis"] = analysis
+    if name not in analysis:
+        analysis[name] = build()
+    return analysis[name]
+
 def hr_resume_ranking_app(user_id):
     st.subheader("Resume Ranking")
+    mode = st.radio("Ranking mode", ["Single Job Description", "Multiple Job Descriptions"], horizontal=True, key="hr_ranking_mode")
+    if mode == "Multiple Job Descriptions":
+        hr_batch_ranking_app(user_id)
+        return
+
     job_description = st.text_area("Enter the job description for HR", height=200)
     uploaded_files = st.file_uploader("Upload PDF resumes for ranking", type=["pdf"], accept_multiple_files=True)
+    with st.expander("Keyword Filter"):
+        st.caption("Comma-separated terms, matched as whole words. Resumes that fail the filter are dropped before scoring.")
+        must_have = parse_keywords(st.text_input("Must have all of", placeholder="python, sql", key="hr_filter_must"))
+        any_of = parse_keywords(st.text_input("Must have at least one of", placeholder="aws, azure, gcp", key="hr_filter_any"))
+        exclude = parse_keywords(st.text_input("Exclude resumes mentioning", key="hr_filter_exclude"))
+    group_duplicates = st.checkbox("Group near-duplicate resumes and score one copy of each", value=True, key="hr_group_duplicates")
 
     resumes_text = []
     if uploaded_files and job_description:
         resume_names = [file.name for file in uploaded_files]
-        with st.spinner("Processing resumes..."):
-            for file in uploaded_files:
-                try:
-                    text = extract_text_from_pdf_hr(file)
-                    resumes_text.append(text)
-                except Exception as e:
-                    st.error(f"Error extracting text from {file.name}: {e}")
-                    return
+        resumes_text = extract_uploaded_resumes_hr(uploaded_files)
+        kept = list(range(len(resumes_text)))
+        if must_have or any_of or exclude:
+            with metrics.timer("ranking_page", stage="filter"):
+                kept = upload_analysis(uploaded_files, "postings", lambda: PostingIndex(resumes_text)).filter(must_have, any_of, exclude)
+            st.caption(f"{len(kept)} of {len(resumes_text)} resumes pass the keyword filter")
+            if not kept:
+                st.info("No resumes pass the keyword filter.")
+                return
+        # Each group is [representative, near-duplicates...]; only the first
+        # upload of a group is scored.
+        groups = [[i] for i in kept]
+        if group_duplicates:
+            from dedupe import near_duplicate_labels
+            with metrics.timer("ranking_page", stage="dedupe"):
+                labels = upload_analysis(uploaded_files, "duplicates", lambda: near_duplicate_labels(resumes_text))
+            by_label = {}
+            for i in kept:
+                by_label.setdefault(labels[i], []).append(i)
+            groups = list(by_label.values())
+            if len(groups) < len(kept):
+                st.caption(f"{len(kept)} resumes grouped into {len(groups)} unique candidates; near-duplicates are scored once")
+        duplicate_names = [", ".join(resume_names[j] for j in group[1:]) for group in groups]
+        resume_names = [resume_names[group[0]] for group in groups]
+        resumes_text = [resumes_text[group[0]] for group in groups]
     if resumes_text:
-        scores = rank_resumes_hr(job_description, resumes_text)
-        ranked_indices = scores.argsort()[::-1]
+        import numpy as np
+        import pandas as pd
+        from st_aggrid import AgGrid, GridOptionsBuilder
+        from ranking import get_resume_index, rank_resumes_hr, top_k
+        resume_index = get_resume_index(user_id)
+        scores = rank_resumes_hr(job_description, resumes_text, index=resume_index)
+        st.caption(f"Scored against a pool of the {len(resume_index)} resumes you have ranked")
+        col1, col2 = st.columns(2)
+        with col1:
+            min_score = st.slider("Minimum score", 0.0, 1.0, 0.0, 0.01, key="hr_min_score")
+        with col2:
+            page_size = int(st.number_input("Resumes per page", min_value=5, max_value=500, value=20, step=5, key="hr_page_size"))
+        n_matching = int(np.count_nonzero(scores >= min_score))
+        if n_matching == 0:
+            st.info("No resumes reach the minimum score.")
+            return
+        n_pages = math.ceil(n_matching / page_size)
+        page = int(st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1, key="hr_page")) if n_pages > 1 else 1
+
+        # Only the ranks on the current page are selected and sorted.
+        ranked_indices = top_k(scores, page * page_size, min_score)[(page - 1) * page_size:]
         ranked_scores = scores[ranked_indices]
         ranked_names = [resume_names[i] for i in ranked_indices]
 
@@ -363,25 +437,35 @@ def hr_resume_ranking_app(user_id):
             "Resume": ranked_names,
             "Score": ranked_scores.round(2)
         })
+        if any(duplicate_names):
+            results_df["Near-duplicates"] = [duplicate_names[i] for i in ranked_indices]
+        results_df.index += (page - 1) * page_size + 1
 
         st.success("Resumes ranked successfully!")
         st.subheader("Ranking Results")
-        gb = GridOptionsBuilder.from_dataframe(results_df)
-        gb.configure_columns(['Score'], type=['numericColumnFilter', 'customNumericFormat'], precision=2)
-        gridOptions = gb.build()
-        AgGrid(results_df, gridOptions=gridOptions, height=300, fit_columns_on_grid_load=True)
-
-        fig, ax = plt.subplots()
-        ax.pie(ranked_scores, labels=ranked_names, autopct='%1.1f%%', startangle=90)
-        ax.axis('equal')
-        st.pyplot(fig)
+        st.caption(f"Showing ranks {(page - 1) * page_size + 1}-{(page - 1) * page_size + len(ranked_indices)} of {n_matching} matching resumes")
+        with metrics.timer("ranking_page", stage="table"):
+            gb = GridOptionsBuilder.from_dataframe(results_df)
+            gb.configure_columns(['Score'], type=['numericColumnFilter', 'customNumericFormat'], precision=2)
+            gridOptions = gb.build()
+            AgGrid(results_df, gridOptions=gridOptions, height=300, fit_columns_on_grid_load=True)
+
+        from charts import CHART_MAX_ITEMS, pie_chart
+        with metrics.timer("ranking_page", stage="chart"):
+            chart = pie_chart(ranked_names, ranked_scores)
+            if chart is not None:
+                st.image(chart, use_container_width=True)
         
         # Add the description below the pie chart
         st.subheader("Understanding Of Results")
-        st.write("The pie chart above illustrates the distribution of scores among the ranked resumes. Each slice represents a resume's score relative to the total scores of all resumes. This visual representation helps in understanding how each resume compares to others in terms of alignment with the job description.")
+        if len(ranked_names) > CHART_MAX_ITEMS:
+            st.write(f"With more than {CHART_MAX_ITEMS} resumes on this page, the chart above shows the {CHART_MAX_ITEMS} highest scores as bars instead of a pie, since slices this thin would be unreadable. Longer bars mean a closer match with the job description; the table lists every resume on the page.")
+        else:
+            st.write("The pie chart above illustrates the distribution of scores among the resumes on this page. Each slice represents a resume's score relative to the total scores of all resumes. This visual representation helps in understanding how each resume compares to others in terms of alignment with the job description.")
 
         if st.button("Save Ranking History", key="save_hr_ranking"):
-            if save_hr_ranking_history(user_id, job_description, resume_names, ranked_scores.tolist()):
+            saved_indices = top_k(scores, min_score=min_score)
+            if save_hr_ranking_history(user_id, job_description, [resume_names[i] for i in saved_indices], scores[saved_indices].tolist()):
                 st.success("Ranking history saved.")
             else:
                 st.error("Failed to save ranking history.")
@@ -393,28 +477,146 @@ def hr_resume_ranking_app(user_id):
     else:
         st.info("Upload resumes and enter a job description to see the ranking.")
 
+def hr_batch_ranking_app(user_id):
+    jd_files = st.file_uploader("Upload job descriptions (.txt), one file per role", type=["txt"], accept_multiple_files=True, key="hr_batch_jds")
+    uploaded_files = st.file_uploader("Upload PDF resumes for ranking", type=["pdf"], accept_multiple_files=True, key="hr_batch_resumes")
+    top_k = int(st.number_input("Shortlist size per role", min_value=1, value=10, step=1, key="hr_batch_top_k"))
+
+    if jd_files and uploaded_files:
+        import pandas as pd
+        from st_aggrid import AgGrid, GridOptionsBuilder
+        from ranking import get_resume_index, rank_resumes_multi, read_job_description
+        resume_names = [file.name for file in uploaded_files]
+        roles = [os.path.splitext(file.name)[0] for file in jd_files]
+        job_descriptions = [read_job_description(file.getvalue()) for file in jd_files]
+        resumes_text = extract_uploaded_resumes_hr(uploaded_files)
+        scores, shortlists = rank_resumes_multi(job_descriptions, resumes_text, index=get_resume_index(user_id), k=top_k)
+
+        st.success(f"Ranked {len(resume_names)} resumes against {len(roles)} job descriptions!")
+        st.subheader("Shortlists by Role")
+        for i, (role, role_scores, shortlist) in enumerate(zip(roles, scores, shortlists)):
+            with st.expander(f"{role} (top {len(shortlist)})", expanded=i == 0):
+                shortlist_df = pd.DataFrame({
+                    "Resume": [resume_names[j] for j in shortlist],
+                    "Score": role_scores[shortlist].round(2)
+                })
+                shortlist_df.index += 1
+                gb = GridOptionsBuilder.from_dataframe(shortlist_df)
+                gb.configure_columns(['Score'], type=['numericColumnFilter', 'customNumericFormat'], precision=2)
+                AgGrid(shortlist_df, gridOptions=gb.build(), height=300, fit_columns_on_grid_load=True, key=f"hr_batch_grid_{i}")
+
+        st.subheader("Score Matrix")
+        st.dataframe(pd.DataFrame(scores.T.round(2), index=resume_names, columns=roles))
+
+        if st.button("Save Ranking History", key="save_hr_batch_ranking"):
+            saved = [
+                save_hr_ranking_history(user_id, job_description, [resume_names[j] for j in shortlist], role_scores[shortlist].tolist())
+                for job_description, role_scores, shortlist in zip(job_descriptions, scores, shortlists)
+            ]
+            if all(saved):
+                st.success(f"Ranking history saved for {len(saved)} roles.")
+            else:
+                st.error("Failed to save ranking history for some roles.")
+    elif jd_files:
+        st.warning("Please upload resumes to perform ranking.")
+    elif uploaded_files:
+        st.warning("Please upload at least one job description to rank the resumes.")
+    else:
+        st.info("Upload job descriptions and resumes to see a shortlist for every role.")
+
+def release_uploaded_file(ctx, file_id):
+    # Drops Streamlit's in-memory copy of an upload. remove_file is not part of
+    # Streamlit's public API; if a release lacks it, the copy stays until the
+    # session ends, which is what Streamlit does on its own.
+    remove_file = getattr(getattr(ctx, "uploaded_file_mgr", None), "remove_file", None)
+    if remove_file is None:
+        return
+    try:
+        remove_file(ctx.session_id, file_id)
+    except Exception:
+        pass
+
+def store_uploaded_videos(uploaded_videos):
+    # Streams each upload into the bounded upload store and enqueues it, then
+    # drops Streamlit's in-memory copy. The uploader gets a new key so the
+    # released files are not offered to the script again. Streamlit has
+    # already buffered each file (up to server.maxUploadSize) by the time the
+    # script sees it; the store bounds what is kept after that.
+    from jobs import get_job_queue
+    batch = st.session_state.setdefault("soft_skill_jobs", {})
+    stored = [path for path in st.session_state.get("soft_skill_uploads", []) if os.path.exists(path)]
+    rejected = st.session_state.setdefault("soft_skill_rejected", [])
+    ctx = get_script_run_ctx()
+    for video in uploaded_videos:
+        try:
+            path, video_hash = get_upload_store().save(video, video.size, video.name, stored)
+        except UploadRejected as err:
+            rejected.append(f"{video.name} was not accepted: {err}.")
+        else:
+            stored.append(path)
+            batch[get_job_queue().submit(video.name, path, video_hash)] = video.name
+        finally:
+            if ctx is not None:
+                release_uploaded_file(ctx, video.file_id)
+    st.session_state["soft_skill_uploads"] = stored
+    st.session_state["soft_skill_uploader"] = st.session_state.get("soft_skill_uploader", 0) + 1
+    st.rerun()
+
+@st.fragment(run_every=1)
+def soft_skill_job_progress(job_ids):
+    from jobs import DONE, FAILED, QUEUED, get_job_queue
+    jobs = get_job_queue().status(job_ids)
+    if all(job["status"] in (DONE, FAILED) for job in jobs.values()):
+        st.rerun()
+    for job in jobs.values():
+        label = "waiting in queue" if job["status"] == QUEUED else job["status"]
+        st.progress(job["progress"], text=f"{job['name']}: {label}")
+
 def hr_soft_skill_ranking_app(user_id):
     st.subheader("Soft Skill Ranking")
     st.info("Upload interview videos for analysis based on communication, tone, and confidence.")
-    uploaded_videos = st.file_uploader("Upload Video files for soft skill analysis", type=["mp4", "avi", "mov"], accept_multiple_files=True)
-
+    uploader_key = f"soft_skill_videos_{st.session_state.get('soft_skill_uploader', 0)}"
+    uploaded_videos = st.file_uploader("Upload Video files for soft skill analysis", type=["mp4", "avi", "mov"], accept_multiple_files=True, key=uploader_key)
     if uploaded_videos:
-        st.info("Note: Soft skill analysis is a complex task and this is a simplified simulation.")
-        with st.spinner("Analyzing videos..."):
-            video_names = [video.name for video in uploaded_videos]
-            communication_scores = np.random.uniform(0.6, 0.95, len(uploaded_videos)).round(2)
-            tone_scores = np.random.uniform(0.55, 0.9, len(uploaded_videos)).round(2)
-            confidence_scores = np.random.uniform(0.7, 1.0, len(uploaded_videos)).round(2)
-
-            results_df = pd.DataFrame({
-                "Video Name": video_names,
-                "Communication": communication_scores,
-                "Tone": tone_scores,
-                "Confidence": confidence_scores
-            })
-            results_df['Combined Score'] = ((communication_scores + tone_scores + confidence_scores) / 3).round(2)
-            ranked_results = results_df.sort_values(by='Combined Score', ascending=False).reset_index(drop=True)
-            ranked_results.index += 1
+        store_uploaded_videos(uploaded_videos)
+    for message in st.session_state.pop("soft_skill_rejected", []):
+        st.error(message)
+
+    batch = st.session_state.get("soft_skill_jobs")
+    if batch:
+        from jobs import DONE, FAILED, get_job_queue
+        st.info("Note: Scores are derived from the audio track (speaking pace, pauses, filler sounds, pitch and loudness variation) and sampled video frames (face on camera, head movement, eye-region contrast), not from the words spoken.")
+        if st.button("Clear Videos", key="clear_soft_skill_jobs"):
+            del st.session_state["soft_skill_jobs"]
+            st.rerun()
+        jobs = get_job_queue().status(batch)
+        if any(job["status"] not in (DONE, FAILED) for job in jobs.values()):
+            st.write("Videos are analyzed in the background. You can keep using the app; results appear here when every video is done.")
+            soft_skill_job_progress(list(batch))
+            return
+
+        video_names, analyses = [], []
+        for job_id, name in batch.items():
+            job = jobs[job_id]
+            if job["status"] == FAILED:
+                st.error(f"Could not analyze {name}: {job['error']}")
+            else:
+                analyses.append(job["result"])
+                video_names.append(name)
+        if not analyses:
+            return
+
+        import pandas as pd
+        from st_aggrid import AgGrid, GridOptionsBuilder
+        results_df = pd.DataFrame({
+            "Video Name": video_names,
+            "Communication": [analysis["Communication"] for analysis in analyses],
+            "Tone": [analysis["Tone"] for analysis in analyses],
+            "Confidence": [analysis["Confidence"] for analysis in analyses]
+        })
+        results_df['Combined Score'] = results_df[["Communication", "Tone", "Confidence"]].mean(axis=1).round(2)
+        ranked_results = results_df.sort_values(by='Combined Score', ascending=False).reset_index(drop=True)
+        ranked_results.index += 1
 
         st.success("Soft skill analysis complete!")
         st.subheader("Soft Skill Ranking Results")
@@ -425,16 +627,21 @@ def hr_soft_skill_ranking_app(user_id):
         AgGrid(ranked_results, gridOptions=gridOptions, height=350, fit_columns_on_grid_load=True)
 
         st.subheader("Detailed Scores")
-        st.bar_chart(ranked_results.set_index("Video Name")[["Communication", "Tone", "Confidence"]])
+        from charts import CHART_MAX_ITEMS, grouped_bar_chart
+        skills = ["Communication", "Tone", "Confidence"]
+        st.image(grouped_bar_chart(ranked_results["Video Name"].tolist(), {skill: ranked_results[skill].to_numpy() for skill in skills}), use_container_width=True)
         
         # Add the description below the bar chart
         st.subheader("Understanding Of Results")
         st.write("The bar chart above displays the scores for each video based on three key soft skills: Communication, Tone, and Confidence. Higher scores indicate better performance in these areas, helping to identify candidates with strong interpersonal skills.")
+        if len(ranked_results) > CHART_MAX_ITEMS:
+            st.caption(f"The {CHART_MAX_ITEMS - 1} best-scoring videos are shown on their own; the average of the other {len(ranked_results) - CHART_MAX_ITEMS + 1} is shown as one group.")
 
         scores_data = ranked_results[['Video Name', 'Communication', 'Tone', 'Confidence', 'Combined Score']].to_dict('records')
 
         if st.button("Save Soft Skill History", key="save_hr_soft_skill"):
-            if save_hr_soft_skill_history(user_id, video_names, [score['Combined Score'] for score in scores_data]):
+            # Names and scores both come from ranked_results, which is sorted by score.
+            if save_hr_soft_skill_history(user_id, [score['Video Name'] for score in scores_data], [score['Combined Score'] for score in scores_data]):
                 st.success("Soft skill ranking history saved.")
             else:
                 st.error("Failed to save soft skill ranking history.")
@@ -458,52 +665,81 @@ def hr_feedback_app(user_id):
         st.info("Your feedback has been submitted.")
         del st.session_state["hr_feedback_submitted"]
 
+def history_page_cursor(key):
+    if key not in st.session_state:
+        st.session_state[key] = [None]
+    return st.session_state[key][-1]
+
+def history_page_controls(key, next_cursor):
+    cursors = st.session_state[key]
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("Newer", key=f"{key}_newer", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(cursors)}")
+    with col3:
+        if st.button("Older", key=f"{key}_older", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
+
 def hr_manage_history_app(user_id):
+    import pandas as pd
+    from st_aggrid import AgGrid
     st.subheader("Manage History")
 
     with st.expander("Resume Ranking History", expanded=True):
-        ranking_history = get_hr_ranking_history(user_id)
+        ranking_history, next_cursor = get_hr_ranking_history(user_id, history_page_cursor("hr_ranking_history_pages"))
         if ranking_history:
+            runs, resumes, avg_score = get_hr_ranking_summary(user_id)
+            st.caption(f"{runs} rankings, {resumes} resumes ranked, average score {avg_score:.2f}" if avg_score is not None else f"{runs} rankings")
             simplified_history = []
-            for jd, resumes_str, scores_str, timestamp in ranking_history:
-                resumes = resumes_str.split(',')
-                scores = [float(s) for s in scores_str.split(',')] if scores_str else []
+            for ranking_id, jd_preview, timestamp, resume_count, avg_score in ranking_history:
                 simplified_history.append({
                     "Action": " Resume Ranking",
-                    "Job Description": jd[:50] + "...",
-                    "Resumes": ", ".join(resumes),
-                    "Avg. Score": f"{np.mean(scores).round(2):.2f}" if scores else "N/A",
+                    "Job Description": jd_preview[:50] + "...",
+                    "Resumes": resume_count,
+                    "Avg. Score": f"{avg_score:.2f}" if avg_score is not None else "N/A",
                     "Timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S")
                 })
-            if simplified_history:
-                history_df = pd.DataFrame(simplified_history)
-                history_df.index += 1
-                AgGrid(history_df, height=300, fit_columns_on_grid_load=True)
-            else:
-                st.info("No resume ranking history available.")
+            history_df = pd.DataFrame(simplified_history)
+            history_df.index += 1
+            AgGrid(history_df, height=300, fit_columns_on_grid_load=True)
+            history_page_controls("hr_ranking_history_pages", next_cursor)
+
+            labels = {ranking_id: f"{timestamp:%Y-%m-%d %H:%M:%S} - {jd_preview[:40]}" for ranking_id, jd_preview, timestamp, _, _ in ranking_history}
+            selected = st.selectbox("Show ranked resumes for", list(labels), index=None, format_func=labels.get, placeholder="Select a ranking", key="hr_ranking_history_detail")
+            if selected is not None:
+                details_df = pd.DataFrame(get_hr_ranking_details(user_id, selected), columns=["Rank", "Resume", "Score"]).set_index("Rank")
+                st.dataframe(details_df.round(2), use_container_width=True)
         else:
             st.info("No resume ranking history available.")
 
     with st.expander("Soft Skill Ranking History", expanded=True):
-        soft_skill_history = get_hr_soft_skill_history(user_id)
+        soft_skill_history, next_cursor = get_hr_soft_skill_history(user_id, history_page_cursor("hr_soft_skill_history_pages"))
         if soft_skill_history:
+            runs, videos, avg_score = get_hr_soft_skill_summary(user_id)
+            st.caption(f"{runs} analyses, {videos} videos analysed, average combined score {avg_score:.2f}" if avg_score is not None else f"{runs} analyses")
             simplified_history = []
-            for videos_str, scores_str, timestamp in soft_skill_history:
-                videos = videos_str.split(',')
-                scores = [float(s) for s in scores_str.split(',')] if scores_str else []
-                avg_combined_score = np.mean(scores).round(2) if scores else "N/A"
+            for analysis_id, timestamp, video_count, avg_score in soft_skill_history:
+                avg_combined_score = round(avg_score, 2) if avg_score is not None else "N/A"
                 simplified_history.append({
                     "Action": "Soft Skill Ranking",
-                    "Videos": ", ".join(videos),
+                    "Videos": video_count,
                     "Avg. Combined Score": avg_combined_score,
                     "Timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S")
                 })
-            if simplified_history:
-                history_df = pd.DataFrame(simplified_history)
-                history_df.index += 1
-                AgGrid(history_df, height=300, fit_columns_on_grid_load=True)
-            else:
-                st.info("No soft skill ranking history available.")
+            history_df = pd.DataFrame(simplified_history)
+            history_df.index += 1
+            AgGrid(history_df, height=300, fit_columns_on_grid_load=True)
+            history_page_controls("hr_soft_skill_history_pages", next_cursor)
+
+            labels = {analysis_id: f"{timestamp:%Y-%m-%d %H:%M:%S} ({video_count} videos)" for analysis_id, timestamp, video_count, _ in soft_skill_history}
+            selected = st.selectbox("Show analysed videos for", list(labels), index=None, format_func=labels.get, placeholder="Select an analysis", key="hr_soft_skill_history_detail")
+            if selected is not None:
+                details_df = pd.DataFrame(get_hr_soft_skill_details(user_id, selected), columns=["Rank", "Video", "Combined Score"]).set_index("Rank")
+                st.dataframe(details_df.round(2), use_container_width=True)
         else:
             st.info("No soft skill ranking history available.")
 
@@ -517,6 +753,37 @@ def hr_manage_history_app(user_id):
         else:
             st.info("No feedback history available.")
 
+def is_admin():
+    return st.session_state.get("username") in ADMIN_USERS
+
+def timing_panel_app():
+    import pandas as pd
+    st.subheader("Timings")
+    st.caption("Timers and counters recorded by this server process since it started, for every user. "
+               "p95 is the upper bound of the histogram bucket holding it.")
+    counters, timers = metrics.snapshot()
+    if timers:
+        timers_df = pd.DataFrame([{
+            "Timer": timer["name"].removesuffix("_seconds"),
+            "Labels": ", ".join(f"{name}={value}" for name, value in timer["labels"].items()),
+            "Count": timer["count"],
+            "Total (s)": round(timer["sum"], 3),
+            "Mean (ms)": round(timer["sum"] / timer["count"] * 1000, 2),
+            "p95 (ms)": round(timer["p95"] * 1000, 2),
+            "Max (ms)": round(timer["max"] * 1000, 2)
+        } for timer in timers])
+        st.dataframe(timers_df.sort_values("Total (s)", ascending=False), hide_index=True, use_container_width=True)
+    else:
+        st.info("Nothing has been timed yet.")
+    if counters:
+        counters_df = pd.DataFrame([{
+            "Counter": counter["name"],
+            "Labels": ", ".join(f"{name}={value}" for name, value in counter["labels"].items()),
+            "Value": counter["value"]
+        } for counter in counters])
+        st.dataframe(counters_df, hide_index=True, use_container_width=True)
+    st.download_button("Download Prometheus metrics", metrics.render(), file_name="rankitright.prom", mime="text/plain", key="timings_download")
+
 def hr_home_app():
     st.subheader("Welcome to the HR Dashboard")
     st.write("This platform is designed to streamline your hiring process, allowing you to efficiently manage resumes, analyze candidates' soft skills, and provide constructive feedback. Use the navigation menu to explore the various features available to you.")
@@ -534,37 +801,31 @@ def hr_home_app():
     st.write("### Need Help?")
     st.write("If you have any questions or need assistance then you can access our chatbot.")
 
+def chatbot_response(faq, user_input, fallback):
+    # Answers come from faq/<name>.json; see chatbot.py for the matching.
+    from chatbot import get_faq_index
+    try:
+        return get_faq_index(faq).answer(user_input) or fallback
+    except (OSError, ValueError, KeyError) as err:
+        st.error(f"Error loading the chatbot FAQ: {err}")
+        return fallback
+
 def hr_chatbot_app():
     st.subheader("HR Chatbot")
     st.info("Ask your HR-related questions below:")
 
     user_input = st.text_input("Your question:")
 
-    responses = {
-        "How do I rank resumes on RankItRight?": "To rank resumes, navigate to the 'Resume Ranking' section in the sidebar. Enter the job description in the text area provided and upload the PDF resumes you want to rank using the file uploader.",
-        "What file types are supported for resume ranking?": "Currently, the 'Resume Ranking' feature only supports PDF files for resume uploads.",
-        "Is there a limit to the number of resumes I can upload for ranking?": "While there isn't a strict limit, uploading a very large number of resumes at once might take longer to process. For optimal performance, we recommend uploading in batches if you have hundreds of applications.",
-        "How are the resumes ranked? What is the 'Score' based on?": "The resumes are ranked based on the similarity of their content to the job description you provide. The 'Score' represents a cosine similarity score, where a higher score indicates a greater textual similarity between the resume and the job description.",
-        "Can I save the resume ranking results?": "Yes, after the resumes are ranked, you'll see a 'Save Ranking History' button. Clicking this will save the job description, the names of the uploaded resumes, and their scores to your history, which you can access in the 'Manage History' section.",
-        "How does the 'Soft Skill Ranking' feature work?": "The 'Soft Skill Ranking' section allows you to upload interview video files. The website then performs a simulated analysis based on factors like communication, tone, and confidence, providing a score for each. Please note that this is a simplified simulation for demonstration purposes.",
-        "What video file types are supported for soft skill ranking?": "The 'Soft Skill Ranking' feature currently supports MP4, AVI, and MOV video file formats.",
-        "What do the 'Communication', 'Tone', and 'Confidence' scores represent?": "These scores are part of a simulated analysis and represent a numerical assessment (on a scale of 0 to 1, approximately) of the candidate's communication clarity, tone during the interview, and perceived confidence levels, based on the uploaded video.",
-        "Can I save the soft skill ranking results?": "Yes, after the analysis is complete, a 'Save Soft Skill History' button will appear. Clicking this saves the video file names and their combined scores to your history in the 'Manage History' section.",
-        "Where can I provide feedback on the RankItRight platform?": "You can provide feedback by navigating to the 'Feedback' section in the sidebar. There, you'll find a text area where you can enter your comments and suggestions. Click the 'Submit Feedback' button to send it.",
-        "Is my feedback anonymous?": "Your feedback is associated with your user account so that we can understand the context. However, your specific identity will be kept confidential when reviewing overall feedback trends.",
-        "Where can I see my past resume ranking history?": "You can view your past resume ranking history by clicking on 'Manage History' in the sidebar and then expanding the 'Resume Ranking History' section. This will show you a list of your previous ranking actions, including the job description (partially shown), the resumes you uploaded, their average score, and the timestamp.",
-        "Where can I see my past soft skill ranking history?": "Similarly, your past soft skill ranking history can be found in the 'Manage History' section by expanding 'Soft Skill Ranking History'. You'll see the video files you analyzed, their average combined score, and the timestamp.",
-        "Can I delete items from my history?": "Currently, the website allows you to view your history, but there is no functionality to delete individual items. This feature might be added in future updates."
-    }
-
     if st.button("Send"):
         if user_input:
-            response = responses.get(user_input, "I'm sorry, I don't have an answer for that.")
+            response = chatbot_response("hr", user_input, "I'm sorry, I don't have an answer for that.")
             st.text_area("Chatbot Response:", value=response, height=150, disabled=True)
         else:
             st.error("Please enter a question.")
 
 def student_manage_history_app(user_id):
+    import pandas as pd
+    from st_aggrid import AgGrid
     st.subheader("Manage History")
 
     with st.expander("Resume Check History", expanded=True):
@@ -615,20 +876,9 @@ def student_chatbot_app():
 
     user_input = st.text_input("Your question:")
 
-    responses = {
-        "How to write a good resume?": "Focus on clear formatting, relevant experience, and quantifiable achievements.",
-        "What sections should I include in my resume?": "Essential sections include contact information, summary/objective, experience, education, and skills.",
-        "How long should my resume be?": "Ideally, keep your resume to one page, especially if you are early in your career.",
-        "Should I include a photo in my resume?": "In most Western countries, it's not necessary and can sometimes lead to bias.",
-        "What are action verbs?": "Action verbs are strong verbs that describe your accomplishments and responsibilities (e.g., managed, developed, analyzed).",
-        "How to tailor my resume to a job description?": "Identify the key skills and requirements mentioned in the job description and highlight those in your resume.",
-        "What is a cover letter?": "A cover letter is a brief introduction to your resume, highlighting your interest in the position and company.",
-        "How to prepare for an interview?": "Research the company, practice common interview questions, and prepare thoughtful questions to ask the interviewer.",
-    }
-
     if st.button("Send"):
         if user_input:
-            response = responses.get(user_input, "I'm sorry, I don't have information on that. You might find helpful resources on career guidance websites.")
+            response = chatbot_response("student", user_input, "I'm sorry, I don't have information on that. You might find helpful resources on career guidance websites.")
             st.text_area("Chatbot Response:", value=response, height=150, disabled=True)
         else:
             st.error("Please enter a question.")
@@ -646,10 +896,13 @@ def student_app(user_id, show_page):
         show_page("student_manage_history")
     if st.sidebar.button("Chatbot", key="student_chatbot_btn", use_container_width=True):
         show_page("student_chatbot")
+    if is_admin() and st.sidebar.button("Timings", key="student_timings_btn", use_container_width=True):
+        show_page("student_timings")
     if st.sidebar.button("Logout", key="student_logout_btn", use_container_width=True):
         st.session_state["logged_in"] = False
         st.session_state["role"] = None
         st.session_state["user_id"] = None
+        st.session_state["username"] = None
         st.session_state.student_current_page = None
         st.rerun()
 
@@ -664,6 +917,8 @@ def student_app(user_id, show_page):
         student_manage_history_app(user_id)
     elif st.session_state.student_current_page == "student_chatbot":
         student_chatbot_app()
+    elif st.session_state.student_current_page == "student_timings" and is_admin():
+        timing_panel_app()
     elif st.session_state.student_current_page is None:
         st.info("Welcome to the Student Dashboard! Use the sidebar to navigate.")
         show_page("stud_home")  # Set a default page
@@ -683,10 +938,13 @@ def hr_app(user_id, show_page):
         show_page("hr_manage_history")
     if st.sidebar.button("Chatbot", key="hr_chatbot_btn", use_container_width=True):
         show_page("hr_chatbot")
+    if is_admin() and st.sidebar.button("Timings", key="hr_timings_btn", use_container_width=True):
+        show_page("hr_timings")
     if st.sidebar.button("Logout", key="hr_logout_btn", use_container_width=True):
         st.session_state["logged_in"] = False
         st.session_state ["role"] = None
         st.session_state["user_id"] = None
+        st.session_state["username"] = None
         st.session_state.hr_current_page = None
         st.rerun()
 
@@ -704,48 +962,12 @@ def hr_app(user_id, show_page):
         hr_manage_history_app(user_id)
     elif st.session_state.hr_current_page == "hr_chatbot":
         hr_chatbot_app()
+    elif st.session_state.hr_current_page == "hr_timings" and is_admin():
+        timing_panel_app()
     elif st.session_state.hr_current_page is None:
         st.info("Welcome to the HR Professional Dashboard! Use the sidebar to navigate.")
         show_page("hr_home")  # Set a default page
 
-# --- Main App with Login and Role Selection ---
-st.markdown('<style>h1 { font-family: "Times New Roman", Times, serif !important; }</style>', unsafe_allow_html=True)
-st.title("RankItRight")
-
-# Custom CSS for gradient buttons
-st.markdown(
-    """
-    <style>
-    .stButton>button {
-        background: linear-gradient(to right, #007bff, #00bfff); /* Adjust colors as needed */
-        color: white;
-        border: none;
-        border-radius: 5px;
-        padding: 10px 20px;
-        font-size: 16px;
-        cursor: pointer;
-        transition: background 0.3s ease;
-    }
-
-    .stButton>button:hover {
-        background: linear-gradient(to right, #00bfff, #007bff); /* Reverse gradient on hover */
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
-
-if "logged_in" not in st.session_state:
-    st.session_state["logged_in"] = False
-if "role" not in st.session_state:
-    st.session_state["role"] = None
-if "user_id" not in st.session_state:
-    st.session_state["user_id"] = None
-if "hr_current_page" not in st.session_state:
-    st.session_state["hr_current_page"] = None
-if "student_current_page" not in st.session_state:
-    st.session_state["student_current_page"] = None
-
 def show_hr_page(page_name):
     st.session_state.hr_current_page = page_name
 
@@ -777,7 +999,7 @@ def login_page():
 
     For HR Professionals:
     - Effortlessly rank numerous resumes based on job description similarity.
-    - Gain insights into candidates' soft skills through video analysis (simulated).
+    - Gain insights into candidates' soft skills through audio and visual analysis of interview videos.
     - Keep track of your ranking history and provide valuable feedback.
 
     For Students:
@@ -801,16 +1023,17 @@ def login_page():
 
     with col2:
         st.markdown("### Login")
-        username = st.text_input("Username")
-        password = st.text_input("Password", type="password")
+        username = st.text_input("Username", key="login_username")
+        password = st.text_input("Password", type="password", key="login_password")
 
-        if st.button("Login", use_container_width=True):
+        if st.button("Login", key="login_btn", use_container_width=True):
             if username and password:
                 user_id, role = verify_user(username, password)
                 if user_id:
                     st.session_state["logged_in"] = True
                     st.session_state["role"] = role
                     st.session_state["user_id"] = user_id
+                    st.session_state["username"] = username
                     st.success(f"Logged in as {role}!")
                     if role == "HR Professional":
                         st.session_state.hr_current_page = "hr_home"  # Default HR page
@@ -822,10 +1045,64 @@ def login_page():
             else:
                 st.error("Please enter a username and password.")
 
-if not st.session_state["logged_in"]:
-    login_page()
-else:
-    if st.session_state["role"] == "HR Professional":
-        hr_app(st.session_state["user_id"], show_hr_page)
-    elif st.session_state["role"] == "Student":
-        student_app(st.session_state["user_id"], show_student_page)
\ No newline at end of file
+# --- Main App with Login and Role Selection ---
+def main():
+    st.markdown('<style>h1 { font-family: "Times New Roman", Times, serif !important; }</style>', unsafe_allow_html=True)
+    st.title("RankItRight")
+
+    # Custom CSS for gradient buttons
+    st.markdown(
+        """
+        <style>
+        .stButton>button {
+            background: linear-gradient(to right, #007bff, #00bfff); /* Adjust colors as needed */
+            color: white;
+            border: none;
+            border-radius: 5px;
+            padding: 10px 20px;
+            font-size: 16px;
+            cursor: pointer;
+            transition: background 0.3s ease;
+        }
+
+        .stButton>button:hover {
+            background: linear-gradient(to right, #00bfff, #007bff); /* Reverse gradient on hover */
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    if "logged_in" not in st.session_state:
+        st.session_state["logged_in"] = False
+    if "role" not in st.session_state:
+        st.session_state["role"] = None
+    if "user_id" not in st.session_state:
+        st.session_state["user_id"] = None
+    if "username" not in st.session_state:
+        st.session_state["username"] = None
+    if "hr_current_page" not in st.session_state:
+        st.session_state["hr_current_page"] = None
+    if "student_current_page" not in st.session_state:
+        st.session_state["student_current_page"] = None
+
+    # Each run is timed under the page it started on. RANKITRIGHT_METRICS_PORT
+    # also serves the metrics to Prometheus from this process.
+    metrics.serve()
+    # History rows are keyed by the Username column, a foreign key to
+    # Users(Username), so the pages get the username rather than the UserID.
+    if not st.session_state["logged_in"] or not st.session_state["username"]:
+        with metrics.timer("page_run", page="login"):
+            login_page()
+    else:
+        if st.session_state["role"] == "HR Professional":
+            with metrics.timer("page_run", page=st.session_state["hr_current_page"] or "hr_home"):
+                hr_app(st.session_state["username"], show_hr_page)
+        elif st.session_state["role"] == "Student":
+            with metrics.timer("page_run", page=st.session_state["student_current_page"] or "stud_home"):
+                student_app(st.session_state["username"], show_student_page)
+
+# Worker processes for PDF extraction and video analysis are spawned, so they
+# re-import this file as __mp_main__; only Streamlit's run draws the app.
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction import EXTRACTORS, parse_pdf
+
+RESUMES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resumes")
+
+def bench_backend(extractor, documents, repeat):
+    timings = []
+    chars = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        chars = 0
+        for data in documents:
+            chars += len(parse_pdf(data, extractor)["text"])
+        timings.append(time.perf_counter() - start)
+    return min(timings), chars
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare PDF text extractor backends on a folder of resumes.")
+    parser.add_argument("--resumes", default=RESUMES_DIR, help="Directory of PDF resumes (default: resumes/)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per backend; the fastest is reported")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.resumes, "*.pdf")))
+    if not paths:
+        sys.exit(f"No PDFs found in {args.resumes}")
+    documents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            documents.append(f.read())
+
+    print(f"{len(documents)} PDFs, best of {args.repeat} runs")
+    print(f"{'backend':<12}{'total (s)':>12}{'per PDF (ms)':>15}{'chars':>10}{'speedup':>10}")
+    baseline = None
+    for name, extractor in EXTRACTORS.items():
+        seconds, chars = bench_backend(extractor, documents, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:<12}{seconds:>12.3f}{seconds / len(documents) * 1000:>15.1f}{chars:>10}{baseline / seconds:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
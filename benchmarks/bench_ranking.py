@@ -0,0 +1,60 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ranking import rank_resumes_hr
+
+def make_corpus(n_resumes, vocabulary_size, words_per_resume, seed=0):
+    # Zipf-distributed word ids give a realistic long tail of rare terms.
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"term{i}" for i in range(vocabulary_size)])
+    def document(length):
+        ids = np.minimum(rng.zipf(1.2, length), vocabulary_size) - 1
+        return " ".join(vocabulary[ids])
+    return document(words_per_resume // 2), [document(words_per_resume) for _ in range(n_resumes)]
+
+def rank_resumes_dense(job_description, resumes):
+    vectors = TfidfVectorizer().fit_transform([job_description] + resumes).toarray()
+    return cosine_similarity([vectors[0]], vectors[1:]).flatten()
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 2**20
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and peak memory of rank_resumes_hr against the old dense implementation.")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated resume counts")
+    parser.add_argument("--vocabulary", type=int, default=60000, help="Synthetic vocabulary size")
+    parser.add_argument("--words", type=int, default=600, help="Words per synthetic resume")
+    parser.add_argument("--dense-limit-mb", type=float, default=2048, help="Skip the dense baseline above this estimated matrix size")
+    args = parser.parse_args()
+
+    print(f"{'resumes':>8}{'vocab':>8}{'sparse (s)':>12}{'sparse MB':>11}{'dense (s)':>11}{'dense MB':>10}")
+    for n in [int(size) for size in args.sizes.split(",")]:
+        job_description, resumes = make_corpus(n, args.vocabulary, args.words)
+        scores, sparse_seconds, sparse_mb = measure(rank_resumes_hr, job_description, resumes)
+        vocab = len(TfidfVectorizer().fit([job_description] + resumes).vocabulary_)
+        dense_estimate_mb = (n + 1) * vocab * 8 / 2**20
+        if dense_estimate_mb <= args.dense_limit_mb:
+            dense_scores, dense_seconds, dense_mb = measure(rank_resumes_dense, job_description, resumes)
+            assert np.allclose(scores, dense_scores)
+            dense = f"{dense_seconds:>11.3f}{dense_mb:>10.0f}"
+        else:
+            dense = f"{'skipped':>11}{f'~{dense_estimate_mb:.0f}':>10}"
+        print(f"{n:>8}{vocab:>8}{sparse_seconds:>12.3f}{sparse_mb:>11.1f}{dense}")
+
+if __name__ == "__main__":
+    main()
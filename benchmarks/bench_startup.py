@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+RESUMES_DIR = os.path.join(ROOT, "resumes")
+JOB_DESCRIPTION_PATH = os.path.join(ROOT, "sample job descriptions", "sample1.txt")
+sys.path.insert(0, ROOT)
+
+# Third-party packages whose import dominates a cold start.
+HEAVY_MODULES = ["sklearn", "scipy", "pandas", "matplotlib", "numpy", "st_aggrid", "pdfplumber", "pypdfium2", "mysql"]
+
+# The page each benchmark opens after logging in, as the sidebar buttons
+# would; None stays on the login page.
+PAGES = {"login": None, "ranking": "hr_resume_ranking", "history": "hr_manage_history"}
+
+BENCH_USER = "bench"
+BENCH_PASSWORD = "bench-password"
+
+IMPORT_SNIPPET = f"""
+import json, sys, time
+sys.path.insert(0, {ROOT!r})
+start = time.perf_counter()
+import app
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+def run_json(args, env=None):
+    process = subprocess.run(args, capture_output=True, text=True, cwd=ROOT, env=env)
+    if process.returncode != 0:
+        sys.exit(process.stderr)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def bench_import(repeat):
+    # Each run is a fresh interpreter, so nothing is already in sys.modules.
+    runs = [run_json([sys.executable, "-c", IMPORT_SNIPPET]) for _ in range(repeat)]
+    return [run["seconds"] for run in runs], runs[-1]["loaded"]
+
+
+def seed_history(username, password, rankings):
+    # The account is created with the app's password hash, so the benchmark
+    # logs in through the form; history is keyed by the username.
+    import hashlib
+    from database import get_repository
+    repository = get_repository()
+    repository.create_user(username, hashlib.sha256(password.encode()).hexdigest(), "HR Professional")
+    for i in range(rankings):
+        repository.save_hr_ranking(username, f"Synthetic job description {i} for a data analyst role", [f"resume_{j}.pdf" for j in range(25)], [j / 25 for j in range(25)])
+        repository.save_hr_soft_skill(username, [f"video_{j}.mp4" for j in range(5)], [j / 5 for j in range(5)])
+    repository.save_hr_feedback(username, "Synthetic feedback")
+
+
+def log_in(at, username, password):
+    at.run()
+    at.text_input(key="login_username").set_value(username)
+    at.text_input(key="login_password").set_value(password)
+    at.button(key="login_btn").click()
+    at.run()
+    if not at.session_state["logged_in"]:
+        sys.exit(f"Could not log in as {username}")
+
+
+# AppTest polls for the script to finish, which would swamp a rerun that takes
+# a few milliseconds, so the page runs inside this wrapper and times itself.
+TIMED_PAGE = """
+import time
+import streamlit as st
+
+@st.cache_resource
+def app_code():
+    with open({app_path!r}, encoding="utf-8") as f:
+        return compile(f.read(), {app_path!r}, "exec")
+
+code = app_code()
+start = time.perf_counter()
+try:
+    exec(code, {{"__name__": "__main__", "__file__": {app_path!r}}})
+finally:
+    st.session_state.setdefault("bench_run_seconds", []).append(time.perf_counter() - start)
+"""
+
+
+def fill_ranking_inputs(at):
+    # The ranking page is timed with results on screen: a job description and
+    # the sample resumes, so reruns include scoring, the grid and the chart.
+    with open(JOB_DESCRIPTION_PATH, encoding="utf-8", errors="replace") as f:
+        at.text_area[0].set_value(f.read())
+    files = []
+    for name in sorted(os.listdir(RESUMES_DIR)):
+        if name.endswith(".pdf"):
+            with open(os.path.join(RESUMES_DIR, name), "rb") as f:
+                files.append((name, f.read(), "application/pdf"))
+    at.file_uploader[0].set_value(files)
+
+
+PAGE_INPUTS = {"ranking": fill_ranking_inputs}
+
+
+def page_worker(page, reruns, rankings):
+    # Runs in its own interpreter: the first run with the page's inputs pays
+    # for every import the page triggers, the reruns show the steady
+    # per-interaction cost.
+    from streamlit.testing.v1 import AppTest
+    seed_history(BENCH_USER, BENCH_PASSWORD, rankings)
+    at = AppTest.from_string(TIMED_PAGE.format(app_path=APP_PATH), default_timeout=120)
+    if PAGES[page] is not None:
+        log_in(at, BENCH_USER, BENCH_PASSWORD)
+        at.session_state["hr_current_page"] = PAGES[page]
+    if page in PAGE_INPUTS:
+        at.run()
+        PAGE_INPUTS[page](at)
+    for _ in range(reruns + 1):
+        at.run()
+        if at.exception:
+            sys.exit(f"{page} page raised: {at.exception[0].message}")
+    timings = at.session_state["bench_run_seconds"][-(reruns + 1):]
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(json.dumps({"cold": timings[0], "warm": timings[1:], "loaded": loaded}))
+
+
+def bench_page(page, reruns, rankings):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, RANKITRIGHT_DB_BACKEND="sqlite", RANKITRIGHT_SQLITE_PATH=os.path.join(tmp, "bench.db"),
+                   RANKITRIGHT_INDEX_DIR=os.path.join(tmp, "resume_index"), RANKITRIGHT_CACHE_DIR=os.path.join(tmp, "extracted_text"))
+        return run_json([sys.executable, os.path.abspath(__file__), "--page", page, "--reruns", str(reruns), "--rankings", str(rankings)], env=env)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time of app.py and per-rerun latency of the login, ranking and history pages.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters used to time the import")
+    parser.add_argument("--reruns", type=int, default=20, help="Warm reruns timed per page")
+    parser.add_argument("--rankings", type=int, default=30, help="Ranking and soft skill runs seeded into the history")
+    parser.add_argument("--pages", default=",".join(PAGES), help="Comma-separated pages to time")
+    parser.add_argument("--json", help="Also write the measurements to this file")
+    parser.add_argument("--page", choices=list(PAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.page:
+        page_worker(args.page, args.reruns, args.rankings)
+        return
+
+    import_seconds, loaded = bench_import(args.repeat)
+    print(f"import app: best {min(import_seconds) * 1000:.0f} ms, median {statistics.median(import_seconds) * 1000:.0f} ms over {args.repeat} fresh interpreters")
+    print(f"  heavy modules loaded by the import: {', '.join(loaded) or 'none'}")
+    print()
+    print(f"{'page':<10}{'first run (ms)':>16}{'rerun median (ms)':>19}{'rerun p95 (ms)':>16}  heavy modules loaded")
+    report = {"import": {"seconds": import_seconds, "loaded": loaded}, "pages": {}}
+    for page in args.pages.split(","):
+        result = bench_page(page, args.reruns, args.rankings)
+        warm = sorted(result["warm"])
+        p95 = warm[min(len(warm) - 1, int(len(warm) * 0.95))]
+        print(f"{page:<10}{result['cold'] * 1000:>16.0f}{statistics.median(warm) * 1000:>19.1f}{p95 * 1000:>16.1f}  {', '.join(result['loaded']) or 'none'}")
+        report["pages"][page] = result
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import DEFAULT_SEED, corpus_digest, job_descriptions, resume_pdfs
+
+# Times the main resume paths on a synthetic corpus of each size and writes
+# the measurements as JSON, so two commits can be compared:
+#   python benchmarks/bench_suite.py --json before.json
+#   (check out the change)
+#   python benchmarks/bench_suite.py --json after.json --compare before.json
+# The corpus, the extraction cache, the resume index and a SQLite database
+# (standing in for MySQL) all live in a temporary directory, so a run never
+# touches the app's own data and starts from the same state every time.
+
+CASES = ["extract_cold", "extract_cached", "rank", "evaluate", "history_save", "history_page", "history_summary", "history_details"]
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=ROOT, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, cwd=ROOT).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def timed(fn, repeat):
+    # Seconds of each run and the last run's result.
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        seconds.append(time.perf_counter() - start)
+    return seconds, result
+
+
+def summary(seconds, items, **extra):
+    return {"seconds": seconds, "best": min(seconds), "median": statistics.median(seconds), "items": items, **extra}
+
+
+def bench_size(n, args, workdir):
+    # The app reads its configuration from the environment when imported,
+    # which main() has pointed at workdir.
+    import app
+    from extraction import TextCache, extract_batch, get_extractor
+
+    start = time.perf_counter()
+    files = resume_pdfs(n, args.seed)
+    jobs = job_descriptions(args.job_descriptions, args.seed)
+    corpus = {"resumes": n, "job_descriptions": len(jobs), "pdf_bytes": sum(len(data) for _, data in files),
+              "sha256": corpus_digest(files, jobs), "generate_seconds": time.perf_counter() - start}
+    extractor = get_extractor(args.extractor)
+    cases = {}
+
+    # Each cold run gets an empty cache; the cached runs reuse the last one.
+    caches = iter(TextCache(os.path.join(workdir, f"cache-{n}-{i}")) for i in range(args.repeat))
+    seconds, results = timed(lambda: extract_batch(files, workers=args.workers, cache=next(caches), extractor=extractor), args.repeat)
+    cache = TextCache(os.path.join(workdir, f"cache-{n}-{args.repeat - 1}"))
+    pages = sum(result["pages"] for result in results)
+    errors = sum(1 for result in results if result["error"])
+    cases["extract_cold"] = summary(seconds, n, pages=pages, errors=errors)
+    seconds, _ = timed(lambda: extract_batch(files, workers=args.workers, cache=cache, extractor=extractor), args.repeat)
+    cases["extract_cached"] = summary(seconds, n)
+    texts = [result["text"] for result in results]
+    names = [name for name, _ in files]
+
+    # A fresh in-memory index each run: the pool is this corpus only. The
+    # first call imports scikit-learn, so it is left out of the timings.
+    from ranking import rank_resumes_hr
+    rank_resumes_hr(jobs[0][1], texts[:1])
+    seconds, scores = timed(lambda: rank_resumes_hr(jobs[0][1], texts), args.repeat)
+    cases["rank"] = summary(seconds, n)
+
+    seconds, suggestions = timed(lambda: [app.evaluate_resume(text) for text in texts], args.repeat)
+    cases["evaluate"] = summary(seconds, n, suggestions=sum(map(len, suggestions)))
+
+    # The account goes through the app's sign-up and login; as in main(),
+    # history is then keyed by the username that logged in.
+    user, password = f"bench_{n}", "bench-password"
+    app.create_user(user, password, "HR Professional")
+    user_id, _ = app.verify_user(user, password)
+    if user_id is None:
+        sys.exit(f"Could not log in as {user}")
+    seconds, _ = timed(lambda: app.save_hr_ranking_history(user, jobs[0][1], names, scores.tolist()), args.repeat)
+    cases["history_save"] = summary(seconds, n)
+    seconds, (history, _) = timed(lambda: app.get_hr_ranking_history(user), args.repeat)
+    cases["history_page"] = summary(seconds, len(history))
+    seconds, _ = timed(lambda: app.get_hr_ranking_summary(user), args.repeat)
+    cases["history_summary"] = summary(seconds, 1)
+    seconds, details = timed(lambda: app.get_hr_ranking_details(user, history[0][0]), args.repeat)
+    cases["history_details"] = summary(seconds, len(details))
+    return {"corpus": corpus, "cases": cases}
+
+
+def print_size(n, result, baseline=None):
+    base_cases = (baseline or {}).get("cases", {})
+    if baseline and baseline["corpus"]["sha256"] != result["corpus"]["sha256"]:
+        print(f"  note: the baseline measured a different corpus for {n} resumes")
+    for case in CASES:
+        measured = result["cases"][case]
+        line = f"{n:>8}  {case:<17}{measured['best'] * 1000:>11.1f}{measured['median'] * 1000:>13.1f}{measured['items'] / measured['best']:>13.0f}"
+        if case in base_cases:
+            line += f"{base_cases[case]['best'] * 1000:>13.1f}{base_cases[case]['best'] / measured['best']:>9.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extraction, ranking, resume check and history latency on synthetic corpora, written as JSON.")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated resume counts (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; best and median are reported")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Corpus seed (default: %(default)s)")
+    parser.add_argument("--job-descriptions", type=int, default=3, help="Job descriptions generated per size")
+    parser.add_argument("--workers", type=int, help="Extraction worker processes (default: RANKITRIGHT_EXTRACTION_WORKERS)")
+    parser.add_argument("--extractor", help="PDF text extractor: fast, pdfium or pdfplumber (default: RANKITRIGHT_EXTRACTOR)")
+    parser.add_argument("--json", help="Write the measurements here (default: bench-<commit>.json)")
+    parser.add_argument("--compare", help="Measurements of an earlier run to print speedups against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ.update(RANKITRIGHT_DB_BACKEND="sqlite", RANKITRIGHT_SQLITE_PATH=os.path.join(workdir, "bench.db"),
+                          RANKITRIGHT_INDEX_DIR=os.path.join(workdir, "resume_index"), RANKITRIGHT_CACHE_DIR=os.path.join(workdir, "extracted_text"))
+        from extraction import EXTRACTION_WORKERS, get_extractor
+        report = {"meta": {"commit": commit, "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                           "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+                           "seed": args.seed, "repeat": args.repeat, "workers": args.workers or EXTRACTION_WORKERS,
+                           "extractor": get_extractor(args.extractor).name},
+                  "sizes": {}}
+        print(f"commit {commit or 'unknown'}, {report['meta']['workers']} extraction workers, {report['meta']['extractor']} extractor, best of {args.repeat}")
+        header = f"{'resumes':>8}  {'case':<17}{'best (ms)':>11}{'median (ms)':>13}{'items/s':>13}"
+        print(header + (f"{'base (ms)':>13}{'speedup':>10}" if baseline else ""))
+        for n in [int(size) for size in args.sizes.split(",")]:
+            result = bench_size(n, args, workdir)
+            report["sizes"][str(n)] = result
+            print_size(n, result, (baseline or {}).get("sizes", {}).get(str(n)))
+    path = args.json or f"bench-{(commit or 'unknown')[:12]}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {path}")
+
+if __name__ == "__main__":
+    main()
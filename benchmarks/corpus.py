@@ -0,0 +1,192 @@
+import argparse
+import hashlib
+import os
+import random
+import textwrap
+
+# Deterministic synthetic resumes and job descriptions for the benchmarks.
+# Every document is generated from its own random.Random seeded with
+# (seed, kind, number), so document 7 is the same whatever the corpus size and
+# a corpus can be regenerated on any machine instead of being checked in:
+#   python benchmarks/corpus.py /tmp/corpus --resumes 1000 --job-descriptions 5
+# Resumes are plain text PDFs written without a PDF library, 1 to 3 pages long.
+# Some leave out sections (so the resume checks fire) and about 5% are
+# re-sent copies of an earlier resume with new contact details.
+
+DEFAULT_SEED = 20240601
+LINES_PER_PAGE = 52
+DUPLICATE_SHARE = 0.05
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "scala", "kotlin", "sql", "mysql",
+    "postgresql", "mongodb", "redis", "kafka", "spark", "hadoop", "airflow", "dbt", "snowflake", "tableau",
+    "power bi", "excel", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "machine learning",
+    "deep learning", "nlp", "computer vision", "statistics", "a/b testing", "aws", "azure", "gcp", "docker",
+    "kubernetes", "terraform", "jenkins", "git", "linux", "bash", "react", "angular", "vue", "node.js", "django",
+    "flask", "spring", "hibernate", "rest apis", "graphql", "microservices", "ci/cd", "agile", "scrum", "jira",
+    "figma", "seo", "salesforce", "sap", "accounting", "financial modeling", "recruiting", "negotiation",
+    "project management", "stakeholder management", "data visualization", "etl", "unit testing", "selenium",
+]
+TITLES = [
+    "Data Analyst", "Data Scientist", "Data Engineer", "Software Engineer", "Java Developer", "Frontend Developer",
+    "Backend Developer", "DevOps Engineer", "Machine Learning Engineer", "Product Manager", "Business Analyst",
+    "QA Engineer", "Cloud Architect", "Marketing Analyst", "Financial Analyst", "HR Specialist",
+]
+COMPANIES = [
+    "Northwind Traders", "Contoso", "Fabrikam", "Initech", "Globex", "Umbrella Analytics", "Stark Systems",
+    "Wayne Logistics", "Acme Retail", "Hooli", "Vandelay Industries", "Tyrell Labs", "Cyberdyne Health",
+    "Soylent Foods", "Wonka Manufacturing", "Oceanic Air", "Blue Sun Energy", "Massive Dynamic",
+]
+DEGREES = ["B.Tech", "B.Sc", "B.Com", "BBA", "M.Tech", "M.Sc", "MBA", "MCA", "Ph.D"]
+FIELDS = ["Computer Science", "Information Technology", "Statistics", "Mathematics", "Economics", "Electronics",
+          "Mechanical Engineering", "Finance", "Marketing", "Human Resources"]
+UNIVERSITIES = ["Delhi University", "Anna University", "Pune University", "Mumbai University", "Amity University",
+                "VIT Vellore", "Manipal University", "Christ University", "Jadavpur University", "Osmania University"]
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Ananya", "Kabir", "Meera", "Rohan", "Saanvi", "Vihaan", "Priya",
+               "Arjun", "Neha", "Kiran", "Alex", "Sam", "Jordan", "Taylor", "Riya", "Dev", "Tara"]
+LAST_NAMES = ["Sharma", "Verma", "Iyer", "Nair", "Gupta", "Reddy", "Chawla", "Singh", "Das", "Mehta",
+              "Kapoor", "Joshi", "Rao", "Patel", "Bose", "Khan", "Smith", "Garcia", "Chen", "Okafor"]
+CITIES = ["Bengaluru", "Pune", "Hyderabad", "Chennai", "New Delhi", "Mumbai", "Kolkata", "Gurugram", "Noida", "Remote"]
+DUTIES = ["Build", "Design", "Own", "Automate", "Maintain", "Analyse", "Improve", "Test", "Document", "Scale"]
+VERBS = ["Built", "Designed", "Led", "Automated", "Optimised", "Migrated", "Maintained", "Analysed", "Delivered",
+         "Reduced", "Improved", "Implemented", "Launched", "Mentored", "Owned", "Scaled", "Tested", "Documented"]
+OBJECTS = ["a reporting pipeline", "the customer dashboard", "an internal API", "the billing service",
+           "a churn model", "monthly forecasts", "the data warehouse", "a recommendation engine",
+           "the onboarding flow", "an ETL framework", "the test suite", "deployment scripts", "a pricing study",
+           "vendor integrations", "the search service", "quarterly audits", "campus hiring drives"]
+RESULTS = ["cutting run time by {n}%", "serving {n}k daily users", "saving {n} hours a week",
+           "raising conversion by {n}%", "across {n} teams", "with {n}% fewer defects", "for {n} clients"]
+CERTIFICATIONS = ["AWS Certified Cloud Practitioner", "Google Data Analytics Certificate", "PMP", "Scrum Master",
+                  "Azure Fundamentals", "Tableau Desktop Specialist", "Oracle Java SE Certification"]
+# Pseudo-words give the corpus a long tail of rare terms, as real resumes have.
+SYLLABLES = ["ka", "lo", "mi", "ra", "tu", "ne", "si", "vo", "da", "pe", "zu", "bri", "xan", "qui", "tor", "mel"]
+
+
+def _filler(rng, words):
+    # Zipf-like choice over pseudo-words: short, common words dominate.
+    return " ".join("".join(rng.choice(SYLLABLES) for _ in range(min(6, int(rng.paretovariate(1.3)) + 1))) for _ in range(words))
+
+
+def _sentence(rng):
+    result = rng.choice(RESULTS).format(n=rng.randint(5, 80))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}, {result}; {_filler(rng, rng.randint(4, 14))}."
+
+
+def _contact(rng):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return [f"{first} {last}", f"Contact: {first.lower()}.{last.lower()}{rng.randint(1, 999)}@example.com | +91 {rng.randint(70000, 99999)} {rng.randint(10000, 99999)} | {rng.choice(CITIES)}"]
+
+
+def resume_lines(number, seed=DEFAULT_SEED):
+    rng = random.Random(f"{seed}:resume:{number}")
+    if number > 1 and rng.random() < DUPLICATE_SHARE:
+        # A re-sent resume: an earlier one with new contact details.
+        return _contact(rng) + resume_lines(rng.randint(1, number - 1), seed)[2:]
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, rng.randint(4, 14))
+    lines = _contact(rng)
+    if rng.random() < 0.85:
+        lines += ["", "SUMMARY", f"{title} with {rng.randint(0, 15)} years of experience in {', '.join(skills[:3])}. {_filler(rng, 12)}"]
+    if rng.random() < 0.9:
+        lines += ["", "SKILLS", ", ".join(skills)]
+    if rng.random() < 0.9:
+        lines += ["", "EXPERIENCE"]
+        year = 2024
+        for _ in range(rng.randint(1, 6)):
+            start = year - rng.randint(1, 4)
+            role = rng.choice(TITLES) if rng.random() < 0.3 else title
+            if rng.random() < 0.15:
+                role += " Intern"
+            lines.append(f"{role}, {rng.choice(COMPANIES)} ({start}-{year})")
+            lines += [f"- {_sentence(rng)}" for _ in range(rng.randint(2, 9))]
+            year = start
+    if rng.random() < 0.4:
+        lines += ["", "PROJECTS"] + [f"- {_sentence(rng)}" for _ in range(rng.randint(1, 5))]
+    if rng.random() < 0.9:
+        lines += ["", "EDUCATION", f"{rng.choice(DEGREES)} in {rng.choice(FIELDS)}, {rng.choice(UNIVERSITIES)} ({rng.randint(2005, 2024)})"]
+    if rng.random() < 0.35:
+        lines += ["", "CERTIFICATIONS"] + rng.sample(CERTIFICATIONS, rng.randint(1, 3))
+    if rng.random() < 0.2:
+        lines += ["", "VOLUNTEER", f"- {_sentence(rng)}"]
+    return lines
+
+
+def job_description(number, seed=DEFAULT_SEED):
+    rng = random.Random(f"{seed}:job:{number}")
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, rng.randint(5, 10))
+    lines = ["Job Title:", title, "", f"We are hiring a {title} to join {rng.choice(COMPANIES)} in {rng.choice(CITIES)}.", "", "Responsibilities:"]
+    lines += [f"{rng.choice(DUTIES)} {rng.choice(OBJECTS)} with {rng.choice(skills)}." for _ in range(rng.randint(4, 8))]
+    lines += ["", "Qualifications:", f"{rng.randint(1, 8)}+ years of experience as a {title} or similar role."]
+    lines += [f"Strong knowledge of {skill}." for skill in skills]
+    lines.append(f"{rng.choice(DEGREES)} in {rng.choice(FIELDS)} or equivalent.")
+    return "\n".join(lines) + "\n"
+
+
+# --- Minimal PDF Writer ---
+def _pdf_string(text):
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def make_pdf(lines):
+    # One Helvetica text block per page; enough for every extractor to read.
+    lines = [wrapped for line in lines for wrapped in textwrap.wrap(line, 100) or [""]]
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page_lines in pages:
+        content = "BT /F1 10 Tf 14 TL 50 756 Td\n" + "".join(f"{_pdf_string(line)} '\n" for line in page_lines) + "ET"
+        content = content.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), len(kids))
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def resume_pdfs(count, seed=DEFAULT_SEED):
+    # [(name, pdf_bytes)] for resumes 1..count.
+    return [(f"resume_{number:05d}.pdf", make_pdf(resume_lines(number, seed))) for number in range(1, count + 1)]
+
+
+def job_descriptions(count, seed=DEFAULT_SEED):
+    return [(f"job_{number:03d}.txt", job_description(number, seed)) for number in range(1, count + 1)]
+
+
+def corpus_digest(resumes, jobs):
+    # SHA-256 over every generated file, to check two runs measured the same data.
+    digest = hashlib.sha256()
+    for name, data in resumes + [(name, text.encode("utf-8")) for name, text in jobs]:
+        digest.update(name.encode("utf-8"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic corpus of resume PDFs and job descriptions.")
+    parser.add_argument("directory", help="Output directory (resumes/ and job descriptions/ are created in it)")
+    parser.add_argument("--resumes", type=int, default=1000, help="Resume PDFs to write (default: %(default)s)")
+    parser.add_argument("--job-descriptions", type=int, default=5, help="Job descriptions to write (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Corpus seed (default: %(default)s)")
+    args = parser.parse_args()
+
+    resumes, jobs = resume_pdfs(args.resumes, args.seed), job_descriptions(args.job_descriptions, args.seed)
+    for subdirectory, files in (("resumes", resumes), ("job descriptions", [(name, text.encode("utf-8")) for name, text in jobs])):
+        os.makedirs(os.path.join(args.directory, subdirectory), exist_ok=True)
+        for name, data in files:
+            with open(os.path.join(args.directory, subdirectory, name), "wb") as f:
+                f.write(data)
+    print(f"Wrote {len(resumes)} resumes and {len(jobs)} job descriptions to {args.directory} (sha256 {corpus_digest(resumes, jobs)[:16]})")
+
+if __name__ == "__main__":
+    main()
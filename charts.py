@@ -0,0 +1,121 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import metrics
+
+# --- Chart Configuration ---
+# Charts with more items than CHART_MAX_ITEMS switch to a top-k view: a pie
+# becomes a bar chart of the highest values, and a bar chart folds the rest
+# into one "Other" group.
+CHART_MAX_ITEMS = int(os.environ.get("RANKITRIGHT_CHART_MAX_ITEMS", 12))
+CHART_CACHE_ENTRIES = int(os.environ.get("RANKITRIGHT_CHART_CACHE_ENTRIES", 64))
+CHART_DPI = 150
+
+# Charts are drawn on a bare matplotlib Figure, not through pyplot, so no
+# global registry keeps a reference: the figure is freed as soon as its PNG
+# is written. The PNG bytes are cached by a hash of the data they show, so a
+# rerun with the same scores (paging back, moving a slider that does not
+# change the page, another session ranking the same uploads) draws nothing.
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _data_key(kind, labels, values, max_items):
+    digest = hashlib.sha256(f"{kind}\0{max_items}\0".encode("utf-8"))
+    digest.update("\0".join(labels).encode("utf-8"))
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def _cached_png(kind, labels, values, max_items, draw):
+    key = _data_key(kind, labels, values, max_items)
+    with _cache_lock:
+        png = _cache.get(key)
+        if png is not None:
+            _cache.move_to_end(key)
+    if png is not None:
+        metrics.inc("chart_cache", result="hit", kind=kind)
+        return png
+    metrics.inc("chart_cache", result="miss", kind=kind)
+    from matplotlib.figure import Figure
+    with metrics.timer("chart_render", kind=kind):
+        fig = Figure()
+        draw(fig)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=CHART_DPI, bbox_inches="tight")
+        png = buffer.getvalue()
+    with _cache_lock:
+        _cache[key] = png
+        while len(_cache) > CHART_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return png
+
+
+def top_items(values, max_items=CHART_MAX_ITEMS):
+    # Positions of the items drawn on their own, highest first; the rest go
+    # into "Other". Every item is drawn when there are at most max_items.
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= max_items:
+        return np.arange(len(values))
+    keep = max(max_items - 1, 1)
+    return np.argsort(-values, kind="stable")[:keep]
+
+
+def pie_chart(labels, values, max_items=CHART_MAX_ITEMS):
+    # PNG of each item's share of the total value, or None when every value
+    # is zero. With more than max_items items, slices would be too thin to
+    # read, so the top max_items are drawn as horizontal bars instead.
+    values = np.asarray(values, dtype=np.float64)
+    if not values.sum() > 0:
+        return None
+
+    def draw(fig):
+        ax = fig.subplots()
+        if len(values) <= max_items:
+            ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+            ax.axis('equal')
+            return
+        shown = np.argsort(-values, kind="stable")[:max_items]
+        ax.barh(np.arange(len(shown)), values[shown])
+        ax.set_yticks(np.arange(len(shown)))
+        ax.set_yticklabels([labels[i] for i in shown])
+        ax.invert_yaxis()
+        ax.set_xlabel("Score")
+        ax.set_title(f"Top {len(shown)} of {len(values)}")
+
+    return _cached_png("pie", labels, values, max_items, draw)
+
+
+def grouped_bar_chart(labels, series, max_items=CHART_MAX_ITEMS):
+    # PNG of one group of bars per label, one bar per series (a dict of name
+    # to values). Items beyond the top max_items by the mean of the series
+    # are shown as one group of their means.
+    names = list(series)
+    matrix = np.array([series[name] for name in names], dtype=np.float64).reshape(len(names), len(labels))
+
+    def draw(fig):
+        shown = top_items(matrix.mean(axis=0), max_items)
+        shown.sort()  # keep the caller's order, which is usually the ranking
+        group_labels = [labels[i] for i in shown]
+        heights = matrix[:, shown]
+        if len(shown) < len(labels):
+            rest = np.ones(len(labels), dtype=bool)
+            rest[shown] = False
+            group_labels.append(f"Other ({int(rest.sum())}, mean)")
+            heights = np.column_stack([heights, matrix[:, rest].mean(axis=1)])
+        ax = fig.subplots()
+        positions = np.arange(len(group_labels))
+        width = 0.8 / max(len(names), 1)
+        for row, name in enumerate(names):
+            ax.bar(positions + (row - (len(names) - 1) / 2) * width, heights[row], width, label=name)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(group_labels, rotation=45 if len(group_labels) > 4 else 0, ha="right" if len(group_labels) > 4 else "center")
+        ax.legend()
+
+    return _cached_png("bar", [*names, "", *labels], matrix.ravel(), max_items, draw)
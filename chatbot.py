@@ -0,0 +1,133 @@
+import json
+import math
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+
+# --- Chatbot Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FAQ_PATHS = {
+    "hr": os.environ.get("RANKITRIGHT_HR_FAQ", os.path.join(BASE_DIR, "faq", "hr.json")),
+    "student": os.environ.get("RANKITRIGHT_STUDENT_FAQ", os.path.join(BASE_DIR, "faq", "student.json")),
+}
+MATCH_THRESHOLD = float(os.environ.get("RANKITRIGHT_FAQ_THRESHOLD", 0.23))
+# Share of the query's content words (stop words left out) that must appear
+# in the matched question; words count as equal at WORD_SIMILARITY or more.
+MIN_WORD_OVERLAP = float(os.environ.get("RANKITRIGHT_FAQ_MIN_WORD_OVERLAP", 0.5))
+WORD_SIMILARITY = 0.4  # Dice coefficient of letter trigrams, so plurals and typos still match
+MAX_POSTINGS = 20000  # postings read per lookup; only the most common n-grams of a large FAQ are skipped
+
+
+def load_faq(path):
+    # A FAQ file is a JSON list of {"question": ..., "answer": ...} objects,
+    # or a JSON object mapping each question to its answer.
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    if isinstance(entries, dict):
+        return list(entries.items())
+    return [(entry["question"], entry["answer"]) for entry in entries]
+
+
+class FaqIndex:
+    # Questions are indexed as TF-IDF over character n-grams inside words,
+    # which tolerates rephrasing, word order and typos. The vocabulary and IDF
+    # also cover the answers, so a query using the answers' words is not
+    # treated as unknown. The matrix is kept term-major (an inverted index), so
+    # a lookup only reads the postings of the query's n-grams. N-grams the FAQ
+    # has never seen still count towards the query's length, so an off-topic
+    # question scores low instead of matching on a few shared letters.
+    # N-grams alone still let "What is the weather today" reach the cover letter
+    # entry through "what is", "the" and "-ter", so answer() also requires the
+    # query's content words to appear in the matched question.
+
+    def __init__(self, entries, threshold=MATCH_THRESHOLD):
+        self.questions = [question for question, _ in entries]
+        self.answers = [answer for _, answer in entries]
+        self.threshold = threshold
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer  # only needed to build the index
+        vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), sublinear_tf=True)
+        vectorizer.fit(self.questions + self.answers)
+        postings = vectorizer.transform(self.questions).T.tocsr()
+        self._indptr, self._doc_ids, self._values = postings.indptr, postings.indices, postings.data
+        self._analyzer = vectorizer.build_analyzer()
+        self._vocabulary = vectorizer.vocabulary_
+        self._idf = vectorizer.idf_
+        self._unseen_idf = math.log(len(self.questions) + len(self.answers) + 1) + 1  # smooth idf of a document frequency of 0
+        self._stop_words = ENGLISH_STOP_WORDS
+        self._words = TfidfVectorizer().build_analyzer()
+
+    def search(self, query):
+        # (position, score) of the closest FAQ entry, or None if the query
+        # shares no n-gram with any question.
+        term_ids, weights, unseen = [], [], 0.0
+        for gram, count in Counter(self._analyzer(query)).items():
+            weight = 1 + math.log(count)
+            term_id = self._vocabulary.get(gram)
+            if term_id is None:
+                unseen += (weight * self._unseen_idf) ** 2
+            else:
+                term_ids.append(term_id)
+                weights.append(weight * self._idf[term_id])
+        if not term_ids:
+            return None
+        weights = np.array(weights)
+        weights /= math.sqrt(weights @ weights + unseen)
+
+        # Gather the postings of the query's terms in one go, rarest first, and
+        # sum them per question. In a large FAQ the commonest n-grams (lowest
+        # IDF, longest lists) beyond MAX_POSTINGS are left out of the sum but
+        # still count in the query norm above.
+        term_ids = np.array(term_ids)
+        starts = self._indptr[term_ids]
+        lengths = self._indptr[term_ids + 1] - starts
+        if lengths.sum() > MAX_POSTINGS:
+            order = np.argsort(lengths, kind="stable")
+            keep = order[np.cumsum(lengths[order]) <= MAX_POSTINGS]
+            starts, lengths, weights = starts[keep], lengths[keep], weights[keep]
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        scores = np.bincount(self._doc_ids[positions], self._values[positions] * np.repeat(weights, lengths), minlength=len(self.questions))
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
+
+    def word_overlap(self, query, position):
+        # Share of the query's content words found in the question at position.
+        words = [word for word in set(self._words(query)) if word not in self._stop_words]
+        if not words:
+            return 0.0
+        question_words = [_trigrams(word) for word in set(self._words(self.questions[position]))]
+        found = sum(1 for word in words if any(_dice(_trigrams(word), other) >= WORD_SIMILARITY for other in question_words))
+        return found / len(words)
+
+    def answer(self, query):
+        # The best answer if its score reaches the threshold and it shares
+        # enough words with the query, otherwise None.
+        match = self.search(query)
+        if match is None or match[1] < self.threshold or self.word_overlap(query, match[0]) < MIN_WORD_OVERLAP:
+            return None
+        return self.answers[match[0]]
+
+
+def _trigrams(word):
+    word = f" {word} "
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+def _dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_faq_index(name):
+    # Built once per process and shared by every session; rebuilt when the
+    # FAQ file changes.
+    path = FAQ_PATHS[name]
+    version = (path, os.stat(path).st_mtime_ns)
+    with _indexes_lock:
+        cached = _indexes.get(name)
+        if cached is None or cached[0] != version:
+            cached = (version, FaqIndex(load_faq(path)))
+            _indexes[name] = cached
+        return cached[1]
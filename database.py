@@ -0,0 +1,561 @@
+import abc
+import functools
+import os
+import queue
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import metrics
+
+# --- Database Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_BACKEND = os.environ.get("RANKITRIGHT_DB_BACKEND", "mysql")  # "mysql" or "sqlite"
+DB_HOST = os.environ.get("RANKITRIGHT_DB_HOST", "localhost")
+DB_USER = os.environ.get("RANKITRIGHT_DB_USER", "root")
+DB_PASSWORD = os.environ.get("RANKITRIGHT_DB_PASSWORD", "root")  # Leave it empty if your database has no password
+DB_NAME = os.environ.get("RANKITRIGHT_DB_NAME", "rankitright")
+DB_POOL_SIZE = int(os.environ.get("RANKITRIGHT_DB_POOL_SIZE", 5))
+DB_POOL_TIMEOUT = float(os.environ.get("RANKITRIGHT_DB_POOL_TIMEOUT", 10))
+SQLITE_PATH = os.environ.get("RANKITRIGHT_SQLITE_PATH", os.path.join(BASE_DIR, "rankitright.db"))
+
+
+class StorageError(Exception):
+    pass
+
+
+class PoolExhausted(StorageError):
+    pass
+
+
+# --- Connection Pool ---
+class ConnectionPool:
+    # Connections are opened lazily up to size and reused across Streamlit
+    # reruns and sessions. Every checkout runs the health check (which may
+    # reconnect a stale socket) and every return ends any open transaction, so
+    # a pooled connection never serves a stale read snapshot.
+
+    def __init__(self, connect, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT, check=None, errors=(Exception,), fatal_errors=(), name="app"):
+        self.name = name  # the pool label on the connection metrics
+        self.size = size
+        self.timeout = timeout
+        self._connect = connect
+        self._health_check = check
+        self._errors = errors
+        self._fatal_errors = fatal_errors
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _new_connection(self):
+        with self._lock:
+            self._created += 1
+        try:
+            with metrics.timer("db_connect", pool=self.name):
+                conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            metrics.inc("db_connect_errors", pool=self.name)
+            raise
+        return conn
+
+    def acquire(self):
+        if self._closed:
+            raise PoolExhausted("Connection pool is closed")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+            if can_create:
+                return self._new_connection()
+            try:
+                with metrics.timer("db_pool_wait", pool=self.name):
+                    conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                metrics.inc("db_pool_exhausted", pool=self.name)
+                raise PoolExhausted(f"No database connection available within {self.timeout:g}s (pool size {self.size})")
+        return self._check(conn)
+
+    def _check(self, conn):
+        if self._health_check is None:
+            return conn
+        try:
+            self._health_check(conn)
+            return conn
+        except self._errors:
+            self._discard(conn)
+        return self._new_connection()
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except self._errors:
+            pass
+
+    def release(self, conn, broken=False):
+        if broken or self._closed:
+            self._discard(conn)
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except self._errors:
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except self._fatal_errors:
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+# --- Repositories ---
+def _as_text(value):
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8")
+    return value
+
+
+@functools.lru_cache(maxsize=256)
+def _statement_label(sql):
+    # "SELECT HRResumeRankingHistory": the verb and the statement's own table
+    # keep one metric series per kind of query rather than one per SQL string.
+    # Parenthesised groups are dropped first, innermost out, so the table of a
+    # subquery or a column list is not taken for the outer one.
+    verb = sql.split(None, 1)[0].upper()
+    outer = sql
+    while True:
+        stripped = re.sub(r"\([^()]*\)", " ", outer)
+        if stripped == outer:
+            break
+        outer = stripped
+    table = re.search(r"\b(?:FROM|INTO|UPDATE|TABLE)\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)", outer, re.IGNORECASE)
+    return f"{verb} {table.group(1)}" if table else verb
+
+
+class _Cursor:
+    # Every query is timed and counted by its statement label.
+    def __init__(self, cursor, translate):
+        self._cursor = cursor
+        self._translate = translate
+        self._statement = None
+
+    def execute(self, sql, params=()):
+        self._statement = _statement_label(sql)
+        with metrics.timer("db_query", statement=self._statement):
+            self._cursor.execute(self._translate(sql), params)
+
+    def executemany(self, sql, rows):
+        if rows:
+            self._statement = _statement_label(sql)
+            with metrics.timer("db_query", statement=self._statement):
+                self._cursor.executemany(self._translate(sql), rows)
+            metrics.inc("db_rows_written", len(rows), statement=self._statement)
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        metrics.inc("db_rows_fetched", len(rows), statement=self._statement)
+        return rows
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+
+class Repository(abc.ABC):
+    # One method per query the app needs on the tables in "tables name.txt".
+    # SQL is written once with %s placeholders; backends only supply the
+    # connection pool, their driver's error type, the placeholder style and
+    # the two schema methods below, which differ between SQL dialects.
+    placeholder = "%s"
+    errors = (Exception,)
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def _sql(self, sql):
+        return sql if self.placeholder == "%s" else sql.replace("%s", self.placeholder)
+
+    @contextmanager
+    def _transaction(self):
+        # Everything executed on the yielded cursor commits together, or not at all.
+        try:
+            with metrics.timer("db_transaction"), self.pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    yield _Cursor(cursor, self._sql)
+                    conn.commit()
+                finally:
+                    cursor.close()
+        except self.errors as err:
+            metrics.inc("db_errors")
+            raise StorageError(str(err)) from err
+
+    def _execute(self, sql, params=()):
+        with self._transaction() as cursor:
+            cursor.execute(sql, params)
+            return cursor.lastrowid
+
+    def _fetch(self, sql, params=()):
+        with self._transaction() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    # --- Schema Migration ---
+    @abc.abstractmethod
+    def _has_column(self, table, column):
+        pass
+
+    @abc.abstractmethod
+    def _create_result_tables(self, cursor):
+        pass
+
+    def migrate(self):
+        # Moves comma-joined Resumes/Scores and Videos/Scores values into the
+        # per-candidate result tables, then drops the old columns. Safe to rerun.
+        with self._transaction() as cursor:
+            self._create_result_tables(cursor)
+        moved = 0
+        for table, key, names_column, results_table, name_column in (
+            ("HRResumeRankingHistory", "RankingID", "Resumes", "HRResumeRankingResults", "Resume"),
+            ("HRSoftSkillRankingHistory", "AnalysisID", "Videos", "HRSoftSkillRankingResults", "Video"),
+        ):
+            if not self._has_column(table, names_column):
+                continue
+            with self._transaction() as cursor:
+                cursor.execute(f"SELECT {key}, {names_column}, Scores FROM {table}")
+                history = cursor.fetchall()
+                results = []
+                for run_id, names, scores in history:
+                    names = _as_text(names).split(",") if names else []
+                    scores = [float(score) for score in _as_text(scores).split(",")] if scores else []
+                    results.extend(
+                        (run_id, rank, name, scores[rank - 1] if rank <= len(scores) else None)
+                        for rank, name in enumerate(names, start=1)
+                    )
+                # A previous run may have stopped between copying and dropping.
+                cursor.executemany(f"DELETE FROM {results_table} WHERE {key} = %s", [(run_id,) for run_id, _, _ in history])
+                cursor.executemany(f"INSERT INTO {results_table} ({key}, ResultRank, {name_column}, Score) VALUES (%s, %s, %s, %s)", results)
+                moved += len(results)
+            with self._transaction() as cursor:
+                cursor.execute(f"ALTER TABLE {table} DROP COLUMN {names_column}")
+                cursor.execute(f"ALTER TABLE {table} DROP COLUMN Scores")
+        return moved
+
+    # --- Users ---
+    def create_user(self, username, password_hash, role):
+        self._execute("INSERT INTO Users (Username, Password, Role) VALUES (%s, %s, %s)", (username, password_hash, role))
+
+    def find_user(self, username, password_hash):
+        rows = self._fetch("SELECT UserID, Role FROM Users WHERE Username = %s AND Password = %s", (username, password_hash))
+        return (rows[0][0], rows[0][1]) if rows else (None, None)
+
+    # --- HR History ---
+    def _save_run(self, header_sql, header_params, results_table, key, name_column, names, scores):
+        with self._transaction() as cursor:
+            cursor.execute(header_sql, header_params)
+            run_id = cursor.lastrowid
+            cursor.executemany(
+                f"INSERT INTO {results_table} ({key}, ResultRank, {name_column}, Score) VALUES (%s, %s, %s, %s)",
+                [(run_id, rank, name, float(score)) for rank, (name, score) in enumerate(zip(names, scores), start=1)],
+            )
+        return run_id
+
+    def _get_runs_page(self, username, table, key, columns, results_table, limit, before):
+        # Keyset pagination on (Timestamp, id): before is the last row's
+        # (timestamp, id) from the previous page. Counts and averages are
+        # correlated subqueries, so they only run for the rows on this page.
+        sql = (
+            f"SELECT h.{key}, {''.join(column + ', ' for column in columns)}h.Timestamp, "
+            f"(SELECT COUNT(*) FROM {results_table} r WHERE r.{key} = h.{key}), "
+            f"(SELECT AVG(r.Score) FROM {results_table} r WHERE r.{key} = h.{key}) "
+            f"FROM {table} h WHERE h.Username = %s"
+        )
+        params = [username]
+        if before is not None:
+            sql += f" AND (h.Timestamp < %s OR (h.Timestamp = %s AND h.{key} < %s))"
+            params += [before[0], before[0], before[1]]
+        sql += f" ORDER BY h.Timestamp DESC, h.{key} DESC LIMIT %s"
+        rows = self._fetch(sql, params + [limit])
+        next_cursor = (rows[-1][len(columns) + 1], rows[-1][0]) if len(rows) == limit else None
+        return rows, next_cursor
+
+    def _get_run_results(self, username, table, key, name_column, results_table, run_id):
+        sql = (
+            f"SELECT r.ResultRank, r.{name_column}, r.Score FROM {results_table} r JOIN {table} h ON h.{key} = r.{key} "
+            f"WHERE r.{key} = %s AND h.Username = %s ORDER BY r.ResultRank"
+        )
+        return self._fetch(sql, (run_id, username))
+
+    def _get_runs_summary(self, username, table, key, results_table):
+        sql = (
+            f"SELECT COUNT(DISTINCT h.{key}), COUNT(r.ResultID), AVG(r.Score) "
+            f"FROM {table} h LEFT JOIN {results_table} r ON r.{key} = h.{key} WHERE h.Username = %s"
+        )
+        return self._fetch(sql, (username,))[0]
+
+    def save_hr_ranking(self, username, job_description, resumes, scores):
+        return self._save_run(
+            "INSERT INTO HRResumeRankingHistory (Username, JobDescription) VALUES (%s, %s)", (username, job_description),
+            "HRResumeRankingResults", "RankingID", "Resume", resumes, scores,
+        )
+
+    def get_hr_rankings_page(self, username, limit=20, before=None, preview_length=80):
+        # ([(ranking_id, job_description_preview, timestamp, resume_count, avg_score)], next_cursor), newest first.
+        return self._get_runs_page(
+            username, "HRResumeRankingHistory", "RankingID", [f"SUBSTR(h.JobDescription, 1, {int(preview_length)})"],
+            "HRResumeRankingResults", limit, before,
+        )
+
+    def get_hr_ranking_results(self, username, ranking_id):
+        # [(rank, resume, score)] for one ranking run.
+        return self._get_run_results(username, "HRResumeRankingHistory", "RankingID", "Resume", "HRResumeRankingResults", ranking_id)
+
+    def get_hr_rankings_summary(self, username):
+        # (runs, resumes, avg_score) over every ranking run of the user.
+        return self._get_runs_summary(username, "HRResumeRankingHistory", "RankingID", "HRResumeRankingResults")
+
+    def save_hr_soft_skill(self, username, videos, scores):
+        return self._save_run(
+            "INSERT INTO HRSoftSkillRankingHistory (Username) VALUES (%s)", (username,),
+            "HRSoftSkillRankingResults", "AnalysisID", "Video", videos, scores,
+        )
+
+    def get_hr_soft_skills_page(self, username, limit=20, before=None):
+        # ([(analysis_id, timestamp, video_count, avg_score)], next_cursor), newest first.
+        return self._get_runs_page(username, "HRSoftSkillRankingHistory", "AnalysisID", [], "HRSoftSkillRankingResults", limit, before)
+
+    def get_hr_soft_skill_results(self, username, analysis_id):
+        # [(rank, video, combined_score)] for one analysis run.
+        return self._get_run_results(username, "HRSoftSkillRankingHistory", "AnalysisID", "Video", "HRSoftSkillRankingResults", analysis_id)
+
+    def get_hr_soft_skills_summary(self, username):
+        # (runs, videos, avg_score) over every soft skill run of the user.
+        return self._get_runs_summary(username, "HRSoftSkillRankingHistory", "AnalysisID", "HRSoftSkillRankingResults")
+
+    def save_hr_feedback(self, username, feedback):
+        self._execute("INSERT INTO HRFeedbackHistory (Username, Feedback) VALUES (%s, %s)", (username, feedback))
+
+    def get_hr_feedback(self, username):
+        return self._fetch("SELECT Feedback, Timestamp FROM HRFeedbackHistory WHERE Username = %s ORDER BY Timestamp DESC", (username,))
+
+    # --- Student History ---
+    def save_student_resume_check(self, username, filename, suggestions):
+        sql = "INSERT INTO StudentResumeCheckHistory (Username, Filename, Suggestions) VALUES (%s, %s, %s)"
+        self._execute(sql, (username, filename, ",".join(suggestions)))
+
+    def save_student_resume_checks(self, username, checks):
+        # checks is [(filename, suggestions)]; a whole cohort goes in one
+        # batched insert and one transaction.
+        sql = "INSERT INTO StudentResumeCheckHistory (Username, Filename, Suggestions) VALUES (%s, %s, %s)"
+        with self._transaction() as cursor:
+            cursor.executemany(sql, [(username, filename, ",".join(suggestions)) for filename, suggestions in checks])
+
+    def get_student_resume_checks(self, username):
+        sql = "SELECT Filename, Suggestions, Timestamp FROM StudentResumeCheckHistory WHERE Username = %s ORDER BY Timestamp DESC"
+        return self._fetch(sql, (username,))
+
+    def save_student_feedback(self, username, feedback):
+        self._execute("INSERT INTO StudentFeedbackHistory (Username, Feedback) VALUES (%s, %s)", (username, feedback))
+
+    def get_student_feedback(self, username):
+        return self._fetch("SELECT Feedback, Timestamp FROM StudentFeedbackHistory WHERE Username = %s ORDER BY Timestamp DESC", (username,))
+
+
+MYSQL_RESULT_TABLES = [
+    """CREATE TABLE IF NOT EXISTS HRResumeRankingResults (
+        ResultID INT PRIMARY KEY AUTO_INCREMENT,
+        RankingID INT NOT NULL,
+        ResultRank INT NOT NULL,
+        Resume VARCHAR(255) NOT NULL,
+        Score DOUBLE,
+        INDEX idx_resume_results_ranking (RankingID, ResultRank),
+        FOREIGN KEY (RankingID) REFERENCES HRResumeRankingHistory(RankingID) ON DELETE CASCADE
+    )""",
+    """CREATE TABLE IF NOT EXISTS HRSoftSkillRankingResults (
+        ResultID INT PRIMARY KEY AUTO_INCREMENT,
+        AnalysisID INT NOT NULL,
+        ResultRank INT NOT NULL,
+        Video VARCHAR(255) NOT NULL,
+        Score DOUBLE,
+        INDEX idx_soft_skill_results_analysis (AnalysisID, ResultRank),
+        FOREIGN KEY (AnalysisID) REFERENCES HRSoftSkillRankingHistory(AnalysisID) ON DELETE CASCADE
+    )""",
+]
+
+MYSQL_HISTORY_INDEXES = [
+    ("HRResumeRankingHistory", "idx_resume_ranking_user_time", "(Username, Timestamp)"),
+    ("HRSoftSkillRankingHistory", "idx_soft_skill_ranking_user_time", "(Username, Timestamp)"),
+]
+
+
+class MySQLRepository(Repository):
+
+    def __init__(self, host=DB_HOST, user=DB_USER, password=DB_PASSWORD, database=DB_NAME, pool_size=DB_POOL_SIZE):
+        import mysql.connector
+        from mysql.connector import errors
+
+        def connect():
+            return mysql.connector.connect(host=host, user=user, password=password, database=database)
+
+        def ping(conn):
+            conn.ping(reconnect=True, attempts=1, delay=0)
+
+        self.errors = (errors.Error,)
+        super().__init__(ConnectionPool(connect, size=pool_size, check=ping, errors=self.errors, fatal_errors=(errors.OperationalError,)))
+
+    def _has_column(self, table, column):
+        sql = "SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s"
+        return self._fetch(sql, (table, column))[0][0] > 0
+
+    def _create_result_tables(self, cursor):
+        for statement in MYSQL_RESULT_TABLES:
+            cursor.execute(statement)
+        for table, index, columns in MYSQL_HISTORY_INDEXES:
+            cursor.execute("SELECT COUNT(*) FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s", (table, index))
+            if cursor.fetchall()[0][0] == 0:
+                cursor.execute(f"CREATE INDEX {index} ON {table} {columns}")
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Users (
+    UserID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT UNIQUE NOT NULL,
+    Password TEXT NOT NULL,
+    Role TEXT NOT NULL CHECK (Role IN ('HR Professional', 'Student')),
+    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS HRResumeRankingHistory (
+    RankingID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT NOT NULL REFERENCES Users(Username),
+    JobDescription TEXT NOT NULL,
+    Timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS HRSoftSkillRankingHistory (
+    AnalysisID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT NOT NULL REFERENCES Users(Username),
+    Timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS HRFeedbackHistory (
+    FeedbackID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT NOT NULL REFERENCES Users(Username),
+    Feedback TEXT NOT NULL,
+    Timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS StudentResumeCheckHistory (
+    CheckID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT NOT NULL REFERENCES Users(Username),
+    Filename TEXT NOT NULL,
+    Suggestions TEXT,
+    Timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS StudentFeedbackHistory (
+    FeedbackID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT NOT NULL REFERENCES Users(Username),
+    Feedback TEXT NOT NULL,
+    Timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+SQLITE_RESULT_TABLES = """
+CREATE TABLE IF NOT EXISTS HRResumeRankingResults (
+    ResultID INTEGER PRIMARY KEY AUTOINCREMENT,
+    RankingID INTEGER NOT NULL REFERENCES HRResumeRankingHistory(RankingID) ON DELETE CASCADE,
+    ResultRank INTEGER NOT NULL,
+    Resume TEXT NOT NULL,
+    Score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_resume_results_ranking ON HRResumeRankingResults (RankingID, ResultRank);
+CREATE INDEX IF NOT EXISTS idx_resume_ranking_user_time ON HRResumeRankingHistory (Username, Timestamp);
+
+CREATE TABLE IF NOT EXISTS HRSoftSkillRankingResults (
+    ResultID INTEGER PRIMARY KEY AUTOINCREMENT,
+    AnalysisID INTEGER NOT NULL REFERENCES HRSoftSkillRankingHistory(AnalysisID) ON DELETE CASCADE,
+    ResultRank INTEGER NOT NULL,
+    Video TEXT NOT NULL,
+    Score REAL
+);
+CREATE INDEX IF NOT EXISTS idx_soft_skill_results_analysis ON HRSoftSkillRankingResults (AnalysisID, ResultRank);
+CREATE INDEX IF NOT EXISTS idx_soft_skill_ranking_user_time ON HRSoftSkillRankingHistory (Username, Timestamp);
+"""
+
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode("utf-8")))
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+
+
+class SQLiteRepository(Repository):
+    # WAL lets history reads run while another session writes. sqlite3 keeps a
+    # per-connection cache of prepared statements, and pooled connections are
+    # long-lived, so each query is compiled once per connection.
+    placeholder = "?"
+    errors = (sqlite3.Error,)
+
+    def __init__(self, path=SQLITE_PATH, pool_size=DB_POOL_SIZE):
+        def connect():
+            conn = sqlite3.connect(path, timeout=30, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            return conn
+
+        # Every connection to ":memory:" is a separate database.
+        pool_size = 1 if path == ":memory:" else pool_size
+        super().__init__(ConnectionPool(connect, size=pool_size, errors=self.errors))
+        with self.pool.connection() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+        self.migrate()
+
+    def _has_column(self, table, column):
+        return any(row[1] == column for row in self._fetch(f"PRAGMA table_info({table})"))
+
+    def _create_result_tables(self, cursor):
+        for statement in SQLITE_RESULT_TABLES.split(";"):
+            if statement.strip():
+                cursor.execute(statement)
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+def create_repository(backend=DB_BACKEND):
+    if backend == "mysql":
+        return MySQLRepository()
+    if backend == "sqlite":
+        return SQLiteRepository()
+    raise ValueError(f"Unknown database backend: {backend}")
+
+def get_repository():
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = create_repository()
+        return _repository
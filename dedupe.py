@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+
+from prefilter import tokenize
+
+# --- Near-duplicate Detection Configuration ---
+DUPLICATE_THRESHOLD = float(os.environ.get("RANKITRIGHT_DUPLICATE_THRESHOLD", 0.8))
+SHINGLE_WORDS = 3
+NUM_PERM = 128
+LSH_BANDS = 16  # 16 bands of 8 rows: a pair at 0.8 similarity shares a band 95% of the time
+SIGNATURE_BLOCK = 1 << 16  # shingles hashed per numpy block, bounds the temporary arrays
+
+_rng = np.random.default_rng(20240601)
+_MULTIPLIERS = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_OFFSETS = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class DuplicateIndex:
+    # Groups texts whose word 3-shingle sets have a Jaccard similarity of at
+    # least threshold. Each text gets a MinHash signature (the minimum of
+    # NUM_PERM multiply-shift hashes over its shingles), which is cut into
+    # LSH_BANDS bands. Only cluster representatives are kept in the band
+    # buckets, so a new text is compared with the few representatives it
+    # shares a bucket with and either joins the most similar one or becomes
+    # a representative itself. Work grows linearly with the number of texts,
+    # and texts can be added in chunks, as they are extracted.
+    # Texts too short to have a shingle are never grouped.
+
+    def __init__(self, threshold=DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.buckets = [{} for _ in range(LSH_BANDS)]
+        self.signatures = {}  # representative position -> signature
+        self.labels = []  # representative position of every text added
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _shingles(self, text):
+        # Python's string hash is salted per process, which is fine for
+        # signatures that never leave it.
+        tokens = tokenize(text)
+        ids = np.fromiter(map(hash, tokens), dtype=np.int64, count=len(tokens)).view(np.uint64)
+        if len(ids) < SHINGLE_WORDS:
+            return np.zeros(0, dtype=np.uint64)
+        shingles = ids[:len(ids) - SHINGLE_WORDS + 1].copy()
+        for k in range(1, SHINGLE_WORDS):
+            shingles = shingles * _MIX + ids[k:len(ids) - SHINGLE_WORDS + 1 + k]
+        return shingles
+
+    def signatures_of(self, texts):
+        # (len(texts), NUM_PERM) uint32 MinHash signatures, hashed in blocks
+        # of whole documents; rows of texts without shingles are meaningless.
+        shingle_sets = [self._shingles(text) for text in texts]
+        signatures = np.full((len(texts), NUM_PERM), np.iinfo(np.uint32).max, dtype=np.uint32)
+        start = 0
+        while start < len(texts):
+            end, size = start, 0
+            while end < len(texts) and (end == start or size + len(shingle_sets[end]) <= SIGNATURE_BLOCK):
+                size += len(shingle_sets[end])
+                end += 1
+            block = [i for i in range(start, end) if len(shingle_sets[i])]
+            if block:
+                shingles = np.concatenate([shingle_sets[i] for i in block])
+                bounds = np.cumsum([0] + [len(shingle_sets[i]) for i in block[:-1]])
+                hashed = np.multiply.outer(_MULTIPLIERS, shingles)
+                hashed += _OFFSETS[:, None]
+                hashed >>= np.uint64(32)
+                signatures[block] = np.minimum.reduceat(hashed, bounds, axis=1).T
+            start = end
+        return signatures, np.array([len(shingles) > 0 for shingles in shingle_sets], dtype=bool)
+
+    def add(self, texts):
+        # Returns the representative position (in the order texts were added
+        # across calls) of each new text; a text that starts a cluster is its
+        # own representative.
+        signatures, has_shingles = self.signatures_of(texts)
+        rows = NUM_PERM // LSH_BANDS
+        labels = []
+        for signature, usable in zip(signatures, has_shingles):
+            position = len(self.labels)
+            label = position
+            if usable:
+                keys = [signature[band * rows:(band + 1) * rows].tobytes() for band in range(LSH_BANDS)]
+                candidates = {rep for bucket, key in zip(self.buckets, keys) for rep in bucket.get(key, ())}
+                best = 0.0
+                for rep in candidates:
+                    similarity = np.count_nonzero(self.signatures[rep] == signature) / NUM_PERM
+                    if similarity >= self.threshold and (similarity > best or (similarity == best and rep < label)):
+                        best, label = similarity, rep
+                if label == position:
+                    self.signatures[position] = signature
+                    for bucket, key in zip(self.buckets, keys):
+                        bucket.setdefault(key, []).append(position)
+            self.labels.append(label)
+            labels.append(label)
+        return labels
+
+
+def near_duplicate_labels(texts, threshold=DUPLICATE_THRESHOLD):
+    # Representative position of each text; texts sharing one are near-duplicates.
+    return DuplicateIndex(threshold).add(texts)
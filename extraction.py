@@ -0,0 +1,396 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+import metrics
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# --- Extraction Cache Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("RANKITRIGHT_CACHE_DIR", os.path.join(BASE_DIR, ".cache", "extracted_text"))
+CACHE_MAX_BYTES = int(os.environ.get("RANKITRIGHT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# --- Batch Extraction Configuration ---
+EXTRACTION_WORKERS = int(os.environ.get("RANKITRIGHT_EXTRACTION_WORKERS", os.cpu_count() or 1))
+EXTRACTION_TIMEOUT = float(os.environ.get("RANKITRIGHT_EXTRACTION_TIMEOUT", 30))
+DEFAULT_EXTRACTOR = os.environ.get("RANKITRIGHT_EXTRACTOR", "fast")
+
+
+class TextCache:
+    # Extracted text is stored on disk as one JSON file per PDF, named after the
+    # SHA-256 of the PDF bytes. A file's mtime is its last use, so eviction
+    # removes the least recently used entries once the directory exceeds max_bytes.
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((name, stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = json.dumps(entry).encode("utf-8")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            try:
+                self._total_bytes -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for name, size, _ in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            for name, _, _ in self._entries():
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries()),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_text_cache = None
+_text_cache_lock = threading.Lock()
+
+def get_text_cache():
+    global _text_cache
+    with _text_cache_lock:
+        if _text_cache is None:
+            _text_cache = TextCache()
+        return _text_cache
+
+# --- Extractor Backends ---
+# An extractor turns PDF bytes into a list of per-page strings ("" for a page
+# without text). TF-IDF ignores layout, so ranking defaults to the pdfium text
+# stream and only re-reads a page with pdfplumber when that comes back unusable.
+class PdfplumberExtractor:
+    name = "pdfplumber"
+
+    def extract_pages(self, data, page_numbers=None):
+        # Imported on first use: with the pdfium fast path most processes
+        # never need pdfplumber.
+        import pdfplumber
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            pages = pdf.pages if page_numbers is None else [pdf.pages[n - 1] for n in page_numbers]
+            return [page.extract_text() or "" for page in pages]
+
+
+class PdfiumExtractor:
+    name = "pdfium"
+    # pdfium is not thread-safe; Streamlit serves sessions from threads.
+    _lock = threading.Lock()
+
+    def extract_pages(self, data):
+        pages = []
+        with self._lock:
+            pdf = pdfium.PdfDocument(data)
+            try:
+                for i in range(len(pdf)):
+                    page = pdf[i]
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n"))
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+        return pages
+
+
+def looks_garbled(text):
+    stripped = "".join(text.split())
+    if not stripped:
+        return True
+    bad = sum(1 for ch in stripped if ch == "\ufffd" or not ch.isprintable())
+    if bad / len(stripped) > 0.1 or stripped.count("(cid:") * 6 / len(stripped) > 0.1:
+        return True
+    letters = sum(1 for ch in stripped if ch.isalpha())
+    return letters / len(stripped) < 0.3
+
+
+class FallbackExtractor:
+    name = "fast"
+
+    def __init__(self, fast=None, slow=None):
+        self.fast = fast or PdfiumExtractor()
+        self.slow = slow or PdfplumberExtractor()
+
+    def extract_pages(self, data):
+        pages = self.fast.extract_pages(data)
+        retry = [i + 1 for i, text in enumerate(pages) if looks_garbled(text)]
+        if retry:
+            for page_number, text in zip(retry, self.slow.extract_pages(data, retry)):
+                pages[page_number - 1] = text
+        return pages
+
+
+EXTRACTORS = {"pdfplumber": PdfplumberExtractor()}
+if pdfium is not None:
+    EXTRACTORS["pdfium"] = PdfiumExtractor()
+    EXTRACTORS["fast"] = FallbackExtractor(EXTRACTORS["pdfium"], EXTRACTORS["pdfplumber"])
+
+def get_extractor(name=None):
+    name = name or DEFAULT_EXTRACTOR
+    if name == "fast" and "fast" not in EXTRACTORS:
+        name = "pdfplumber"
+    try:
+        return EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF extractor: {name}")
+
+# --- PDF Text Extraction ---
+def pdf_sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def cache_key(data, extractor):
+    return f"{pdf_sha256(data)}-{extractor.name}"
+
+def parse_pdf(data, extractor=None):
+    extractor = extractor or get_extractor()
+    text = ""
+    empty_pages = []
+    pages = 0
+    for pages, page_text in enumerate(extractor.extract_pages(data), start=1):
+        if page_text:
+            text += page_text
+        else:
+            empty_pages.append(pages)
+    return {"text": text, "empty_pages": empty_pages, "pages": pages}
+
+def _record_extraction(source, data, entry=None):
+    # Entries cached before page counts were stored count no pages.
+    metrics.inc("extraction_files", source=source)
+    metrics.inc("extraction_bytes", len(data), source=source)
+    if entry is not None:
+        metrics.inc("extraction_pages", entry.get("pages", 0), source=source)
+
+def extract_pdf(data, cache=None, extractor=None):
+    # Returns {"text": ..., "empty_pages": [...], "pages": n} and only parses
+    # PDFs whose bytes have not been seen before. Failed parses raise and are
+    # not cached.
+    cache = cache or get_text_cache()
+    extractor = extractor or get_extractor()
+    key = cache_key(data, extractor)
+    entry = cache.get(key)
+    if entry is None:
+        try:
+            with metrics.timer("pdf_parse", extractor=extractor.name):
+                entry = parse_pdf(data, extractor)
+        except Exception:
+            _record_extraction("failed", data)
+            raise
+        cache.put(key, entry)
+        _record_extraction("parsed", data, entry)
+    else:
+        _record_extraction("cache", data, entry)
+    return entry
+
+# --- Parallel Batch Extraction ---
+class ExtractionTimeout(Exception):
+    pass
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+def _extract_worker(data, timeout, extractor_name):
+    # pdfplumber is pure Python, so SIGALRM interrupts a stuck parse inside the
+    # worker and the process stays usable for the next file.
+    if timeout and hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parse_pdf(data, get_extractor(extractor_name))
+    except ExtractionTimeout:
+        raise ExtractionTimeout(f"timed out after {timeout:g}s")
+    finally:
+        if timeout and hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+_executor = None
+_executor_workers = None
+_executor_lock = threading.Lock()
+
+def _get_executor(workers):
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _executor_workers = workers
+        return _executor
+
+def _reset_executor(executor):
+    # shutdown() does not stop a worker stuck in a parse, so the pool's
+    # processes are terminated as well. _processes is private; shutdown()
+    # clears it, hence the copy taken first.
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            processes = list((getattr(executor, "_processes", None) or {}).values())
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+def _describe_error(err):
+    if isinstance(err, ExtractionTimeout):
+        return f"Extraction {err}"
+    return str(err) or err.__class__.__name__
+
+def iter_extract_batch(files, workers=None, timeout=None, cache=None, extractor=None):
+    # files is a list of (name, pdf_bytes). Yields (index, result) as each file
+    # is ready, cache hits first and parses in completion order. A result has
+    # "name", "text", "empty_pages", "pages" and "error" (None on success).
+    workers = workers or EXTRACTION_WORKERS
+    timeout = EXTRACTION_TIMEOUT if timeout is None else timeout
+    cache = cache or get_text_cache()
+    extractor = extractor or get_extractor()
+
+    results = [{"name": name, "text": "", "empty_pages": [], "pages": 0, "error": None} for name, _ in files]
+    pending = {}
+    for i, (name, data) in enumerate(files):
+        key = cache_key(data, extractor)
+        if key in pending:
+            pending[key][1].append(i)
+            continue
+        entry = cache.get(key)
+        if entry is not None:
+            _record_extraction("cache", data, entry)
+            results[i].update(entry)
+            yield i, results[i]
+        else:
+            pending[key] = (data, [i])
+
+    def finish(key, entry=None, error=None):
+        if entry is not None:
+            cache.put(key, entry)
+        # Duplicate uploads of a pending file are counted once, as one parse.
+        _record_extraction("parsed" if entry is not None else "failed", pending[key][0], entry)
+        for i in pending[key][1]:
+            if entry is not None:
+                results[i].update(entry)
+            else:
+                results[i]["error"] = error
+        return [(i, results[i]) for i in pending[key][1]]
+
+    if len(pending) <= 1 or workers <= 1:
+        for key, (data, _) in pending.items():
+            try:
+                with metrics.timer("pdf_parse", extractor=extractor.name):
+                    entry = parse_pdf(data, extractor)
+                finished = finish(key, entry=entry)
+            except Exception as e:
+                finished = finish(key, error=_describe_error(e))
+            yield from finished
+        return
+
+    executor = _get_executor(workers)
+    futures = {executor.submit(_extract_worker, data, timeout, extractor.name): key for key, (data, _) in pending.items()}
+    # Backstop for parses SIGALRM cannot interrupt; queued files get their own
+    # timeout budget, so the deadline grows with the batch.
+    deadline = time.monotonic() + (timeout or 0) * (len(futures) / workers + 1) + 5
+    not_done = set(futures)
+    broken = False
+    try:
+        while not_done:
+            remaining = deadline - time.monotonic() if timeout else None
+            if remaining is not None and remaining <= 0:
+                break
+            done, not_done = wait(not_done, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    finished = finish(futures[future], entry=future.result())
+                except BrokenProcessPool as e:
+                    broken = True
+                    finished = finish(futures[future], error=f"Extraction worker crashed: {e}")
+                except Exception as e:
+                    finished = finish(futures[future], error=_describe_error(e))
+                yield from finished
+        for future in not_done:
+            yield from finish(futures[future], error=f"Extraction timed out after {timeout:g}s")
+        if not_done or broken:
+            _reset_executor(executor)
+    finally:
+        # The caller stopped early: drop the parses nobody will read.
+        for future in not_done:
+            future.cancel()
+
+def extract_batch(files, workers=None, timeout=None, cache=None, extractor=None):
+    # Like iter_extract_batch, but returns all results in upload order.
+    results = [None] * len(files)
+    with metrics.timer("extraction_batch"):
+        for i, result in iter_extract_batch(files, workers, timeout, cache, extractor):
+            results[i] = result
+    return results
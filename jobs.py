@@ -0,0 +1,214 @@
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from database import ConnectionPool
+from soft_skills import SoftSkillAnalysisError, analyze_video
+
+# --- Job Queue Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+JOBS_DB = os.environ.get("RANKITRIGHT_JOBS_DB", os.path.join(BASE_DIR, ".cache", "jobs.db"))
+ANALYSIS_WORKERS = int(os.environ.get("RANKITRIGHT_ANALYSIS_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+PROGRESS_INTERVAL = 0.5  # seconds between progress writes from a worker
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS AnalysisJobs (
+    JobID INTEGER PRIMARY KEY AUTOINCREMENT,
+    VideoHash TEXT NOT NULL,
+    VideoName TEXT NOT NULL,
+    Path TEXT NOT NULL,
+    Status TEXT NOT NULL DEFAULT 'queued',
+    Progress REAL NOT NULL DEFAULT 0,
+    Result TEXT,
+    Error TEXT,
+    CreatedAt REAL NOT NULL,
+    UpdatedAt REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_hash ON AnalysisJobs (VideoHash, Status);
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_status ON AnalysisJobs (Status);
+"""
+
+
+class JobStore:
+    # The job table lives in its own local SQLite file, independent of the
+    # main database backend, so worker processes can report progress directly.
+    # A done job doubles as the result cache for its video hash.
+
+    def __init__(self, path=JOBS_DB, pool_size=2):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        def connect():
+            conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            return conn
+
+        self.pool = ConnectionPool(connect, size=pool_size, errors=(sqlite3.Error,), name="jobs")
+        with self.pool.connection() as conn:
+            conn.executescript(JOBS_SCHEMA)
+
+    def _execute(self, sql, params=()):
+        with self.pool.connection() as conn:
+            cursor = conn.execute(sql, params)
+            conn.commit()
+            return cursor.lastrowid
+
+    def _fetch(self, sql, params=()):
+        with self.pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def create(self, video_hash, video_name, path):
+        now = time.time()
+        return self._execute("INSERT INTO AnalysisJobs (VideoHash, VideoName, Path, CreatedAt, UpdatedAt) VALUES (?, ?, ?, ?, ?)",
+                             (video_hash, video_name, path, now, now))
+
+    def find(self, video_hash):
+        # (JobID, Status, Path), preferring a finished result over a job that is
+        # still queued or running. Failed jobs are ignored so that uploading the
+        # video again retries it.
+        rows = self._fetch("SELECT JobID, Status, Path FROM AnalysisJobs WHERE VideoHash = ? AND Status != ? "
+                           "ORDER BY Status = ? DESC, JobID DESC LIMIT 1", (video_hash, FAILED, DONE))
+        return rows[0] if rows else None
+
+    def get(self, job_ids):
+        job_ids = list(job_ids)
+        if not job_ids:
+            return {}
+        placeholders = ", ".join("?" * len(job_ids))
+        rows = self._fetch(f"SELECT JobID, VideoName, Status, Progress, Result, Error FROM AnalysisJobs WHERE JobID IN ({placeholders})", job_ids)
+        return {job_id: {"name": name, "status": status, "progress": progress, "result": json.loads(result) if result else None, "error": error}
+                for job_id, name, status, progress, result, error in rows}
+
+    def start(self, job_id):
+        self._execute("UPDATE AnalysisJobs SET Status = ?, Progress = 0, UpdatedAt = ? WHERE JobID = ?", (RUNNING, time.time(), job_id))
+
+    def set_progress(self, job_id, progress):
+        self._execute("UPDATE AnalysisJobs SET Progress = ?, UpdatedAt = ? WHERE JobID = ?", (progress, time.time(), job_id))
+
+    def finish(self, job_id, result):
+        self._execute("UPDATE AnalysisJobs SET Status = ?, Progress = 1, Result = ?, UpdatedAt = ? WHERE JobID = ?",
+                      (DONE, json.dumps(result, default=float), time.time(), job_id))
+
+    def fail(self, job_id, error):
+        self._execute("UPDATE AnalysisJobs SET Status = ?, Error = ?, UpdatedAt = ? WHERE JobID = ? AND Status IN (?, ?)",
+                      (FAILED, error, time.time(), job_id, QUEUED, RUNNING))
+
+    def interrupted(self):
+        # Jobs left queued or running by a previous server process.
+        self._execute("UPDATE AnalysisJobs SET Status = ?, Progress = 0 WHERE Status = ?", (QUEUED, RUNNING))
+        return self._fetch("SELECT JobID, Path FROM AnalysisJobs WHERE Status = ? ORDER BY JobID", (QUEUED,))
+
+
+# --- Worker ---
+_worker_store = None
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def _run_job(db_path, job_id, path):
+    global _worker_store
+    if _worker_store is None or _worker_store.path != db_path:
+        _worker_store = JobStore(db_path, pool_size=1)
+    store = _worker_store
+    store.start(job_id)
+    last_report = time.monotonic()
+
+    def report(fraction):
+        nonlocal last_report
+        if time.monotonic() - last_report >= PROGRESS_INTERVAL:
+            last_report = time.monotonic()
+            store.set_progress(job_id, fraction)
+
+    try:
+        store.finish(job_id, analyze_video(path, progress=report))
+    except SoftSkillAnalysisError as err:
+        store.fail(job_id, str(err))
+    finally:
+        _remove(path)
+
+
+# --- Job Queue ---
+class JobQueue:
+    # Videos stored by the upload store are analysed by a pool of worker
+    # processes, so a Streamlit rerun only enqueues and polls. Anything
+    # the workers raise besides SoftSkillAnalysisError, including a crashed
+    # worker, is recorded on the job by the done callback.
+
+    def __init__(self, store=None, workers=ANALYSIS_WORKERS):
+        self.store = store or JobStore()
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+        for job_id, path in self.store.interrupted():
+            if os.path.exists(path):
+                self._dispatch(job_id, path)
+            else:
+                self.store.fail(job_id, "The uploaded video is no longer available. Please upload it again.")
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _dispatch(self, job_id, path):
+        with self._lock:
+            try:
+                future = self._executor.submit(_run_job, self.store.path, job_id, path)
+            except BrokenProcessPool:
+                self._executor = self._new_executor()
+                future = self._executor.submit(_run_job, self.store.path, job_id, path)
+        future.add_done_callback(lambda f: self._on_done(job_id, path, f))
+
+    def _on_done(self, job_id, path, future):
+        # A job cancelled by shutdown stays queued and is resubmitted on restart.
+        if future.cancelled() or future.exception() is None:
+            return
+        if isinstance(future.exception(), BrokenProcessPool):
+            error = "the analysis worker stopped unexpectedly"
+        else:
+            error = f"{type(future.exception()).__name__}: {future.exception()}"
+        self.store.fail(job_id, error)
+        _remove(path)
+
+    def submit(self, name, path, video_hash):
+        # Takes ownership of the stored video at path. When the same bytes
+        # already have a finished or in-flight job, that job is returned and
+        # the duplicate copy is removed, unless it is the very file the queued
+        # job is about to read.
+        with self._lock:
+            job = self.store.find(video_hash)
+            if job is None:
+                job_id = self.store.create(video_hash, name, path)
+            else:
+                job_id, status, job_path = job
+                if status == DONE or job_path != path:
+                    _remove(path)
+                return job_id
+        self._dispatch(job_id, path)
+        return job_id
+
+    def status(self, job_ids):
+        return self.store.get(job_ids)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+def get_job_queue():
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue()
+        return _job_queue
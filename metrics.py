@@ -0,0 +1,177 @@
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# --- Metrics Configuration ---
+# RANKITRIGHT_METRICS_FILE: Prometheus text file rewritten at most every
+#   METRICS_FLUSH_INTERVAL seconds (for node_exporter's textfile collector).
+# RANKITRIGHT_METRICS_PORT: serve the same text on http://<host>:<port>/metrics.
+METRICS_FILE = os.environ.get("RANKITRIGHT_METRICS_FILE")
+METRICS_PORT = int(os.environ.get("RANKITRIGHT_METRICS_PORT", 0))
+METRICS_FLUSH_INTERVAL = float(os.environ.get("RANKITRIGHT_METRICS_FLUSH_INTERVAL", 15))
+METRICS_PREFIX = "rankitright_"
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+class Registry:
+    # Counters and histograms kept in memory for this process, keyed by name
+    # and sorted label pairs. Recording takes one lock and a few additions, so
+    # it is cheap enough for every query and every page run. Work done in the
+    # extraction and analysis worker processes is timed from this side.
+
+    def __init__(self, path=METRICS_FILE, flush_interval=METRICS_FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._counters = {}
+        self._histograms = {}  # key -> [bucket counts..., +Inf count, sum, max]
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0] * (len(BUCKETS) + 1) + [0.0, 0.0]
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    histogram[i] += 1
+                    break
+            else:
+                histogram[len(BUCKETS)] += 1
+            histogram[-2] += value
+            histogram[-1] = max(histogram[-1], value)
+        self._maybe_flush()
+
+    @contextmanager
+    def timer(self, name, **labels):
+        # Records the duration in the <name>_seconds histogram, also when the
+        # block raises.
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+    def snapshot(self):
+        # (counters, timers) as lists of dicts, for the timing panel.
+        with self._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in sorted(self._counters.items())]
+            histograms = sorted(self._histograms.items())
+            histograms = [(key, list(histogram)) for key, histogram in histograms]
+        timers = []
+        for (name, labels), histogram in histograms:
+            count = sum(histogram[:len(BUCKETS) + 1])
+            timers.append({"name": name, "labels": dict(labels), "count": count, "sum": histogram[-2], "max": histogram[-1],
+                           "p95": self._quantile(histogram, count, 0.95)})
+        return counters, timers
+
+    def _quantile(self, histogram, count, q):
+        # Upper bound of the bucket holding the q-quantile (the max beyond the last bucket).
+        seen = 0
+        for i, bound in enumerate(BUCKETS):
+            seen += histogram[i]
+            if seen >= q * count:
+                return min(bound, histogram[-1])
+        return histogram[-1]
+
+    def render(self):
+        # Prometheus text exposition format (version 0.0.4).
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = [(key, list(histogram)) for key, histogram in sorted(self._histograms.items())]
+        lines = []
+        typed = set()
+        for (name, labels), value in counters:
+            metric = f"{METRICS_PREFIX}{name}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_label_text(labels)} {value}")
+        for (name, labels), histogram in histograms:
+            metric = METRICS_PREFIX + name
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ("+Inf",), histogram[:len(BUCKETS) + 1]):
+                cumulative += count
+                lines.append(f"{metric}_bucket{_label_text(labels + (('le', f'{bound:g}' if bound != '+Inf' else bound),))} {cumulative}")
+            lines.append(f"{metric}_sum{_label_text(labels)} {histogram[-2]:.6f}")
+            lines.append(f"{metric}_count{_label_text(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=None):
+        # Written to a temporary file and renamed, so a scraper never reads half a file.
+        path = path or self.path
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def _maybe_flush(self):
+        if not self.path or time.monotonic() - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = time.monotonic()
+        try:
+            self.write()
+        except OSError:
+            pass
+
+
+_registry = Registry()
+inc = _registry.inc
+observe = _registry.observe
+timer = _registry.timer
+snapshot = _registry.snapshot
+render = _registry.render
+
+if METRICS_FILE:
+    atexit.register(_registry.write)
+
+
+# --- HTTP Endpoint ---
+_server = None
+_server_lock = threading.Lock()
+
+def serve(port=METRICS_PORT):
+    # Starts the /metrics endpoint once per process; a no-op without a port.
+    # http.server is only imported when a port is configured.
+    global _server
+    with _server_lock:
+        if _server is None and port:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            _server = ThreadingHTTPServer(("", port), MetricsHandler)
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
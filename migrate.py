@@ -0,0 +1,9 @@
+from database import create_repository, DB_BACKEND
+
+# Run once after upgrading: python migrate.py
+# Converts the comma-joined ranking history columns into the per-candidate
+# HRResumeRankingResults / HRSoftSkillRankingResults tables.
+if __name__ == "__main__":
+    repository = create_repository(DB_BACKEND)
+    moved = repository.migrate()
+    print(f"Migrated {moved} ranking results ({DB_BACKEND}).")
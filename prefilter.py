@@ -0,0 +1,74 @@
+import re
+
+# --- Keyword Pre-filter ---
+# Terms are matched as whole words, case-insensitively. A token keeps the
+# characters that make up skill names ("c++", "c#", "node.js", "asp.net"),
+# so these can be required without matching "c" or "node" alone. A term of
+# several words ("machine learning", "aws certified") matches when its words
+# appear next to each other, separated only by spaces or punctuation.
+TOKEN_PATTERN = re.compile(r"\w[\w+#]*(?:\.\w[\w+#]*)*")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_terms(value):
+    # Comma- or newline-separated terms as typed in the UI or on the command line.
+    return [term.strip() for term in re.split(r"[,\n]", value or "") if term.strip()]
+
+
+def parse_keywords(value):
+    # parse_terms for the keyword filter: a term with no token in it ("-",
+    # "++") would match every resume, so it is dropped and has no effect.
+    return [term for term in parse_terms(value) if tokenize(term)]
+
+
+def _contains_run(tokens, run):
+    first, n = run[0], len(run)
+    return any(token == first and tokens[i:i + n] == run for i, token in enumerate(tokens))
+
+
+class PostingIndex:
+    # An inverted index from each token to the set of resumes (positions in
+    # texts) that contain it. A filter is answered with set intersections,
+    # unions and differences over these postings, starting from the rarest
+    # must-have term, so resumes are dropped before any of them is vectorised.
+    # Only multi-word terms look at the text again, and only for the resumes
+    # that already contain all of their words.
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.postings = {}
+        for i, text in enumerate(texts):
+            for token in set(tokenize(text)):
+                self.postings.setdefault(token, set()).add(i)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def matching(self, term):
+        # Positions of the resumes containing term.
+        tokens = tokenize(term)
+        if not tokens:
+            return set(range(len(self.texts)))
+        postings = sorted((self.postings.get(token, set()) for token in tokens), key=len)
+        docs = postings[0].intersection(*postings[1:])
+        if len(tokens) > 1 and docs:
+            docs = {i for i in docs if _contains_run(tokenize(self.texts[i]), tokens)}
+        return docs
+
+    def filter(self, must=(), any_of=(), exclude=()):
+        # Sorted positions of the resumes that contain every must-have term,
+        # at least one any-of term (when any are given) and no excluded term.
+        # Terms without tokens are ignored, as parse_keywords drops them.
+        must, any_of, exclude = ([term for term in terms if tokenize(term)] for terms in (must, any_of, exclude))
+        must_sets = sorted((self.matching(term) for term in must), key=len)
+        candidates = must_sets[0].intersection(*must_sets[1:]) if must_sets else set(range(len(self.texts)))
+        if any_of and candidates:
+            candidates &= set().union(*(self.matching(term) for term in any_of))
+        for term in exclude:
+            if not candidates:
+                break
+            candidates -= self.matching(term)
+        return sorted(candidates)
@@ -0,0 +1,249 @@
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from extraction import EXTRACTION_WORKERS, get_extractor, iter_extract_batch
+from dedupe import DuplicateIndex, near_duplicate_labels
+from prefilter import PostingIndex, parse_keywords
+from ranking import ResumeIndex, get_resume_index, load_job_descriptions, rank_resumes_multi, read_job_description
+
+# Ranks a directory of PDF resumes against one job description without the UI:
+#   python rank_resumes.py "sample job descriptions/sample1.txt" resumes/ -o ranked.csv
+# Given a directory of .txt job descriptions instead, every role is scored
+# against the same pool in one pass and each row names its role in "job".
+# By default every resume is extracted first and the ranked list is written at
+# the end, best first. With --stream, each chunk of files is scored and written
+# as soon as it is extracted, in directory order, so memory stays bounded and
+# results start appearing right away on directories with tens of thousands of
+# files. A streamed score uses the document frequencies of the resumes seen so
+# far (plus a user's index in the app with --index), so early chunks can differ slightly
+# from a full run; sort the output afterwards if a ranking is needed.
+
+FORMATS = ("csv", "json", "parquet")
+CHUNK_SIZE = 256  # PDFs read into memory and extracted at a time
+
+
+def find_pdfs(directory):
+    # Relative paths of every PDF under directory, in a stable order.
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        paths.extend(os.path.relpath(os.path.join(root, name), directory) for name in sorted(files) if name.lower().endswith(".pdf"))
+    return paths
+
+
+def iter_extracted_chunks(directory, paths, chunk_size, workers, extractor):
+    # Yields the extraction results of each chunk of paths, in path order.
+    for start in range(0, len(paths), chunk_size):
+        files = []
+        for path in paths[start:start + chunk_size]:
+            with open(os.path.join(directory, path), "rb") as f:
+                files.append((path, f.read()))
+        results = [None] * len(files)
+        for i, result in iter_extract_batch(files, workers=workers, extractor=extractor):
+            results[i] = result
+        yield results
+
+
+def apply_keyword_filter(texts, keyword_filter):
+    # Positions of the texts passing (must, any_of, exclude); all of them
+    # when no terms are given.
+    if not any(keyword_filter):
+        return list(range(len(texts)))
+    return PostingIndex(texts).filter(*keyword_filter)
+
+
+def score_chunk(index, jobs, results, keyword_filter, duplicates=None, seen_names=None):
+    # Rows for one chunk of extraction results, one per resume and job (a list
+    # of (name, job description) pairs). Files that could not be read
+    # are reported with their error and left out of the pool; resumes failing
+    # the keyword filter are dropped before they are vectorised. With a
+    # DuplicateIndex, a near-duplicate of a resume from this or an earlier
+    # chunk is listed with duplicate_of instead of being scored; seen_names
+    # holds the name of every resume added to it so far.
+    readable = [result for result in results if not result["error"]]
+    kept = [readable[i] for i in apply_keyword_filter([result["text"] for result in readable], keyword_filter)]
+    rows = [{"resume": result["name"], "score": None, "error": result["error"]} for result in results if result["error"]]
+    if duplicates is not None and kept:
+        start = len(seen_names)
+        labels = duplicates.add([result["text"] for result in kept])
+        seen_names.extend(result["name"] for result in kept)
+        rows += [{"resume": result["name"], "score": None, "error": None, "duplicate_of": seen_names[label]}
+                 for position, (result, label) in enumerate(zip(kept, labels), start) if label != position]
+        kept = [result for position, (result, label) in enumerate(zip(kept, labels), start) if label == position]
+    if kept:
+        scores = index.score_many([job_description for _, job_description in jobs], index.add([result["text"] for result in kept]))
+        rows += [{"job": job, "resume": result["name"], "score": round(float(score), 4), "error": None}
+                 for (job, _), job_scores in zip(jobs, scores) for result, score in zip(kept, job_scores)]
+    return rows
+
+
+# --- Writers ---
+# Each writer takes rows as they come and finishes the file in close(), so the
+# streaming and the batch mode share them. Text formats go to stdout when no
+# output file is given.
+class TextWriter:
+    def __init__(self, path):
+        self.out = sys.stdout if path is None else open(path, "w", newline="", encoding="utf-8")
+
+    def close(self):
+        if self.out is not sys.stdout:
+            self.out.close()
+
+
+class CsvWriter(TextWriter):
+    def __init__(self, path, columns):
+        super().__init__(path)
+        self.writer = csv.DictWriter(self.out, fieldnames=columns, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.out.flush()
+
+
+class JsonWriter(TextWriter):
+    # A JSON array written one object per line, so a partial file is easy to
+    # inspect while a stream is still running.
+    def __init__(self, path, columns):
+        super().__init__(path)
+        self.columns = columns
+        self.first = True
+        self.out.write("[")
+
+    def write(self, rows):
+        for row in rows:
+            self.out.write(("\n  " if self.first else ",\n  ") + json.dumps({column: row.get(column) for column in self.columns}))
+            self.first = False
+        self.out.flush()
+
+    def close(self):
+        self.out.write("]\n" if self.first else "\n]\n")
+        super().close()
+
+
+class ParquetWriter:
+    def __init__(self, path, columns):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow: pip install pyarrow")
+        types = {"job": pa.string(), "rank": pa.int64(), "resume": pa.string(), "score": pa.float64(), "error": pa.string(), "duplicate_of": pa.string()}
+        self.pa = pa
+        self.schema = pa.schema([(column, types[column]) for column in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        if rows:
+            self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "json": JsonWriter, "parquet": ParquetWriter}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank a directory of PDF resumes against a job description.")
+    parser.add_argument("job_description", help="Job description text file, or a directory of them to rank every role at once")
+    parser.add_argument("resumes", help="Directory of PDF resumes (searched recursively)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout); its extension picks the format")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="Output format (default: from --output, else csv)")
+    parser.add_argument("--workers", type=int, default=EXTRACTION_WORKERS, help="Extraction worker processes (default: %(default)s)")
+    parser.add_argument("--extractor", help="PDF text extractor: fast, pdfium or pdfplumber (default: RANKITRIGHT_EXTRACTOR)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="PDFs extracted per chunk (default: %(default)s)")
+    parser.add_argument("--top", type=int, help="Only write the best N resumes (per job description)")
+    parser.add_argument("--min-score", type=float, help="Only write resumes scoring at least this")
+    parser.add_argument("--must", help="Comma-separated terms a resume must all contain to be scored")
+    parser.add_argument("--any", dest="any_of", help="Comma-separated terms a resume must contain at least one of")
+    parser.add_argument("--exclude", help="Comma-separated terms that drop a resume")
+    parser.add_argument("--group-duplicates", action="store_true", help="Score one copy of each group of near-duplicate resumes and list the others with duplicate_of")
+    parser.add_argument("--index", metavar="USERNAME", help="Score against this HR user's resume index in the app and add these resumes to it, as the UI does")
+    parser.add_argument("--stream", action="store_true", help="Write each chunk's scores as soon as it is extracted, in directory order")
+    args = parser.parse_args()
+
+    output_format = args.format
+    if output_format is None:
+        extension = os.path.splitext(args.output or "")[1].lower().lstrip(".")
+        output_format = extension if extension in FORMATS else "csv"
+    if output_format == "parquet" and args.output is None:
+        parser.error("Parquet output needs a file: use -o results.parquet")
+    if args.stream and args.top is not None:
+        parser.error("--top needs the full ranking and cannot be combined with --stream")
+    try:
+        extractor = get_extractor(args.extractor)
+    except ValueError as err:
+        parser.error(str(err))
+    if os.path.isdir(args.job_description):
+        jobs = list(load_job_descriptions(args.job_description).items())
+        if not jobs:
+            sys.exit(f"No job descriptions (.txt) found in {args.job_description}")
+    else:
+        with open(args.job_description, "rb") as f:
+            jobs = [(os.path.splitext(os.path.basename(args.job_description))[0], read_job_description(f.read()))]
+    paths = find_pdfs(args.resumes)
+    if not paths:
+        sys.exit(f"No PDFs found in {args.resumes}")
+
+    keyword_filter = (parse_keywords(args.must), parse_keywords(args.any_of), parse_keywords(args.exclude))
+    index = get_resume_index(args.index) if args.index else ResumeIndex()
+    chunks = iter_extracted_chunks(args.resumes, paths, max(1, args.chunk_size), args.workers, extractor)
+    columns = ["resume", "score", "error"] if args.stream else ["rank", "resume", "score", "error"]
+    if os.path.isdir(args.job_description):
+        columns.insert(0, "job")
+    if args.group_duplicates:
+        columns.append("duplicate_of")
+    writer = WRITERS[output_format](args.output, columns)
+    done = 0
+    try:
+        if args.stream:
+            duplicates, seen_names = (DuplicateIndex(), []) if args.group_duplicates else (None, None)
+            for results in chunks:
+                rows = score_chunk(index, jobs, results, keyword_filter, duplicates, seen_names)
+                if args.min_score is not None:
+                    rows = [row for row in rows if row["score"] is not None and row["score"] >= args.min_score]
+                writer.write(rows)
+                done += len(results)
+                print(f"Scored {done} of {len(paths)} resumes", file=sys.stderr)
+        else:
+            names, texts, failed = [], [], []  # failed also collects near-duplicates, listed after the ranking
+            for results in chunks:
+                for result in results:
+                    if result["error"]:
+                        failed.append({"rank": None, "resume": result["name"], "score": None, "error": result["error"]})
+                    else:
+                        names.append(result["name"])
+                        texts.append(result["text"])
+                done += len(results)
+                print(f"Extracted {done} of {len(paths)} resumes", file=sys.stderr)
+            kept = apply_keyword_filter(texts, keyword_filter)
+            if any(keyword_filter):
+                print(f"{len(kept)} of {len(texts)} resumes pass the keyword filter", file=sys.stderr)
+            names, texts = [names[i] for i in kept], [texts[i] for i in kept]
+            if args.group_duplicates:
+                labels = near_duplicate_labels(texts)
+                failed += [{"rank": None, "resume": names[i], "score": None, "error": None, "duplicate_of": names[label]}
+                           for i, label in enumerate(labels) if label != i]
+                unique = [i for i, label in enumerate(labels) if label == i]
+                print(f"{len(texts)} resumes grouped into {len(unique)} unique candidates", file=sys.stderr)
+                names, texts = [names[i] for i in unique], [texts[i] for i in unique]
+            if texts:
+                scores, shortlists = rank_resumes_multi([job_description for _, job_description in jobs], texts, index, args.top, args.min_score)
+            else:
+                scores, shortlists = np.zeros((len(jobs), 0)), [[] for _ in jobs]
+            for (job, _), job_scores, ranked in zip(jobs, scores, shortlists):
+                writer.write([{"job": job, "rank": rank, "resume": names[i], "score": round(float(job_scores[i]), 4), "error": None}
+                              for rank, i in enumerate(ranked, start=1)])
+            if args.min_score is None and args.top is None:
+                writer.write(failed)
+    finally:
+        writer.close()
+
+if __name__ == "__main__":
+    main()
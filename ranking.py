@@ -0,0 +1,362 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import scipy.sparse as sp
+
+import metrics
+
+# --- Resume Index Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_DIR = os.environ.get("RANKITRIGHT_INDEX_DIR", os.path.join(BASE_DIR, ".cache", "resume_index"))
+INDEX_MAX_SEGMENTS = int(os.environ.get("RANKITRIGHT_INDEX_MAX_SEGMENTS", 8))
+
+
+def document_id(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResumeIndex:
+    # Raw term counts are stored per resume, so IDF can be recomputed for every
+    # query from the document frequencies instead of re-fitting a vectorizer.
+    #
+    # On disk (directory is not None) the index is a set of immutable CSR
+    # segments saved as .npy files and opened with mmap_mode="r". Each add()
+    # writes one new segment, rewrites vocabulary.txt and doc_ids.txt, and
+    # finally swaps manifest.json, which records how much of each file is valid.
+    # The app and rank_resumes.py --index can share one directory, so add()
+    # holds an exclusive lock on index.lock and first reloads whatever another
+    # process committed; loading holds it shared.
+
+    def __init__(self, directory=None, max_segments=INDEX_MAX_SEGMENTS):
+        self.directory = directory
+        self.max_segments = max_segments
+        from sklearn.feature_extraction.text import TfidfVectorizer  # only the tokenizer is used
+        self.analyzer = TfidfVectorizer().build_analyzer()
+        self.vocabulary = {}
+        self.terms = []
+        self.doc_ids = []
+        self.rows = {}
+        self.df = np.zeros(0, dtype=np.int64)
+        self.segments = []
+        self.generation = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            with self._file_lock(exclusive=False):
+                self._load()
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    @property
+    def vocabulary_size(self):
+        return len(self.terms)
+
+    # --- Persistence ---
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    @contextmanager
+    def _file_lock(self, exclusive=True):
+        with open(self._path("index.lock"), "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            else:
+                # msvcrt has no shared locks, and LK_LOCK gives up after 10 seconds.
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        time.sleep(0.05)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _refresh(self):
+        # Catches up with segments another process committed since _load().
+        try:
+            with open(self._path("manifest.json"), "r", encoding="utf-8") as f:
+                generation = json.load(f)["generation"]
+        except FileNotFoundError:
+            return
+        if generation != self.generation:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self._path("manifest.json"), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        with open(self._path("vocabulary.txt"), "r", encoding="utf-8") as f:
+            self.terms = f.read().split("\n")[:manifest["vocabulary_size"]]
+        with open(self._path("doc_ids.txt"), "r", encoding="utf-8") as f:
+            self.doc_ids = f.read().split("\n")[:manifest["n_docs"]]
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.rows = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        self.generation = manifest["generation"]
+        self.df = np.load(self._path(f"df-{self.generation}.npy"))
+        self.segments = []
+        for name in manifest["segments"]:
+            arrays = [np.load(self._path(f"{name}.{part}.npy"), mmap_mode="r") for part in ("data", "indices", "indptr")]
+            self.segments.append((name, arrays))
+
+    def _save_segment(self, name, matrix):
+        # indices and indptr must share a dtype or scipy copies them on load.
+        index_dtype = np.int32 if matrix.nnz < 2**31 and matrix.shape[1] < 2**31 else np.int64
+        np.save(self._path(f"{name}.data.npy"), matrix.data)
+        np.save(self._path(f"{name}.indices.npy"), matrix.indices.astype(index_dtype, copy=False))
+        np.save(self._path(f"{name}.indptr.npy"), matrix.indptr.astype(index_dtype, copy=False))
+        return [np.load(self._path(f"{name}.{part}.npy"), mmap_mode="r") for part in ("data", "indices", "indptr")]
+
+    def _write_lines(self, name, lines):
+        tmp_path = self._path(name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        os.replace(tmp_path, self._path(name))
+
+    def _commit(self, obsolete):
+        # Term and document ids are append-only, so the manifest counts keep an
+        # older manifest valid against newer vocabulary and doc id files.
+        self._write_lines("vocabulary.txt", self.terms)
+        self._write_lines("doc_ids.txt", self.doc_ids)
+        old_generation = self.generation
+        self.generation += 1
+        np.save(self._path(f"df-{self.generation}.npy"), self.df)
+        manifest = {
+            "generation": self.generation,
+            "vocabulary_size": len(self.terms),
+            "n_docs": len(self.doc_ids),
+            "segments": [name for name, _ in self.segments],
+        }
+        tmp_path = self._path("manifest.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._path("manifest.json"))
+        for name in [f"df-{old_generation}"] + obsolete:
+            for suffix in ("", ".data", ".indices", ".indptr"):
+                try:
+                    os.remove(self._path(f"{name}{suffix}.npy"))
+                except FileNotFoundError:
+                    pass
+
+    # --- Updates ---
+    def _segment_matrix(self, arrays):
+        data, indices, indptr = arrays
+        return sp.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.terms)), copy=False)
+
+    def add(self, texts):
+        # Returns the document id of every text, in order. Texts already in the
+        # index are not re-vectorised.
+        ids = [document_id(text) for text in texts]
+        with self._lock:
+            if self.directory is None:
+                self._add(ids, texts)
+            else:
+                with self._file_lock():
+                    self._refresh()
+                    self._add(ids, texts)
+        return ids
+
+    def _add(self, ids, texts):
+        seen = set()
+        indices, values, indptr = [], [], [0]
+        new_doc_ids = []
+        for doc_id, text in zip(ids, texts):
+            if doc_id in self.rows or doc_id in seen:
+                continue
+            seen.add(doc_id)
+            counts = {}
+            for term in self.analyzer(text):
+                term_id = self.vocabulary.get(term)
+                if term_id is None:
+                    term_id = self.vocabulary[term] = len(self.terms)
+                    self.terms.append(term)
+                counts[term_id] = counts.get(term_id, 0) + 1
+            indices.extend(counts.keys())
+            values.extend(counts.values())
+            indptr.append(len(indices))
+            new_doc_ids.append(doc_id)
+        if not new_doc_ids:
+            return
+
+        matrix = sp.csr_matrix(
+            (np.array(values, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(new_doc_ids), len(self.terms)),
+        )
+        # Segments are opened read-only, so they must already be canonical.
+        matrix.sort_indices()
+        df = np.zeros(len(self.terms), dtype=np.int64)
+        df[:len(self.df)] = self.df
+        self.df = df + np.bincount(matrix.indices, minlength=len(self.terms))
+        for doc_id in new_doc_ids:
+            self.rows[doc_id] = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+
+        obsolete = []
+        name = f"seg-{self.generation + 1:06d}"
+        if len(self.segments) + 1 > self.max_segments:
+            obsolete = [old_name for old_name, _ in self.segments] if self.directory else []
+            matrix = sp.vstack([self._segment_matrix(arrays) for _, arrays in self.segments] + [matrix], format="csr")
+            matrix.sort_indices()
+            self.segments = []
+        if self.directory is None:
+            arrays = [matrix.data, matrix.indices, matrix.indptr]
+        else:
+            arrays = self._save_segment(name, matrix)
+        self.segments.append((name, arrays))
+        if self.directory is not None:
+            self._commit(obsolete)
+        else:
+            self.generation += 1
+
+    # --- Queries ---
+    def score(self, job_description, doc_ids=None):
+        # Cosine similarity between the job description and each document,
+        # identical to fitting TfidfVectorizer on [job_description] + pool.
+        # doc_ids defaults to the whole pool; IDF always comes from the pool.
+        return self.score_many([job_description], doc_ids)[0]
+
+    def score_many(self, job_descriptions, doc_ids=None):
+        # Returns a (job descriptions x documents) similarity matrix. Every job
+        # description gets the same IDF it would get from score(), but all of
+        # them are scored with one sparse product per segment.
+        query_counts = []
+        for job_description in job_descriptions:
+            counts = {}
+            for term in self.analyzer(job_description):
+                counts[term] = counts.get(term, 0) + 1
+            query_counts.append(counts)
+        # add() grows the vocabulary in place, so term ids are looked up here too.
+        with self._lock:
+            segments = [self._segment_matrix(arrays) for _, arrays in self.segments]
+            n_docs = len(self.doc_ids)
+            df = self.df
+            rows = None if doc_ids is None else np.array([self.rows[doc_id] for doc_id in doc_ids], dtype=np.int64)
+            queries = []
+            for counts in query_counts:
+                ids = np.array([self.vocabulary[term] for term in counts if term in self.vocabulary], dtype=np.int64)
+                known = np.array([count for term, count in counts.items() if term in self.vocabulary], dtype=np.float64)
+                unknown = np.array([count for term, count in counts.items() if term not in self.vocabulary], dtype=np.float64)
+                queries.append((ids, known, unknown))
+
+        # Each job description counts as one more document, as in the original fit.
+        n = n_docs + 1
+        idf = np.log((1 + n) / (1 + df)) + 1
+        unknown_idf = np.log((1 + n) / 2) + 1
+        term_ids, query_ids, weights, idf_squared_deltas = [], [], [], []
+        for j, (ids, known, unknown) in enumerate(queries):
+            query_idf = np.log((1 + n) / (2 + df[ids])) + 1
+            query = known * query_idf
+            norm = np.sqrt(np.sum(query ** 2) + np.sum((unknown * unknown_idf) ** 2))
+            if norm == 0:
+                continue
+            term_ids.append(ids)
+            query_ids.append(np.full(len(ids), j))
+            weights.append(query_idf * query / norm)
+            idf_squared_deltas.append(query_idf ** 2 - idf[ids] ** 2)
+
+        shape = (len(df), len(job_descriptions))
+        if term_ids:
+            term_ids, query_ids = np.concatenate(term_ids), np.concatenate(query_ids)
+            weights = sp.csc_matrix((np.concatenate(weights), (term_ids, query_ids)), shape=shape)
+            idf_squared_deltas = sp.csc_matrix((np.concatenate(idf_squared_deltas), (term_ids, query_ids)), shape=shape)
+        else:
+            weights = idf_squared_deltas = sp.csc_matrix(shape)
+        idf_squared = idf ** 2
+
+        result = np.zeros((len(job_descriptions), n_docs if rows is None else len(rows)))
+        offset = 0
+        for matrix in segments:
+            if rows is None:
+                positions = np.arange(offset, offset + matrix.shape[0])
+                selected = matrix
+            else:
+                positions = np.flatnonzero((rows >= offset) & (rows < offset + matrix.shape[0]))
+                selected = matrix[rows[positions] - offset]
+            offset += matrix.shape[0]
+            if len(positions) == 0:
+                continue
+            squared = selected.power(2)
+            norms = np.sqrt((squared @ idf_squared)[:, None] + (squared @ idf_squared_deltas).toarray())
+            dots = (selected @ weights).toarray()
+            result[:, positions] = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0).T
+        return result
+
+
+def top_k(scores, k=None, min_score=None):
+    # Positions of the k highest scores (all of them if k is None) at or above
+    # min_score, best first. argpartition keeps this O(n + k log k).
+    candidates = np.arange(len(scores)) if min_score is None else np.flatnonzero(scores >= min_score)
+    if k is not None and k < len(candidates):
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates.sort()
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+_resume_indexes = {}
+_resume_indexes_lock = threading.Lock()
+
+def get_resume_index(username):
+    # Each HR user has their own pool, so one recruiter's uploads never feed
+    # another's IDF or pool size. The directory is named by a hash of the
+    # username, which any username maps to safely.
+    with _resume_indexes_lock:
+        index = _resume_indexes.get(username)
+        if index is None:
+            directory = os.path.join(INDEX_DIR, "users", hashlib.sha256(username.encode("utf-8")).hexdigest())
+            index = _resume_indexes[username] = ResumeIndex(directory)
+        return index
+
+# --- Resume Ranking ---
+def rank_resumes_hr(job_description, resumes, index=None):
+    # Without an index the pool is just this batch, which reproduces a fresh
+    # TfidfVectorizer fit on [job_description] + resumes.
+    index = index if index is not None else ResumeIndex()
+    with metrics.timer("rank_resumes", stage="index"):
+        doc_ids = index.add(resumes)
+    with metrics.timer("rank_resumes", stage="score"):
+        scores = index.score(job_description, doc_ids)
+    metrics.inc("resumes_ranked", len(resumes))
+    return scores
+
+def rank_resumes_multi(job_descriptions, resumes, index=None, k=None, min_score=None):
+    # Scores every job description against the same resumes in one pass and
+    # returns the full score matrix plus each role's top-k resume positions.
+    index = index if index is not None else ResumeIndex()
+    doc_ids = index.add(resumes)
+    scores = index.score_many(job_descriptions, doc_ids)
+    shortlists = [top_k(row, k, min_score) for row in scores]
+    return scores, shortlists
+
+def read_job_description(data):
+    # The bundled sample job descriptions are Windows-1252, not UTF-8.
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+def load_job_descriptions(directory):
+    job_descriptions = {}
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(".txt"):
+            with open(os.path.join(directory, name), "rb") as f:
+                job_descriptions[os.path.splitext(name)[0]] = read_job_description(f.read())
+    return job_descriptions
@@ -0,0 +1,139 @@
+import json
+import os
+import re
+import threading
+
+import metrics
+
+# --- Resume Rule Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_PATH = os.environ.get("RANKITRIGHT_RESUME_RULES", os.path.join(BASE_DIR, "resume_rules.json"))
+
+# Each rule in the JSON list has a "check" and the "message" suggested when it fires:
+#   {"check": "min_chars", "value": 500}       fires when the text is shorter
+#   {"check": "min_lines", "value": 5}         fires when there are fewer lines
+#   {"check": "missing", "keywords": [...]}    fires when none of the keywords occur
+#   {"check": "present", "keywords": [...]}    fires when any of the keywords occurs
+# Keyword checks are case-insensitive substring tests; add "at_line_start": true
+# to only count keywords that begin a line, as section headers do.
+CHECKS = ("min_chars", "min_lines", "missing", "present")
+
+
+def _trie_pattern(words):
+    # Regex shaped like a trie of the words, longest alternative first, so
+    # the work at each position is bounded by the longest keyword rather than
+    # by the number of keywords.
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        ends = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends:
+            return body + "?" if len(branches) == 1 and len(body) == 1 else "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class RuleSet:
+    # Rules are data: a check, its keywords or threshold, and the suggestion
+    # shown when it fires. All keywords of all rules are compiled into one
+    # regex scanned once over the lower-cased text. Each match is the longest
+    # keyword starting there, and every keyword contained in it counts as
+    # found ("intern" inside "internship"). Only keywords whose tail can start
+    # another keyword make the scan resume inside the match, so the result is
+    # the same as one substring test per keyword.
+
+    def __init__(self, rules):
+        self.rules = []
+        keywords = set()
+        for number, rule in enumerate(rules, start=1):
+            check = rule.get("check")
+            if check not in CHECKS:
+                raise ValueError(f"Resume rule {number}: unknown check {check!r} (expected one of {', '.join(CHECKS)})")
+            if "message" not in rule:
+                raise ValueError(f"Resume rule {number}: missing 'message'")
+            if check in ("missing", "present"):
+                words = [word.lower() for word in rule.get("keywords", [])]
+                if not words:
+                    raise ValueError(f"Resume rule {number}: '{check}' needs a non-empty 'keywords' list")
+                keywords.update(words)
+                rule = {**rule, "keywords": words}
+            elif not isinstance(rule.get("value"), int):
+                raise ValueError(f"Resume rule {number}: '{check}' needs an integer 'value'")
+            self.rules.append(rule)
+        self._contained = {word: {other for other in keywords if other in word} for word in keywords}
+        self._prefixes = {word: {other for other in keywords if word.startswith(other)} for word in keywords}
+        self._overlapping = {word for word in keywords
+                             if any(other.startswith(word[i:]) for other in keywords for i in range(1, len(word)))}
+        self._pattern = re.compile(_trie_pattern(keywords)) if keywords else None
+
+    @classmethod
+    def from_file(cls, path=RULES_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _scan(self, lowered):
+        # Returns the keywords found anywhere and those found at the start of
+        # a line (after optional whitespace), which is where section headers sit.
+        found, at_line_start = set(), set()
+        if self._pattern is None:
+            return found, at_line_start
+        position = 0
+        while True:
+            match = self._pattern.search(lowered, position)
+            if match is None:
+                break
+            word, start = match.group(), match.start()
+            found |= self._contained[word]
+            line_start = lowered.rfind("\n", 0, start) + 1
+            if lowered[line_start:start].strip() == "":
+                at_line_start |= self._prefixes[word]
+            position = start + 1 if word in self._overlapping else match.end()
+        return found, at_line_start
+
+    def evaluate(self, text):
+        with metrics.timer("resume_evaluate"):
+            lowered = text.lower()
+            found, at_line_start = self._scan(lowered)
+            line_count = len(text.splitlines())
+            suggestions = []
+            for rule in self.rules:
+                check = rule["check"]
+                if check == "min_chars":
+                    fires = len(text) < rule["value"]
+                elif check == "min_lines":
+                    fires = line_count < rule["value"]
+                else:
+                    present = at_line_start if rule.get("at_line_start") else found
+                    hit = any(word in present for word in rule["keywords"])
+                    fires = hit if check == "present" else not hit
+                if fires:
+                    suggestions.append(rule["message"])
+            return suggestions
+
+    def evaluate_many(self, texts):
+        return [self.evaluate(text) for text in texts]
+
+
+_rule_set = None
+_rule_set_version = None
+_rule_set_lock = threading.Lock()
+
+def get_rule_set(path=RULES_PATH):
+    # Reloaded when the rules file changes, so new rules apply without a restart.
+    global _rule_set, _rule_set_version
+    version = (path, os.stat(path).st_mtime_ns)
+    with _rule_set_lock:
+        if _rule_set is None or version != _rule_set_version:
+            _rule_set = RuleSet.from_file(path)
+            _rule_set_version = version
+        return _rule_set
@@ -0,0 +1,364 @@
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+
+import numpy as np
+
+# --- Audio Analysis Configuration ---
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 640  # 40 ms, long enough for two periods of a 75 Hz voice
+HOP_LENGTH = 160  # 10 ms
+FFT_SIZE = 2048  # >= 2 * FRAME_LENGTH so the FFT autocorrelation does not wrap
+MIN_PITCH, MAX_PITCH = 75, 400
+CHUNK_SECONDS = 5
+FRAMES_PER_SECOND = SAMPLE_RATE // HOP_LENGTH
+
+# --- Visual Analysis Configuration ---
+VIDEO_WIDTH, VIDEO_HEIGHT = 160, 120
+COARSE_INTERVAL = 1.0  # seconds between sampled frames while nothing moves
+DENSE_INTERVAL = 0.2  # seconds between sampled frames around motion or a cut
+SCENE_THRESHOLD = 0.003  # ffmpeg scene score between consecutive frames that counts as motion
+FRAME_BATCH = 32
+MIN_FACE_RATIO = 0.03  # share of skin pixels for a frame to count as showing a face
+
+
+class SoftSkillAnalysisError(Exception):
+    pass
+
+
+def find_ffmpeg():
+    ffmpeg = os.environ.get("RANKITRIGHT_FFMPEG") or shutil.which("ffmpeg")
+    if ffmpeg:
+        return ffmpeg
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        raise SoftSkillAnalysisError("ffmpeg is required for soft skill analysis. Install it or set RANKITRIGHT_FFMPEG.")
+
+def probe_duration(path):
+    # Duration in seconds from the container header, or None if ffmpeg cannot tell.
+    result = subprocess.run([find_ffmpeg(), "-nostdin", "-hide_banner", "-i", path], capture_output=True)
+    match = re.search(rb"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+# --- Streaming Decode ---
+def stream_audio(path, chunk_seconds=CHUNK_SECONDS):
+    # Yields mono float32 chunks at SAMPLE_RATE; ffmpeg decodes the audio track
+    # incrementally, so only one chunk of a long interview is ever in memory.
+    command = [find_ffmpeg(), "-nostdin", "-v", "error", "-i", path, "-map", "0:a:0", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    chunk_bytes = SAMPLE_RATE * chunk_seconds * 2
+    finished = False
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            yield np.frombuffer(data[:len(data) - len(data) % 2], dtype="<i2").astype(np.float32) / 32768.0
+        finished = True
+    finally:
+        if not finished:
+            process.kill()
+        process.stdout.close()
+        stderr = process.stderr.read().decode("utf-8", errors="replace").strip()
+        process.stderr.close()
+        if process.wait() != 0 and finished:
+            if "matches no streams" in stderr:
+                raise SoftSkillAnalysisError("No audio track found in the video.")
+            raise SoftSkillAnalysisError(stderr.splitlines()[-1] if stderr else f"ffmpeg exited with code {process.returncode}")
+
+# --- Frame Features ---
+_WINDOW = np.hanning(FRAME_LENGTH).astype(np.float32)
+_MIN_LAG = SAMPLE_RATE // MAX_PITCH
+_MAX_LAG = SAMPLE_RATE // MIN_PITCH
+
+def frame_features(samples):
+    # Per 10 ms frame: energy in dB, autocorrelation pitch in Hz and voicing
+    # strength, computed for the whole chunk at once.
+    frames = np.lib.stride_tricks.sliding_window_view(samples, FRAME_LENGTH)[::HOP_LENGTH]
+    energy = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    spectrum = np.fft.rfft(frames * _WINDOW, n=FFT_SIZE)
+    autocorrelation = np.fft.irfft(np.abs(spectrum) ** 2, n=FFT_SIZE)[:, :_MAX_LAG + 1]
+    lags = _MIN_LAG + np.argmax(autocorrelation[:, _MIN_LAG:], axis=1)
+    strength = autocorrelation[np.arange(len(lags)), lags] / (autocorrelation[:, 0] + 1e-10)
+    return energy.astype(np.float32), (SAMPLE_RATE / lags).astype(np.float32), strength.astype(np.float32)
+
+def extract_audio_features(path, progress=None):
+    # Streams the audio track and keeps only the per-frame features (about
+    # 1 KB per second of audio), never the decoded samples. progress, if given,
+    # is called with the decoded fraction of the track after every chunk.
+    energy, pitch, strength = [], [], []
+    tail = np.zeros(0, dtype=np.float32)
+    duration = probe_duration(path) if progress else None
+    decoded = 0
+    for chunk in stream_audio(path):
+        decoded += len(chunk)
+        if duration:
+            progress(min(decoded / (duration * SAMPLE_RATE), 1.0))
+        buffer = np.concatenate([tail, chunk])
+        if len(buffer) < FRAME_LENGTH:
+            tail = buffer
+            continue
+        n_frames = 1 + (len(buffer) - FRAME_LENGTH) // HOP_LENGTH
+        chunk_energy, chunk_pitch, chunk_strength = frame_features(buffer[:(n_frames - 1) * HOP_LENGTH + FRAME_LENGTH])
+        energy.append(chunk_energy)
+        pitch.append(chunk_pitch)
+        strength.append(chunk_strength)
+        tail = buffer[n_frames * HOP_LENGTH:]
+    if not energy:
+        raise SoftSkillAnalysisError("No audio track found or the audio is too short to analyze.")
+    return np.concatenate(energy), np.concatenate(pitch), np.concatenate(strength)
+
+# --- Speech Metrics ---
+def _runs(mask):
+    # (start, length) of every run of True values.
+    padded = np.concatenate([[False], mask, [False]]).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return edges[::2], edges[1::2] - edges[::2]
+
+def _smooth(values, width):
+    return np.convolve(values, np.ones(width) / width, mode="same")
+
+def speech_metrics(energy, pitch, strength):
+    noise_floor = np.percentile(energy, 10)
+    loud = np.percentile(energy, 95)
+    speech = energy > noise_floor + max(6.0, 0.3 * (loud - noise_floor))
+    speech = _smooth(speech.astype(np.float32), 15) > 0.5  # ignore gaps and clicks under ~150 ms
+    voiced = speech & (strength > 0.45)
+    speech_frames = int(speech.sum())
+    if speech_frames < FRAMES_PER_SECOND:
+        raise SoftSkillAnalysisError("Not enough speech detected in the audio track.")
+
+    # Pauses are silences of 250 ms or more between the first and last speech.
+    first, last = np.flatnonzero(speech)[[0, -1]]
+    silence_starts, silence_lengths = _runs(~speech[first:last + 1])
+    pauses = silence_lengths[silence_lengths >= 25]
+    talk_seconds = (last - first + 1) / FRAMES_PER_SECOND
+    speech_minutes = speech_frames / FRAMES_PER_SECOND / 60
+
+    # Syllable nuclei are peaks of the smoothed energy envelope inside speech
+    # that rise at least 2 dB above the preceding 100 ms.
+    envelope = _smooth(energy, 5)
+    peaks = (envelope[1:-1] > envelope[:-2]) & (envelope[1:-1] >= envelope[2:]) & speech[1:-1]
+    peak_index = np.flatnonzero(peaks) + 1
+    preceding_min = np.lib.stride_tricks.sliding_window_view(np.concatenate([np.full(10, envelope[0]), envelope]), 11).min(axis=1)
+    rise = envelope[peak_index] - preceding_min[peak_index]
+    syllables = int(np.count_nonzero(rise >= 2.0))
+
+    # Pitch variation in semitones over voiced frames.
+    semitones = 12 * np.log2(pitch[voiced] / 100.0) if voiced.any() else np.zeros(1)
+
+    # Loudness stability: spread of the per-second mean speech energy.
+    seconds = len(energy) // FRAMES_PER_SECOND
+    per_second = energy[:seconds * FRAMES_PER_SECOND].reshape(seconds, FRAMES_PER_SECOND)
+    per_second_speech = speech[:seconds * FRAMES_PER_SECOND].reshape(seconds, FRAMES_PER_SECOND)
+    counts = per_second_speech.sum(axis=1)
+    speaking_seconds = counts >= FRAMES_PER_SECOND // 4
+    mean_energy = (per_second * per_second_speech).sum(axis=1)[speaking_seconds] / counts[speaking_seconds]
+
+    # Filled pauses ("um", "uh") sound like a sustained vowel: a voiced stretch
+    # of 0.3-1.5 s whose pitch and loudness barely move.
+    filled_pauses = 0
+    voiced_starts, voiced_lengths = _runs(voiced)
+    sustained = (voiced_lengths >= 30) & (voiced_lengths <= 150)
+    for start, length in zip(voiced_starts[sustained], voiced_lengths[sustained]):
+        segment = slice(start, start + length)
+        if np.std(12 * np.log2(pitch[segment] / 100.0)) < 0.6 and np.std(energy[segment]) < 3.0:
+            filled_pauses += 1
+
+    return {
+        "duration_seconds": round(len(energy) / FRAMES_PER_SECOND, 1),
+        "speech_rate": syllables / (speech_frames / FRAMES_PER_SECOND),
+        "pause_ratio": float(pauses.sum() / FRAMES_PER_SECOND / talk_seconds),
+        "pauses_per_minute": len(pauses) / speech_minutes,
+        "pitch_variation": float(np.std(semitones)),
+        "energy_stability": float(np.std(mean_energy)) if len(mean_energy) > 1 else 0.0,
+        "filler_rate": filled_pauses / speech_minutes,
+    }
+
+# --- Visual Features ---
+_LUMA_SIZE = VIDEO_WIDTH * VIDEO_HEIGHT
+_CHROMA_SIZE = _LUMA_SIZE // 4
+_VIDEO_FRAME_BYTES = _LUMA_SIZE + 2 * _CHROMA_SIZE
+_SAMPLE_FILTER = (f"scale={VIDEO_WIDTH}:{VIDEO_HEIGHT}:flags=fast_bilinear,"
+                  f"select='isnan(prev_selected_t)+gte(t-prev_selected_t\\,{COARSE_INTERVAL})"
+                  f"+gte(t-prev_selected_t\\,{DENSE_INTERVAL})*gt(scene\\,{SCENE_THRESHOLD})',showinfo")
+
+def _read_batches(stream, batches):
+    # Reader thread: keeps ffmpeg's pipe drained while the main thread is busy
+    # with NumPy, so decoding and feature work overlap.
+    try:
+        while True:
+            data = stream.read(_VIDEO_FRAME_BYTES * FRAME_BATCH)
+            count = len(data) // _VIDEO_FRAME_BYTES
+            if count:
+                batches.put(np.frombuffer(data, dtype=np.uint8, count=count * _VIDEO_FRAME_BYTES).reshape(count, _VIDEO_FRAME_BYTES))
+            if count < FRAME_BATCH:
+                break
+    finally:
+        batches.put(None)
+
+def _read_log(stream, timestamps, errors):
+    # showinfo prints one line per selected frame; everything else is kept
+    # for the error message.
+    for line in stream:
+        match = re.search(rb"pts_time:\s*(-?[\d.]+)", line)
+        if match:
+            timestamps.append(float(match.group(1)))
+        elif b"Parsed_showinfo" not in line:
+            errors.append(line.decode("utf-8", errors="replace").strip())
+
+def _percentile_bounds(counts, low=0.05, high=0.95):
+    # Per frame, the first index where the cumulative count reaches each quantile.
+    cumulative = np.cumsum(counts, axis=1)
+    total = cumulative[:, -1:]
+    return np.argmax(cumulative >= low * total, axis=1), np.argmax(cumulative >= high * total, axis=1)
+
+def face_features(frames):
+    # frames is a (n, bytes) batch of downscaled YUV 4:2:0 frames. Returns
+    # per-frame face presence, face centre (as a fraction of the frame) and
+    # eye-region contrast, computed for the whole batch at once.
+    n = len(frames)
+    luma = frames[:, :_LUMA_SIZE].reshape(n, VIDEO_HEIGHT, VIDEO_WIDTH).astype(np.float32)
+    cb = frames[:, _LUMA_SIZE:_LUMA_SIZE + _CHROMA_SIZE].reshape(n, VIDEO_HEIGHT // 2, VIDEO_WIDTH // 2)
+    cr = frames[:, _LUMA_SIZE + _CHROMA_SIZE:].reshape(n, VIDEO_HEIGHT // 2, VIDEO_WIDTH // 2)
+
+    # Skin chroma range of Chai and Ngan; the face box spans the 5th to 95th
+    # percentile of skin rows and columns, so stray skin pixels do not stretch it.
+    skin = (cb >= 77) & (cb <= 127) & (cr >= 133) & (cr <= 173)
+    face = skin.mean(axis=(1, 2)) >= MIN_FACE_RATIO
+    top, bottom = _percentile_bounds(skin.sum(axis=2))
+    left, right = _percentile_bounds(skin.sum(axis=1))
+    centre_x = (left + right + 1) / VIDEO_WIDTH
+    centre_y = (top + bottom + 1) / VIDEO_HEIGHT
+
+    # The eyes sit in the band 20-50% down the face box (luma has twice the
+    # chroma resolution). Open eyes looking at the camera give dark pupils and
+    # brows against skin, so the band's contrast drops when they look away.
+    height = bottom - top + 1
+    eye_top = (2 * (top + 0.2 * height))[:, None, None]
+    eye_bottom = (2 * (top + 0.5 * height))[:, None, None]
+    rows = np.arange(VIDEO_HEIGHT)[None, :, None]
+    cols = np.arange(VIDEO_WIDTH)[None, None, :]
+    band = (rows >= eye_top) & (rows < eye_bottom) & (cols >= 2 * left[:, None, None]) & (cols < 2 * (right[:, None, None] + 1))
+    count = np.maximum(band.sum(axis=(1, 2)), 1)
+    mean = (luma * band).sum(axis=(1, 2)) / count
+    variance = (((luma - mean[:, None, None]) ** 2) * band).sum(axis=(1, 2)) / count
+    contrast = np.sqrt(variance) / (mean + 1.0)
+
+    nan = np.float32(np.nan)
+    return face, np.where(face, centre_x, nan), np.where(face, centre_y, nan), np.where(face, contrast, nan)
+
+def extract_visual_features(path, progress=None):
+    # Samples frames once per COARSE_INTERVAL, and up to once per
+    # DENSE_INTERVAL while ffmpeg's scene score shows motion. Returns None when
+    # the file has no video stream.
+    command = [find_ffmpeg(), "-nostdin", "-hide_banner", "-nostats", "-v", "info", "-skip_frame", "noref", "-i", path,
+               "-map", "0:v:0", "-vf", _SAMPLE_FILTER, "-fps_mode", "vfr", "-pix_fmt", "yuv420p", "-f", "rawvideo", "-"]
+    duration = probe_duration(path) if progress else None
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    batches = queue.Queue(maxsize=4)
+    timestamps, errors = [], []
+    reader = threading.Thread(target=_read_batches, args=(process.stdout, batches), daemon=True)
+    logger = threading.Thread(target=_read_log, args=(process.stderr, timestamps, errors), daemon=True)
+    reader.start()
+    logger.start()
+    features = []
+    finished = False
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            features.append(face_features(batch))
+            if duration and timestamps:
+                progress(min(timestamps[-1] / duration, 1.0))
+        finished = True
+    finally:
+        if not finished:
+            process.kill()
+            # The reader may be blocked putting into the full queue (its final
+            # None included), so keep emptying it until the thread is done.
+            while reader.is_alive():
+                try:
+                    batches.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+        reader.join()
+        logger.join()
+        process.stdout.close()
+        process.stderr.close()
+        returncode = process.wait()
+    if returncode != 0:
+        if any("matches no streams" in line for line in errors):
+            return None
+        raise SoftSkillAnalysisError(errors[-1] if errors else f"ffmpeg exited with code {returncode}")
+    if not features:
+        return None
+    face, centre_x, centre_y, contrast = (np.concatenate(column) for column in zip(*features))
+    return face, centre_x, centre_y, contrast, np.array(timestamps[:len(face)], dtype=np.float64)
+
+def visual_metrics(face, centre_x, centre_y, contrast, timestamps):
+    # Head motion is the face centre's path length per second between
+    # consecutive frames showing a face, in frame widths. Summing distance and
+    # time separately keeps the denser sampling around motion from biasing it.
+    shown = np.flatnonzero(face)
+    head_motion = 0.0
+    if len(shown) >= 2 and len(timestamps) == len(face):
+        distance = np.hypot(np.diff(centre_x[shown]), np.diff(centre_y[shown])).sum()
+        elapsed = np.diff(timestamps[shown]).sum()
+        head_motion = float(distance / elapsed) if elapsed > 0 else 0.0
+    return {
+        "sampled_frames": int(len(face)),
+        "face_present_ratio": float(face.mean()),
+        "head_motion": head_motion,
+        "eye_contrast": float(np.nanmedian(contrast)) if len(shown) else 0.0,
+    }
+
+# --- Scoring ---
+def _band(value, low, high, falloff):
+    # 1.0 inside [low, high], falling linearly to 0.0 at falloff outside it.
+    distance = max(low - value, value - high, 0.0)
+    return max(0.0, 1.0 - distance / falloff)
+
+def score_metrics(metrics):
+    pace = _band(metrics["speech_rate"], 3.0, 5.5, 3.0)
+    pausing = _band(metrics["pause_ratio"], 0.08, 0.3, 0.4)
+    fillers = _band(metrics["filler_rate"], 0.0, 3.0, 12.0)
+    expressiveness = _band(metrics["pitch_variation"], 2.0, 6.0, 4.0)
+    steadiness = _band(metrics["energy_stability"], 0.0, 4.0, 8.0)
+    long_pauses = _band(metrics["pauses_per_minute"], 0.0, 12.0, 24.0)
+    confidence = 0.35 * steadiness + 0.35 * fillers + 0.3 * long_pauses
+    if "face_present_ratio" in metrics:
+        on_camera = _band(metrics["face_present_ratio"], 0.8, 1.0, 0.8)
+        stillness = _band(metrics["head_motion"], 0.0, 0.05, 0.25)
+        eye_contact = _band(metrics["eye_contrast"], 0.15, 10.0, 0.15)
+        confidence = 0.6 * confidence + 0.4 * (0.4 * on_camera + 0.35 * stillness + 0.25 * eye_contact)
+    return {
+        "Communication": round(0.4 * pace + 0.35 * pausing + 0.25 * fillers, 2),
+        "Tone": round(0.6 * expressiveness + 0.4 * steadiness, 2),
+        "Confidence": round(confidence, 2),
+    }
+
+AUDIO_PROGRESS_SHARE = 0.3  # the audio pass is the cheaper of the two
+
+def analyze_video(path, progress=None):
+    # Returns the three score columns used by the Soft Skill Ranking page plus
+    # the raw speech and visual metrics behind them. Videos without a picture
+    # are scored from the audio alone.
+    audio_progress = visual_progress = None
+    if progress:
+        audio_progress = lambda fraction: progress(AUDIO_PROGRESS_SHARE * fraction)
+        visual_progress = lambda fraction: progress(AUDIO_PROGRESS_SHARE + (1 - AUDIO_PROGRESS_SHARE) * fraction)
+    metrics = speech_metrics(*extract_audio_features(path, audio_progress))
+    visual = extract_visual_features(path, visual_progress)
+    if visual is not None:
+        metrics.update(visual_metrics(*visual))
+    return {**score_metrics(metrics), "metrics": metrics}
@@ -0,0 +1,114 @@
+import sqlite3
+
+import pytest
+
+from database import SQLiteRepository, StorageError
+
+LEGACY_SCHEMA = """
+CREATE TABLE Users (
+    UserID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT UNIQUE NOT NULL,
+    Password TEXT NOT NULL,
+    Role TEXT NOT NULL,
+    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE HRResumeRankingHistory (
+    RankingID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT NOT NULL REFERENCES Users(Username),
+    JobDescription TEXT NOT NULL,
+    Resumes TEXT NOT NULL,
+    Scores TEXT,
+    Timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE HRSoftSkillRankingHistory (
+    AnalysisID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Username TEXT NOT NULL REFERENCES Users(Username),
+    Videos TEXT NOT NULL,
+    Scores TEXT,
+    Timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SQLiteRepository(str(tmp_path / "test.db"), pool_size=2)
+    repository.create_user("alice", "hash", "HR Professional")
+    repository.create_user("bob", "hash", "HR Professional")
+    yield repository
+    repository.pool.close()
+
+
+def test_users(repository):
+    assert repository.find_user("alice", "hash")[1] == "HR Professional"
+    assert repository.find_user("alice", "wrong") == (None, None)
+    with pytest.raises(StorageError):
+        repository.create_user("alice", "other", "Student")
+
+
+def test_saved_ranking_comes_back_in_rank_order(repository):
+    ranking_id = repository.save_hr_ranking("alice", "python developer", ["a.pdf", "b.pdf", "c.pdf"], [0.9, 0.5, 0.1])
+    assert repository.get_hr_ranking_results("alice", ranking_id) == [(1, "a.pdf", 0.9), (2, "b.pdf", 0.5), (3, "c.pdf", 0.1)]
+    rows, next_cursor = repository.get_hr_rankings_page("alice")
+    assert next_cursor is None
+    assert [(row[0], row[1], row[3]) for row in rows] == [(ranking_id, "python developer", 3)]
+    assert rows[0][4] == pytest.approx(0.5)
+    runs, resumes, average = repository.get_hr_rankings_summary("alice")
+    assert (runs, resumes) == (1, 3) and average == pytest.approx(0.5)
+    # Another user's runs are not visible.
+    assert repository.get_hr_ranking_results("bob", ranking_id) == []
+    assert repository.get_hr_rankings_page("bob") == ([], None)
+
+
+def test_keyset_pages_cover_every_run_once_newest_first(repository):
+    # Runs saved within the same second share a timestamp; the id breaks ties.
+    ids = [repository.save_hr_ranking("alice", f"job {i}", [f"{i}.pdf"], [i / 100]) for i in range(25)]
+    repository.save_hr_ranking("bob", "not alice's", ["x.pdf"], [1.0])
+    pages, before = [], None
+    while True:
+        rows, before = repository.get_hr_rankings_page("alice", limit=10, before=before)
+        pages.append([row[0] for row in rows])
+        if before is None:
+            break
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [ranking_id for page in pages for ranking_id in page] == ids[::-1]
+
+
+def test_soft_skill_runs(repository):
+    analysis_id = repository.save_hr_soft_skill("alice", ["v1.mp4", "v2.mp4"], [0.8, 0.6])
+    assert repository.get_hr_soft_skill_results("alice", analysis_id) == [(1, "v1.mp4", 0.8), (2, "v2.mp4", 0.6)]
+    rows, _ = repository.get_hr_soft_skills_page("alice")
+    assert [row[0] for row in rows] == [analysis_id]
+
+
+def test_migrate_splits_legacy_rows_and_is_idempotent(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(path) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.execute("INSERT INTO Users (Username, Password, Role) VALUES ('alice', 'hash', 'HR Professional')")
+        conn.execute("INSERT INTO HRResumeRankingHistory (Username, JobDescription, Resumes, Scores) "
+                     "VALUES ('alice', 'old job', 'a.pdf,b.pdf,c.pdf', '0.75,0.5')")
+        conn.execute("INSERT INTO HRSoftSkillRankingHistory (Username, Videos, Scores) VALUES ('alice', 'v.mp4', '0.9')")
+        conn.execute("INSERT INTO HRSoftSkillRankingHistory (Username, Videos, Scores) VALUES ('alice', '', NULL)")
+    conn.close()
+
+    repository = SQLiteRepository(path, pool_size=1)  # migrates on open
+    try:
+        # A score missing from the comma-joined list is stored as NULL.
+        expected = [(1, "a.pdf", 0.75), (2, "b.pdf", 0.5), (3, "c.pdf", None)]
+        assert repository.get_hr_ranking_results("alice", 1) == expected
+        assert repository.get_hr_soft_skill_results("alice", 1) == [(1, "v.mp4", 0.9)]
+        assert repository.get_hr_soft_skill_results("alice", 2) == []
+        for table, column in (("HRResumeRankingHistory", "Resumes"), ("HRResumeRankingHistory", "Scores"),
+                              ("HRSoftSkillRankingHistory", "Videos"), ("HRSoftSkillRankingHistory", "Scores")):
+            assert not repository._has_column(table, column)
+
+        assert repository.migrate() == 0
+        assert repository.get_hr_ranking_results("alice", 1) == expected
+        assert repository.get_hr_rankings_summary("alice")[:2] == (1, 3)
+        # New runs work on the migrated tables.
+        ranking_id = repository.save_hr_ranking("alice", "new job", ["d.pdf"], [0.3])
+        rows, _ = repository.get_hr_rankings_page("alice")
+        assert [row[0] for row in rows] == [ranking_id, 1]
+    finally:
+        repository.pool.close()
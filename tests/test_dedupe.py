@@ -0,0 +1,61 @@
+import random
+
+from dedupe import DuplicateIndex, near_duplicate_labels
+
+VOCABULARY = [f"word{i}" for i in range(2000)]
+
+
+def make_resume(rng, words=300):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def lightly_edit(rng, text, edits=3):
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+
+def test_lightly_edited_copy_joins_its_original():
+    rng = random.Random(0)
+    originals = [make_resume(rng) for _ in range(20)]
+    copies = [lightly_edit(rng, text) for text in originals[:5]]
+    labels = near_duplicate_labels(originals + copies)
+    assert labels[:20] == list(range(20))
+    assert labels[20:] == [0, 1, 2, 3, 4]
+
+
+def test_distinct_resumes_stay_apart():
+    rng = random.Random(1)
+    labels = near_duplicate_labels([make_resume(rng) for _ in range(200)])
+    assert labels == list(range(200))
+
+
+def test_reformatted_copy_is_a_duplicate():
+    # Case and punctuation do not change the shingles.
+    text = make_resume(random.Random(2))
+    assert near_duplicate_labels([text, text.upper().replace(" ", ",  ")]) == [0, 0]
+
+
+def test_adding_in_chunks_matches_one_pass():
+    rng = random.Random(3)
+    originals = [make_resume(rng) for _ in range(30)]
+    texts = originals + [lightly_edit(rng, text) for text in originals[::3]]
+    rng.shuffle(texts)
+    index = DuplicateIndex()
+    chunked = []
+    for start in range(0, len(texts), 7):
+        chunked += index.add(texts[start:start + 7])
+    assert chunked == near_duplicate_labels(texts)
+    assert len(index) == len(texts)
+    assert len(set(chunked)) == 30
+
+
+def test_heavily_edited_copy_is_not_a_duplicate():
+    rng = random.Random(4)
+    original = make_resume(rng)
+    assert near_duplicate_labels([original, lightly_edit(rng, original, edits=60)]) == [0, 1]
+
+
+def test_texts_without_shingles_are_never_grouped():
+    assert near_duplicate_labels(["", "", "two words", "two words"]) == [0, 1, 2, 3]
@@ -0,0 +1,75 @@
+import pytest
+
+from prefilter import PostingIndex, parse_keywords, parse_terms, tokenize
+
+RESUMES = [
+    "Python developer. SQL, AWS and Docker.",             # 0
+    "Java developer with Spring; some python scripting",  # 1
+    "C++ and C# engineer, node.js services on Azure",     # 2
+    "Machine learning engineer: python, pandas",          # 3
+    "Learning machine shop operator",                     # 4
+    "Sales manager, Excel",                               # 5
+]
+
+
+@pytest.fixture
+def index():
+    return PostingIndex(RESUMES)
+
+
+def test_tokenize_keeps_skill_names():
+    assert tokenize("C++, C#, Node.js and ASP.NET.") == ["c++", "c#", "node.js", "and", "asp.net"]
+
+
+def test_parse_terms_splits_on_commas_and_newlines():
+    assert parse_terms(" python, sql\n machine learning ,, ") == ["python", "sql", "machine learning"]
+    assert parse_terms(None) == []
+
+
+def test_no_terms_keeps_everything(index):
+    assert index.filter() == list(range(len(RESUMES)))
+
+
+def test_must_have_needs_every_term(index):
+    assert index.filter(must=["python"]) == [0, 1, 3]
+    assert index.filter(must=["python", "sql"]) == [0]
+    assert index.filter(must=["PYTHON", "rust"]) == []
+
+
+def test_any_of_needs_one_term(index):
+    assert index.filter(any_of=["aws", "azure"]) == [0, 2]
+    assert index.filter(must=["python"], any_of=["aws", "pandas"]) == [0, 3]
+
+
+def test_exclude_drops_matching_resumes(index):
+    assert index.filter(exclude=["java", "excel"]) == [0, 2, 3, 4]
+    assert index.filter(must=["developer"], exclude=["spring"]) == [0]
+
+
+def test_terms_match_whole_tokens(index):
+    assert index.filter(must=["c++"]) == [2]
+    assert index.filter(must=["c"]) == []
+    assert index.filter(must=["node"]) == []
+    assert index.filter(must=["node.js"]) == [2]
+    assert index.filter(must=["pyth"]) == []
+
+
+def test_multi_word_terms_need_adjacent_words(index):
+    # Resume 4 has both words, but not next to each other in this order.
+    assert index.filter(must=["machine learning"]) == [3]
+    assert index.filter(must=["Machine-Learning"]) == [3]
+    assert index.filter(exclude=["machine learning"]) == [0, 1, 2, 4, 5]
+    assert index.filter(any_of=["learning machine", "sales manager"]) == [4, 5]
+
+
+@pytest.mark.parametrize("term", ["", "-", "++", " , "])
+def test_terms_without_tokens_have_no_effect(index, term):
+    everything = list(range(len(RESUMES)))
+    assert index.filter(must=[term]) == everything
+    assert index.filter(any_of=[term]) == everything
+    assert index.filter(exclude=[term]) == everything
+    assert index.filter(must=["python", term], any_of=[term, "aws"], exclude=[term]) == [0]
+
+
+def test_parse_keywords_drops_terms_without_tokens():
+    assert parse_keywords("-, c++, ++, machine learning") == ["c++", "machine learning"]
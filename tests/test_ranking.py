@@ -0,0 +1,152 @@
+import random
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from ranking import ResumeIndex, rank_resumes_hr, rank_resumes_multi, top_k
+
+WORDS = ["python", "java", "sql", "aws", "docker", "react", "excel", "sales", "design", "finance",
+         "testing", "linux", "marketing", "kotlin", "pandas", "spark", "figma", "audit", "teaching", "nursing"]
+
+
+def make_texts(n, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 40))) + f" candidate{i}" for i in range(n)]
+
+
+def dense_scores(job_description, resumes):
+    # The original implementation: one TfidfVectorizer fit on the job
+    # description and the resumes, densified, then cosine similarity.
+    vectors = TfidfVectorizer().fit_transform([job_description] + resumes).toarray()
+    return cosine_similarity([vectors[0]], vectors[1:]).flatten()
+
+
+JOB_DESCRIPTIONS = [
+    "python sql aws engineer",
+    "Senior Java developer with Docker and Linux; python a plus",
+    "chef pastry bakery",  # no word in common with any resume
+    "sales sales sales marketing excel",
+]
+
+
+@pytest.mark.parametrize("job_description", JOB_DESCRIPTIONS)
+def test_rank_resumes_hr_matches_dense_baseline(job_description):
+    resumes = make_texts(60) + [""]
+    np.testing.assert_allclose(rank_resumes_hr(job_description, resumes), dense_scores(job_description, resumes), atol=1e-12)
+
+
+def test_score_many_matches_score_and_dense_baseline():
+    resumes = make_texts(80, seed=1)
+    index = ResumeIndex()
+    doc_ids = index.add(resumes)
+    matrix = index.score_many(JOB_DESCRIPTIONS, doc_ids)
+    assert matrix.shape == (len(JOB_DESCRIPTIONS), len(resumes))
+    for row, job_description in zip(matrix, JOB_DESCRIPTIONS):
+        np.testing.assert_allclose(row, index.score(job_description, doc_ids), atol=1e-12)
+        np.testing.assert_allclose(row, dense_scores(job_description, resumes), atol=1e-12)
+
+
+def test_score_a_subset_uses_the_whole_pool_for_idf():
+    resumes = make_texts(50, seed=2)
+    index = ResumeIndex()
+    doc_ids = index.add(resumes)
+    subset = doc_ids[10:20][::-1]
+    full = index.score(JOB_DESCRIPTIONS[1], doc_ids)
+    np.testing.assert_allclose(index.score(JOB_DESCRIPTIONS[1], subset), full[10:20][::-1], atol=1e-12)
+
+
+def test_adding_known_texts_does_not_change_the_pool():
+    resumes = make_texts(30, seed=3)
+    index = ResumeIndex()
+    first = index.add(resumes)
+    assert index.add(resumes[:5] + resumes[:5]) == first[:5] + first[:5]
+    assert len(index) == 30
+
+
+def test_rank_resumes_multi_shortlists():
+    resumes = make_texts(40, seed=4)
+    scores, shortlists = rank_resumes_multi(JOB_DESCRIPTIONS, resumes, k=5, min_score=0.05)
+    for row, shortlist, job_description in zip(scores, shortlists, JOB_DESCRIPTIONS):
+        np.testing.assert_allclose(row, dense_scores(job_description, resumes), atol=1e-12)
+        assert list(shortlist) == list(top_k(row, 5, 0.05))
+
+
+def reference_top_k(scores, k=None, min_score=None):
+    order = [i for i in np.argsort(-scores, kind="stable") if min_score is None or scores[i] >= min_score]
+    return order if k is None else order[:k]
+
+
+@pytest.mark.parametrize("k", [None, 0, 1, 5, 99, 100, 500])
+@pytest.mark.parametrize("min_score", [None, 0.0, 0.5, 2.0])
+def test_top_k_matches_full_sort(k, min_score):
+    rng = np.random.default_rng(5)
+    scores = np.round(rng.random(100), 2)  # rounded, so there are ties to break
+    assert list(top_k(scores, k, min_score)) == reference_top_k(scores, k, min_score)
+
+
+def test_top_k_of_nothing():
+    assert len(top_k(np.zeros(0), 3)) == 0
+
+
+# --- Persistent index ---
+def add_in_batches(index, resumes, batch):
+    doc_ids = []
+    for start in range(0, len(resumes), batch):
+        doc_ids += index.add(resumes[start:start + batch])
+    return doc_ids
+
+
+def test_persisted_index_matches_dense_baseline_after_reload(tmp_path):
+    resumes = make_texts(70, seed=6)
+    index = ResumeIndex(str(tmp_path), max_segments=100)
+    doc_ids = add_in_batches(index, resumes, 10)
+    assert len(index.segments) == 7
+    reloaded = ResumeIndex(str(tmp_path))
+    assert len(reloaded) == 70 and reloaded.vocabulary_size == index.vocabulary_size
+    for job_description in JOB_DESCRIPTIONS:
+        expected = dense_scores(job_description, resumes)
+        np.testing.assert_allclose(index.score(job_description, doc_ids), expected, atol=1e-12)
+        np.testing.assert_allclose(reloaded.score(job_description, doc_ids), expected, atol=1e-12)
+
+
+def test_compaction_merges_segments_and_removes_their_files(tmp_path):
+    resumes = make_texts(90, seed=7)
+    index = ResumeIndex(str(tmp_path), max_segments=3)
+    doc_ids = add_in_batches(index, resumes, 10)
+    assert len(index.segments) <= 3
+    live = {name for name, _ in index.segments}
+    on_disk = {path.name.split(".")[0] for path in tmp_path.glob("seg-*.npy")}
+    assert on_disk == live
+    assert [path.name for path in tmp_path.glob("df-*.npy")] == [f"df-{index.generation}.npy"]
+    reloaded = ResumeIndex(str(tmp_path), max_segments=3)
+    np.testing.assert_allclose(reloaded.score_many(JOB_DESCRIPTIONS, doc_ids),
+                               np.array([dense_scores(job_description, resumes) for job_description in JOB_DESCRIPTIONS]), atol=1e-12)
+
+
+def test_writers_sharing_a_directory_keep_each_others_resumes(tmp_path):
+    # Two ResumeIndex objects on one directory stand in for the app and
+    # rank_resumes.py --index: each add() first reloads what the other wrote.
+    first, second = ResumeIndex(str(tmp_path), max_segments=2), ResumeIndex(str(tmp_path), max_segments=2)
+    batches = [make_texts(15, seed=seed) for seed in range(8, 14)]
+    doc_ids = []
+    for i, batch in enumerate(batches):
+        doc_ids += (first if i % 2 else second).add(batch)
+    resumes = [text for batch in batches for text in batch]
+    for index in (first, second, ResumeIndex(str(tmp_path))):
+        index.add([])
+        assert len(index) == len(set(resumes))
+    np.testing.assert_allclose(ResumeIndex(str(tmp_path)).score(JOB_DESCRIPTIONS[0], doc_ids),
+                               dense_scores(JOB_DESCRIPTIONS[0], resumes), atol=1e-12)
+
+
+def test_each_user_has_their_own_index(tmp_path, monkeypatch):
+    import ranking
+    monkeypatch.setattr(ranking, "INDEX_DIR", str(tmp_path))
+    monkeypatch.setattr(ranking, "_resume_indexes", {})
+    ranking.get_resume_index("alice").add(make_texts(5, seed=14))
+    ranking.get_resume_index("../bob").add(make_texts(3, seed=15))
+    assert ranking.get_resume_index("alice") is ranking.get_resume_index("alice")
+    assert (len(ranking.get_resume_index("alice")), len(ranking.get_resume_index("../bob"))) == (5, 3)
+    assert len(list((tmp_path / "users").iterdir())) == 2
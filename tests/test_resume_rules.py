@@ -0,0 +1,95 @@
+import glob
+import os
+import random
+
+import pytest
+
+from resume_rules import RULES_PATH, RuleSet
+
+RESUME_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "resumes")
+
+
+def hard_coded_evaluate_resume(text):
+    # evaluate_resume as it was written in app.py before the rules moved to
+    # resume_rules.json.
+    suggestions = []
+    if len(text) < 500:
+        suggestions.append("Consider adding more content to your resume. Aim for at least 500 words.")
+    if "skills" not in text.lower():
+        suggestions.append("Include a 'Skills' section to highlight your relevant skills.")
+    if "experience" not in text.lower():
+        suggestions.append("Add an 'Experience' section to showcase your work history.")
+    if "education" not in text.lower():
+        suggestions.append("Include an 'Education' section to detail your academic background.")
+    if len(text.splitlines()) < 5:
+        suggestions.append("Your resume is quite short. Consider adding more sections or details.")
+    if "objective" not in text.lower() and "summary" not in text.lower():
+        suggestions.append("Consider adding an 'Objective' or 'Summary' section to introduce yourself.")
+    if "contact" not in text.lower():
+        suggestions.append("Make sure to include your contact information at the top of your resume.")
+    if any(word in text.lower() for word in ["internship", "intern", "volunteer"]):
+        suggestions.append("Highlight any internships or volunteer experiences to showcase your practical skills.")
+    if "certification" not in text.lower() and "certificates" not in text.lower():
+        suggestions.append("If you have any certifications, consider adding a 'Certifications' section.")
+    return suggestions
+
+
+@pytest.fixture(scope="module")
+def rules():
+    return RuleSet.from_file(RULES_PATH)
+
+
+@pytest.mark.parametrize("path", sorted(glob.glob(os.path.join(RESUME_DIR, "*.pdf"))), ids=os.path.basename)
+def test_sample_resumes_get_the_hard_coded_suggestions(rules, path):
+    from extraction import parse_pdf
+    with open(path, "rb") as f:
+        text = parse_pdf(f.read())["text"]
+    assert text
+    assert rules.evaluate(text) == hard_coded_evaluate_resume(text)
+
+
+@pytest.mark.parametrize("text", [
+    "",
+    "x" * 499,
+    "x" * 500,
+    "a\nb\nc\nd",
+    "a\r\nb\r\nc\r\nd\r\ne",
+    "SKILLS\nExperienced\nEDUCATIONAL\nSummary\nContact me",
+    "skill experiences educations",
+    "Internship at ACME",
+    "international",  # contains "intern"
+    "volunteering; certificates; certification",
+    "certificate",
+    "summaryobjective contactcontact",
+])
+def test_edge_cases_get_the_hard_coded_suggestions(rules, text):
+    assert rules.evaluate(text) == hard_coded_evaluate_resume(text)
+
+
+def test_random_texts_get_the_hard_coded_suggestions(rules):
+    # Keywords cut up and glued together, so matches overlap and straddle
+    # each other ("internshipskills", "certificationcertificates").
+    fragments = ["skills", "skill", "experience", "education", "objective", "summary", "contact", "internship",
+                 "intern", "volunteer", "certification", "certificates", "cert", "ship", "s", " ", "\n", "Ex", "SUM"]
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 60)))
+        assert rules.evaluate(text) == hard_coded_evaluate_resume(text), text
+
+
+def test_at_line_start_only_counts_keywords_that_begin_a_line():
+    rules = RuleSet([{"check": "missing", "keywords": ["skills"], "at_line_start": True, "message": "no header"}])
+    assert rules.evaluate("  Skills: python\n") == []
+    assert rules.evaluate("I have skills\n") == ["no header"]
+
+
+@pytest.mark.parametrize("rule, error", [
+    ({"check": "sometimes", "message": "m"}, "unknown check"),
+    ({"check": "missing", "keywords": ["a"]}, "missing 'message'"),
+    ({"check": "present", "keywords": [], "message": "m"}, "non-empty 'keywords'"),
+    ({"check": "min_chars", "value": "500", "message": "m"}, "integer 'value'"),
+])
+def test_invalid_rules_are_rejected(rule, error):
+    with pytest.raises(ValueError, match=error):
+        RuleSet([rule])
+
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import threading
+
+# --- Upload Store Configuration ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+UPLOAD_DIR = os.environ.get("RANKITRIGHT_UPLOAD_DIR", os.path.join(BASE_DIR, ".cache", "uploads"))
+UPLOAD_MAX_BYTES = int(os.environ.get("RANKITRIGHT_UPLOAD_MAX_BYTES", 8 * 1024 ** 3))
+UPLOAD_SESSION_MAX_BYTES = int(os.environ.get("RANKITRIGHT_UPLOAD_SESSION_MAX_BYTES", 2 * 1024 ** 3))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadRejected(Exception):
+    pass
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+class UploadStore:
+    # Uploaded videos are copied to disk in fixed-size chunks and hashed on the
+    # way, so no second in-memory copy is made. Usage is measured from the
+    # files on disk because analysis workers delete them when they finish;
+    # a session's usage is the size of its files that are still waiting.
+
+    def __init__(self, directory=UPLOAD_DIR, max_bytes=UPLOAD_MAX_BYTES, session_max_bytes=UPLOAD_SESSION_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.session_max_bytes = session_max_bytes
+        self._reserved = 0  # bytes of saves still being written
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def usage(self):
+        with os.scandir(self.directory) as entries:
+            return sum(entry.stat().st_size for entry in entries if entry.is_file())
+
+    def session_usage(self, paths):
+        return sum(_file_size(path) for path in paths)
+
+    def _reserve(self, size, session_paths):
+        session_used = self.session_usage(session_paths)
+        if session_used + size > self.session_max_bytes:
+            raise UploadRejected(f"this session already has {session_used / 1024 ** 2:.0f} MB of videos waiting; "
+                                 f"the limit is {self.session_max_bytes / 1024 ** 2:.0f} MB per session")
+        with self._lock:
+            used = self.usage() + self._reserved
+            if used + size > self.max_bytes:
+                raise UploadRejected(f"the server's upload store is full ({used / 1024 ** 2:.0f} of "
+                                     f"{self.max_bytes / 1024 ** 2:.0f} MB in use); try again once queued videos finish")
+            self._reserved += size
+
+    def save(self, fileobj, size, name, session_paths=()):
+        # Returns (path, sha256) of the stored copy. The file is named after
+        # its hash, so identical uploads share one file.
+        self._reserve(size, session_paths)
+        tmp_path = os.path.join(self.directory, f".{threading.get_ident()}-{os.getpid()}.part")
+        digest = hashlib.sha256()
+        try:
+            with open(tmp_path, "wb") as f:
+                while True:
+                    chunk = fileobj.read(UPLOAD_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+            path = os.path.join(self.directory, digest.hexdigest() + os.path.splitext(name)[1].lower())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            with self._lock:
+                self._reserved -= size
+        return path, digest.hexdigest()
+
+
+_upload_store = None
+_upload_store_lock = threading.Lock()
+
+def get_upload_store():
+    global _upload_store
+    with _upload_store_lock:
+        if _upload_store is None:
+            _upload_store = UploadStore()
+        return _upload_store